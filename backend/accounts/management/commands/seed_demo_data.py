@@ -15,6 +15,7 @@ import random
 
 from accounts.models import User
 from tasks.models import Category, Task, TaskApplication, Review
+from tasks.ratings import repair_user_ratings
 from recommendations.models import Skill, UserSkill, UserPreference
 from messaging.models import Conversation, Message
 from notifications.models import Notification
@@ -607,13 +608,9 @@ I help companies build their digital presence and increase audience engagement t
         self.stdout.write('> Created reviews')
 
     def update_user_ratings(self, user):
-        """Update user's average rating"""
-        reviews = Review.objects.filter(reviewee=user)
-        if reviews.exists():
-            avg_rating = sum(r.rating for r in reviews) / reviews.count()
-            user.average_rating = Decimal(str(avg_rating))
-            user.total_reviews = reviews.count()
-            user.save(update_fields=['average_rating', 'total_reviews'])
+        """Rebuild user's rating aggregates from their public reviews"""
+        repair_user_ratings([user.id])
+        user.refresh_from_db(fields=['rating_sum', 'total_reviews', 'average_rating'])
 
     def create_payment_data(self):
         """Create wallets and transaction history"""
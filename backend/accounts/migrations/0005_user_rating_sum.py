@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_portfolioitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
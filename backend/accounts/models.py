@@ -17,6 +17,8 @@ class User(AbstractUser):
         null=True, 
         blank=True
     )
+    # Storage names of the thumb/preview renditions (utils/images.py)
+    profile_picture_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     phone_number = models.CharField(max_length=20, blank=True, null=True)
 
@@ -45,6 +47,9 @@ class User(AbstractUser):
         help_text="Average rating from reviews"
     )
     total_reviews = models.IntegerField(default=0)
+    # Sum of public review ratings - with total_reviews, lets a new review
+    # update average_rating without aggregating all reviews
+    rating_sum = models.PositiveIntegerField(default=0)
 
     is_verified = models.BooleanField(default=False)
     is_email_verified = models.BooleanField(default=False, help_text="Whether user's email is verified")
@@ -105,6 +110,8 @@ class PortfolioItem(models.Model):
         null=True,
         help_text="Project screenshot or image"
     )
+    # Storage names of the thumb/preview renditions (utils/images.py)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     technologies = models.TextField(
         blank=True,
         null=True,
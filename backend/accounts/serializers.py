@@ -4,6 +4,8 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import authenticate
+from utils.images import ImageRenditionField
+
 from .models import PortfolioItem
 
 User = get_user_model()
@@ -255,6 +257,31 @@ class ChangePasswordSerializer(serializers.Serializer):
         return value
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact public user info for list rows (task lists, applications)
+
+    Only columns of the user row - rating and review counts are stored on
+    the user - so it adds no queries when the user is select_related.
+    profile_picture is the thumbnail rendition. PublicUserSerializer has
+    the full profile.
+    """
+    full_name = serializers.SerializerMethodField()
+    profile_picture = ImageRenditionField('profile_picture', 'thumb')
+
+    class Meta:
+        model = User
+        fields = [
+            'id', 'username', 'first_name', 'last_name', 'full_name',
+            'profile_picture', 'city', 'country', 'average_rating',
+            'total_reviews', 'is_verified', 'user_type'
+        ]
+        read_only_fields = fields
+
+    def get_full_name(self, obj):
+        return obj.get_full_name()
+
+
 class PublicUserSerializer(serializers.ModelSerializer):
     """
     Public user info (for displaying in task lists, etc.)
@@ -317,13 +344,15 @@ class PortfolioItemSerializer(serializers.ModelSerializer):
     Serializer for Portfolio Items
     """
     user_username = serializers.CharField(source='user.username', read_only=True)
+    thumbnail = ImageRenditionField('image', 'thumb')
+    preview = ImageRenditionField('image', 'preview')
 
     class Meta:
         model = PortfolioItem
         fields = [
             'id', 'user', 'user_username', 'title', 'description',
-            'project_url', 'image', 'technologies', 'date_completed',
-            'order', 'is_featured', 'created_at', 'updated_at'
+            'project_url', 'image', 'thumbnail', 'preview', 'technologies',
+            'date_completed', 'order', 'is_featured', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'user_username', 'created_at', 'updated_at']
 
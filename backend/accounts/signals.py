@@ -0,0 +1,25 @@
+"""
+Signals for keeping HTTP cache versions of public profiles current and
+rendering uploaded images (utils/images.py)
+"""
+from utils.http_cache import track_versions
+from utils.images import track_renditions
+
+from .models import PortfolioItem, User
+
+# Saves touching only these fields don't change what others see
+PRIVATE_USER_FIELDS = {'last_login', 'password'}
+
+
+def _user_scopes(user, update_fields=None):
+    if update_fields is not None and set(update_fields) <= PRIVATE_USER_FIELDS:
+        return []
+    return ['users', f'user:{user.id}']
+
+
+track_versions(User, _user_scopes)
+track_versions(PortfolioItem, lambda item, update_fields: ['users', f'user:{item.user_id}'])
+
+# Profile pictures also appear on task list rows
+track_renditions(User, 'profile_picture', lambda user: ['users', 'tasks', f'user:{user.id}'])
+track_renditions(PortfolioItem, 'image', lambda item: ['users', f'user:{item.user_id}'])
@@ -6,7 +6,9 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from functools import partial
 from django.db.models import Q
+from django.http import Http404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
@@ -22,6 +24,7 @@ from .serializers import (
     PortfolioItemUpdateSerializer
 )
 from .models import PortfolioItem
+from utils.http_cache import conditional_response
 
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
@@ -363,6 +366,18 @@ class UserDetailView(generics.RetrieveAPIView):
     serializer_class = PublicUserSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'username'
+
+    def retrieve(self, request, *args, **kwargs):
+        """Answer 304 from the profile's version before serializing"""
+        stamp = self.get_queryset().filter(username=kwargs['username']).values('id', 'updated_at').first()
+        if stamp is None:
+            raise Http404
+
+        return conditional_response(
+            request, partial(super().retrieve, request, *args, **kwargs),
+            [f"user:{stamp['id']}", 'skills'],
+            parts=(stamp['updated_at'],), last_modified=stamp['updated_at']
+        )
     
     @extend_schema(
         summary="Get user profile",
@@ -26,7 +26,9 @@ django.setup()
 
 from accounts.models import User
 from recommendations.models import Skill, UserSkill
+from tasks.application_counts import repair_application_counts
 from tasks.models import Category, Task, TaskApplication, Review
+from tasks.ratings import repair_user_ratings
 from django.contrib.auth.hashers import make_password
 
 
@@ -216,13 +218,18 @@ class DatasetLoader:
                     'status': task_data.get('status', 'OPEN'),
                     'assigned_to_id': task_data.get('assigned_to_id'),
                     'views_count': task_data.get('views_count', 0),
-                    'applications_count': task_data.get('applications_count', 0),
                     'created_at': self.parse_datetime(task_data['created_at']),
                     'updated_at': self.parse_datetime(task_data['updated_at']),
                     'completed_at': self.parse_datetime(task_data.get('completed_at')),
                     'image': task_data.get('image'),
                 }
             )
+            # auto_now_add/auto_now ignore the values above - restore the
+            # historical timestamps (the replay harness depends on them)
+            Task.objects.filter(id=task.id).update(
+                created_at=self.parse_datetime(task_data['created_at']),
+                updated_at=self.parse_datetime(task_data['updated_at']),
+            )
             if created:
                 self.stats['tasks'] += 1
 
@@ -263,11 +270,22 @@ class DatasetLoader:
                     'updated_at': self.parse_datetime(prop_data['updated_at']),
                 }
             )
+            # auto_now_add/auto_now ignore the values above - restore the
+            # historical timestamps (the replay harness depends on them)
+            TaskApplication.objects.filter(id=proposal.id).update(
+                created_at=self.parse_datetime(prop_data['created_at']),
+                updated_at=self.parse_datetime(prop_data['updated_at']),
+            )
             if created:
                 self.stats['proposals'] += 1
 
         print(f"[OK] Loaded {self.stats['proposals']} proposals")
 
+        # Creates are counted by tasks/signals.py; re-runs over existing
+        # rows and status changes made through update() are not
+        repaired = repair_application_counts()
+        print(f"[OK] Repaired application counts of {repaired} tasks")
+
     @transaction.atomic
     def load_reviews(self):
         """Load reviews"""
@@ -292,11 +310,23 @@ class DatasetLoader:
                     'updated_at': self.parse_datetime(review_data['updated_at']),
                 }
             )
+            # auto_now_add/auto_now ignore the values above - restore the
+            # historical timestamps (the replay harness depends on them)
+            Review.objects.filter(id=review.id).update(
+                created_at=self.parse_datetime(review_data['created_at']),
+                updated_at=self.parse_datetime(review_data['updated_at']),
+            )
             if created:
                 self.stats['reviews'] += 1
 
         print(f"[OK] Loaded {self.stats['reviews']} reviews")
 
+        # users.json carries its own average_rating/total_reviews; rebuild
+        # them with rating_sum from the loaded public reviews so later
+        # reviews update consistent aggregates (tasks/ratings.py)
+        repaired = repair_user_ratings()
+        print(f"[OK] Rebuilt ratings of {repaired} users from their reviews")
+
     def load_all(self):
         """Load all datasets"""
         print("=" * 60)
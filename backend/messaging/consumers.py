@@ -3,6 +3,8 @@ from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 import json
 
+from utils.images import rendition_url
+
 User = get_user_model()
 
 class ChatConsumer(AsyncJsonWebsocketConsumer):
@@ -159,7 +161,9 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                     'id': self.user.id,
                     'username': self.user.username,
                     'email': self.user.email,
-                    'profile_picture': self.user.profile_picture.url if self.user.profile_picture else None,
+                    'profile_picture': rendition_url(
+                        None, self.user.profile_picture, self.user.profile_picture_renditions, 'thumb'
+                    ),
                     'user_type': self.user.user_type
                 },
                 'content': message.content,
@@ -2,15 +2,24 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Conversation, Message, MessageReadStatus
 from accounts.serializers import PublicUserSerializer
+from utils.images import ImageRenditionField
 
 User = get_user_model()
 
 
+class ChatUserSerializer(PublicUserSerializer):
+    """
+    PublicUserSerializer with the thumbnail rendition as profile_picture
+    (avatars next to every message and conversation)
+    """
+    profile_picture = ImageRenditionField('profile_picture', 'thumb')
+
+
 class MessageSerializer(serializers.ModelSerializer):
     """
     Serializer for messages
     """
-    sender = PublicUserSerializer(read_only=True)
+    sender = ChatUserSerializer(read_only=True)
     is_mine = serializers.SerializerMethodField()
     
     class Meta:
@@ -55,7 +64,7 @@ class ConversationSerializer(serializers.ModelSerializer):
     """
     Serializer for conversations
     """
-    participants = PublicUserSerializer(many=True, read_only=True)
+    participants = ChatUserSerializer(many=True, read_only=True)
     other_participant = serializers.SerializerMethodField()
     last_message = serializers.SerializerMethodField()
     unread_count = serializers.SerializerMethodField()
@@ -76,7 +85,7 @@ class ConversationSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             other = obj.get_other_participant(request.user)
             if other:
-                return PublicUserSerializer(other).data
+                return ChatUserSerializer(other).data
         return None
     
     def get_last_message(self, obj):
@@ -110,7 +119,7 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
     """
     Detailed conversation serializer with messages
     """
-    participants = PublicUserSerializer(many=True, read_only=True)
+    participants = ChatUserSerializer(many=True, read_only=True)
     other_participant = serializers.SerializerMethodField()
     messages = MessageSerializer(many=True, read_only=True)
     task_info = serializers.SerializerMethodField()
@@ -129,7 +138,7 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             other = obj.get_other_participant(request.user)
             if other:
-                return PublicUserSerializer(other).data
+                return ChatUserSerializer(other).data
         return None
     
     def get_task_info(self, obj):
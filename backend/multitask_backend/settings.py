@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
@@ -136,6 +137,12 @@ DATABASES = {
 }
 
 
+# Text search configuration for task full-text search (tasks/search.py).
+# Changing it requires `python manage.py rebuild_search_index`.
+# Arabic words pass through the english configuration unstemmed.
+TASK_SEARCH_CONFIG = config('TASK_SEARCH_CONFIG', default='english')
+
+
 # CHANNELS & REDIS (WebSocket Support)
 
 try:
@@ -368,12 +375,29 @@ MIN_SIMILARITY_SCORE = config('MIN_SIMILARITY_SCORE', default=0.3, cast=float)
 # TF-IDF Settings
 TFIDF_MAX_FEATURES = config('TFIDF_MAX_FEATURES', default=100, cast=int)
 
+# Text tiebreaker engine: 'semantic' (sentence transformer) or 'lexical' (TF-IDF)
+RECOMMENDATION_TEXT_ENGINE = config('RECOMMENDATION_TEXT_ENGINE', default='semantic')
+
+# Score skill/location matches with numpy arrays instead of a per-task loop
+RECOMMENDATION_VECTORIZED = config('RECOMMENDATION_VECTORIZED', default='false', cast=bool)
+
+# Shared embedding server (`manage.py embedding_server`) - when set, web workers
+# send encode requests to this Unix socket instead of each loading the model,
+# and fall back to encoding in process while it is down
+EMBEDDING_SERVER_SOCKET = config('EMBEDDING_SERVER_SOCKET', default='')
+EMBEDDING_SERVER_TIMEOUT = config('EMBEDDING_SERVER_TIMEOUT', default=5.0, cast=float)
+
 # Hybrid weights (must sum to 1.0)
 RECOMMENDATION_WEIGHTS = {
     'tfidf': 0.4,      # TF-IDF weight
     'semantic': 0.6,   # Semantic similarity weight
 }
 
+# Startup budget for django.setup() in a fresh process
+# (checked by recommendations tests, measured by `manage.py benchmark_startup`)
+STARTUP_TIME_BUDGET_SECONDS = config('STARTUP_TIME_BUDGET_SECONDS', default=2.0, cast=float)
+STARTUP_RSS_BUDGET_MB = config('STARTUP_RSS_BUDGET_MB', default=150, cast=int)
+
 
 # EMAIL SETTINGS
 
@@ -436,6 +460,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'tasks': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -487,6 +516,10 @@ except:
     print("Redis down -> using safe in-memory cache")
 
 
+# Redis for counters and other shared data structures (utils/redis_client.py)
+REDIS_URL = config('REDIS_URL', default='redis://127.0.0.1:6379/2')
+
+
 # FILE UPLOAD SETTINGS
 
 # Maximum upload size: 10MB
@@ -497,6 +530,13 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 ALLOWED_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
 ALLOWED_DOCUMENT_EXTENSIONS = ['.pdf', '.doc', '.docx', '.txt']
 
+# Thumbnail/preview renditions of uploaded images (utils/images.py):
+# WEBP or JPEG, encoder quality, and rendering threads per process
+# (0 renders right after commit in the saving thread)
+IMAGE_RENDITION_FORMAT = config('IMAGE_RENDITION_FORMAT', default='WEBP')
+IMAGE_RENDITION_QUALITY = config('IMAGE_RENDITION_QUALITY', default=80, cast=int)
+IMAGE_RENDITION_WORKERS = config('IMAGE_RENDITION_WORKERS', default=2, cast=int)
+
 
 # CUSTOM SETTINGS
 
@@ -515,6 +555,53 @@ MAX_TASK_DESCRIPTION_LENGTH = 2000
 MIN_TASK_BUDGET = 10
 MAX_TASK_BUDGET = 100000
 
+# Task view counter: hits are buffered in Redis (or in process when Redis
+# is down) and flushed to Task.views_count every N seconds (tasks/counters.py)
+TASK_VIEW_FLUSH_INTERVAL = config('TASK_VIEW_FLUSH_INTERVAL', default=30, cast=int)
+
+# Platform statistics snapshot (tasks/statistics.py): adjusted by signals,
+# fully recomputed when it expires after N seconds to correct drift
+TASK_STATS_RECOMPUTE_INTERVAL = config('TASK_STATS_RECOMPUTE_INTERVAL', default=3600, cast=int)
+
+# Anonymous list responses (tasks, categories, skills) are cached for up to
+# N seconds; writes change their key right away (utils/http_cache.py)
+HTTP_CACHE_ANONYMOUS_TIMEOUT = config('HTTP_CACHE_ANONYMOUS_TIMEOUT', default=300, cast=int)
+
+# Task list views build rows from a .values() projection instead of
+# TaskListSerializer instances (tasks/projections.py)
+TASK_LIST_PROJECTION = config('TASK_LIST_PROJECTION', default='true', cast=bool)
+
+# Task list facets (tasks/facets.py): seconds a facet result is cached per
+# filter set
+TASK_FACETS_CACHE_TIMEOUT = config('TASK_FACETS_CACHE_TIMEOUT', default=60, cast=int)
+
+# Trending tasks (tasks/trending.py): hours for a view, save or
+# application to lose half its weight, and the largest ?limit=
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=6, cast=float)
+TRENDING_MAX_LIMIT = config('TRENDING_MAX_LIMIT', default=50, cast=int)
+
+# Similar tasks (recommendations/similar.py): index cells searched per
+# query, seconds between syncs with other processes' changes, largest ?limit=
+SIMILAR_TASKS_NPROBE = config('SIMILAR_TASKS_NPROBE', default=8, cast=int)
+SIMILAR_TASKS_SYNC_INTERVAL = config('SIMILAR_TASKS_SYNC_INTERVAL', default=30, cast=int)
+SIMILAR_TASKS_MAX_LIMIT = config('SIMILAR_TASKS_MAX_LIMIT', default=20, cast=int)
+
+# Near-duplicate tasks (tasks/duplicates.py): estimated text similarity at
+# which a new task is rejected as a repost of one of the client's open tasks
+TASK_DUPLICATE_THRESHOLD = config('TASK_DUPLICATE_THRESHOLD', default=0.8, cast=float)
+
+# Applicant ranking (tasks/applicant_fit.py): seconds a task's ?ordering=fit
+# ranking is cached (new applications drop it sooner)
+APPLICANT_RANKING_CACHE_TIMEOUT = config('APPLICANT_RANKING_CACHE_TIMEOUT', default=600, cast=int)
+
+# Overdue task sweep (tasks/deadlines.py): tasks expired per transaction
+TASK_DEADLINE_SWEEP_BATCH_SIZE = config('TASK_DEADLINE_SWEEP_BATCH_SIZE', default=500, cast=int)
+
+# Bulk task creation (tasks/bulk.py): rows per JSON request and per
+# imported CSV/NDJSON file
+TASK_BULK_MAX_ROWS = config('TASK_BULK_MAX_ROWS', default=500, cast=int)
+TASK_IMPORT_MAX_ROWS = config('TASK_IMPORT_MAX_ROWS', default=5000, cast=int)
+
 # Review settings
 MIN_RATING = 1
 MAX_RATING = 5
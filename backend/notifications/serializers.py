@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Notification, NotificationPreference
 from accounts.models import User
+from utils.images import rendition_url
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -23,7 +24,9 @@ class NotificationSerializer(serializers.ModelSerializer):
                 return {
                     'id': user.id,
                     'username': user.username,
-                    'profile_picture': user.profile_picture.url if user.profile_picture else None
+                    'profile_picture': rendition_url(
+                        None, user.profile_picture, user.profile_picture_renditions, 'thumb'
+                    )
                 }
             except User.DoesNotExist:
                 return None
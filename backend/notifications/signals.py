@@ -30,23 +30,33 @@ def create_application_notification(sender, instance, created, **kwargs):
 
     # Notify freelancer when application status changes
     elif instance.status in ['ACCEPTED', 'REJECTED']:
-        notification_type = 'application_accepted' if instance.status == 'ACCEPTED' else 'application_rejected'
-        title = 'Application Accepted!' if instance.status == 'ACCEPTED' else 'Application Update'
-        message = f'Your application for "{instance.task.title}" has been {instance.status.lower()}'
+        notify_application_status(instance)
 
-        notification = Notification.create_notification(
-            recipient=instance.freelancer,
-            notification_type=notification_type,
-            title=title,
-            message=message,
-            task_id=instance.task.id,
-            application_id=instance.id,
-            sender_id=instance.task.client.id,
-            link=f'/tasks/{instance.task.id}'
-        )
 
-        # Send via WebSocket
-        send_notification_via_websocket(instance.freelancer.id, notification)
+def notify_application_status(application):
+    """
+    Tell the freelancer their application was accepted or rejected
+
+    Also called by the accept/reject views, which change the status with
+    an UPDATE (tasks/application_counts.py) rather than save().
+    """
+    notification_type = 'application_accepted' if application.status == 'ACCEPTED' else 'application_rejected'
+    title = 'Application Accepted!' if application.status == 'ACCEPTED' else 'Application Update'
+    message = f'Your application for "{application.task.title}" has been {application.status.lower()}'
+
+    notification = Notification.create_notification(
+        recipient=application.freelancer,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        task_id=application.task.id,
+        application_id=application.id,
+        sender_id=application.task.client.id,
+        link=f'/tasks/{application.task.id}'
+    )
+
+    # Send via WebSocket
+    send_notification_via_websocket(application.freelancer.id, notification)
 
 
 @receiver(post_save, sender=Message)
@@ -17,6 +17,7 @@ django.setup()
 
 from accounts.models import User
 from tasks.models import Task, TaskApplication, Review, Category
+from tasks.ratings import repair_user_ratings
 
 def main():
     print("Populating menna_allah_mostafa with tasks and applications...\n")
@@ -170,14 +171,9 @@ def main():
     # Count completed tasks
     completed_tasks = Task.objects.filter(assigned_to=menna, status='COMPLETED').count()
 
-    # Calculate average rating
-    reviews = Review.objects.filter(reviewee=menna)
-    if reviews.exists():
-        avg_rating = sum(r.rating for r in reviews) / reviews.count()
-        menna.average_rating = avg_rating
-        menna.total_reviews = reviews.count()
-
-    menna.save()
+    # Rebuild rating aggregates from the public reviews
+    repair_user_ratings([menna.id])
+    menna.refresh_from_db(fields=['rating_sum', 'total_reviews', 'average_rating'])
     print(f"[OK] Updated stats: {completed_tasks} completed tasks, {menna.total_reviews} reviews, {menna.average_rating:.2f} avg rating\n")
 
     # Summary
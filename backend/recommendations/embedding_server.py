@@ -0,0 +1,335 @@
+"""
+Local embedding server
+======================
+
+One process (`python manage.py embedding_server`) holds the sentence
+transformer and serves every web worker over a Unix socket, instead of each
+gunicorn/daphne worker loading its own copy of the model and torch.
+
+Concurrent requests are queued and encoded together: the batcher thread
+waits up to max_wait for more requests (or until max_batch texts are
+queued) and runs a single forward pass for all of them. A request waits
+at most request_timeout seconds; when the server stops, or the batcher
+thread dies, requests still queued are answered with an error.
+
+Protocol - every message is a frame: 4-byte big-endian length + payload.
+    request:  JSON {"texts": [...]}
+    response: JSON {"model": ..., "count": n, "dimensions": d}
+              followed by one frame of n * d little-endian float32 values,
+              or JSON {"error": ...}
+
+The client (encode_remote) raises EmbeddingServerUnavailable on any failure
+so callers can fall back to encoding in process.
+"""
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import stat
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+from .embeddings import get_model_name
+
+logger = logging.getLogger('recommendations')
+
+_HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+# After a failed call, skip the server for this long (per process)
+RETRY_AFTER_SECONDS = 30
+_server_down_until = 0.0
+
+
+class EmbeddingServerUnavailable(Exception):
+    """The embedding server could not be reached or returned an error"""
+
+
+# ==============================================================================
+# FRAMING
+# ==============================================================================
+
+def _recv_exactly(sock, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError('Connection closed mid-frame')
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_frame(sock, payload):
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock):
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f'Frame of {size} bytes exceeds limit')
+    return _recv_exactly(sock, size)
+
+
+# ==============================================================================
+# CLIENT
+# ==============================================================================
+
+def _mark_down(error):
+    """Stop trying the server for a while; warn once per outage window"""
+    global _server_down_until
+    _server_down_until = time.monotonic() + RETRY_AFTER_SECONDS
+    logger.warning(f"Embedding server unavailable, retrying in {RETRY_AFTER_SECONDS}s: {error}")
+
+
+def encode_remote(texts, socket_path=None, timeout=None):
+    """
+    Encode texts on the embedding server.
+
+    Returns a float32 array of shape (len(texts), dimensions). Raises
+    EmbeddingServerUnavailable if the server is not configured, down
+    (checked again after RETRY_AFTER_SECONDS), serving another model, or
+    failed to encode.
+    """
+    import numpy as np
+
+    socket_path = socket_path or getattr(settings, 'EMBEDDING_SERVER_SOCKET', '')
+    if not socket_path:
+        raise EmbeddingServerUnavailable('EMBEDDING_SERVER_SOCKET is not set')
+    if not hasattr(socket, 'AF_UNIX'):
+        raise EmbeddingServerUnavailable('Unix sockets are not supported on this platform')
+    if time.monotonic() < _server_down_until:
+        raise EmbeddingServerUnavailable('Server marked down after a recent failure')
+
+    if timeout is None:
+        timeout = getattr(settings, 'EMBEDDING_SERVER_TIMEOUT', 5.0)
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            send_frame(sock, json.dumps({'texts': list(texts)}).encode('utf-8'))
+            header = json.loads(recv_frame(sock))
+            if 'error' in header:
+                raise EmbeddingServerUnavailable(f"Server error: {header['error']}")
+            if header['model'] != get_model_name():
+                raise EmbeddingServerUnavailable(
+                    f"Server runs {header['model']}, expected {get_model_name()}"
+                )
+            body = recv_frame(sock)
+    except EmbeddingServerUnavailable as e:
+        _mark_down(e)
+        raise
+    except (OSError, ValueError, KeyError) as e:
+        _mark_down(e)
+        raise EmbeddingServerUnavailable(str(e)) from e
+
+    return np.frombuffer(body, dtype='<f4').reshape(header['count'], header['dimensions'])
+
+
+# ==============================================================================
+# SERVER
+# ==============================================================================
+
+class _PendingRequest:
+    def __init__(self, texts):
+        self.texts = texts
+        self.vectors = None
+        self.error = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def fail(self, error):
+        self.error = error
+        self.done.set()
+
+
+class EmbeddingBatcher:
+    """Coalesces queued encode requests into single model.encode() calls"""
+
+    def __init__(self, model, max_batch=256, max_wait=0.01, request_timeout=30):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # Same as the connection timeout: nobody reads the answer after that
+        self.request_timeout = request_timeout
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.encoded = 0
+        self._stopped = threading.Event()
+
+    def submit(self, texts):
+        """
+        Block until the texts have been encoded; returns a float32 array
+
+        Raises TimeoutError after request_timeout seconds, RuntimeError once
+        the batcher has stopped.
+        """
+        if self._stopped.is_set():
+            raise RuntimeError('Embedding server is shutting down')
+        request = _PendingRequest(texts)
+        self.queue.put(request)
+        if self._stopped.is_set():
+            # stop() may have drained the queue just before the put
+            self._fail_queued()
+        if not request.done.wait(self.request_timeout):
+            # The batcher skips it if it is still queued
+            request.cancelled = True
+            raise TimeoutError(f'Embedding request not done after {self.request_timeout}s')
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def stop(self):
+        """Stop batching and fail the requests still queued"""
+        self._stopped.set()
+        self._fail_queued()
+
+    def _fail_queued(self):
+        error = RuntimeError('Embedding server is shutting down')
+        while True:
+            try:
+                self.queue.get_nowait().fail(error)
+            except queue.Empty:
+                return
+
+    def run(self):
+        batch = []
+        try:
+            while not self._stopped.is_set():
+                try:
+                    batch = [self.queue.get(timeout=0.5)]
+                except queue.Empty:
+                    continue
+                self._collect(batch)
+                self._encode(batch)
+                batch = []
+        except Exception as e:
+            logger.error(f"Embedding batcher stopped: {e}", exc_info=True)
+            for request in batch:
+                request.fail(e)
+        finally:
+            # Also after an unexpected error: later submits fail at once
+            # instead of waiting for a thread that is gone
+            self.stop()
+
+    def _collect(self, batch):
+        """Add queued requests to batch until it is full or max_wait passed"""
+        count = sum(len(request.texts) for request in batch)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            count += len(request.texts)
+
+    def _encode(self, batch):
+        import numpy as np
+
+        batch = [request for request in batch if not request.cancelled]
+        if not batch:
+            return
+        texts = [text for request in batch for text in request.texts]
+        try:
+            vectors = np.asarray(
+                self.model.encode(texts, batch_size=max(1, len(texts)), show_progress_bar=False),
+                dtype='<f4'
+            )
+            offset = 0
+            for request in batch:
+                request.vectors = vectors[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+            self.batches += 1
+            self.encoded += len(texts)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.done.set()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # A stalled client must not pin a thread forever
+        self.request.settimeout(self.server.batcher.request_timeout)
+        try:
+            request = json.loads(recv_frame(self.request))
+            texts = request.get('texts')
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise ValueError('"texts" must be a list of strings')
+
+            if texts:
+                vectors = self.server.batcher.submit(texts)
+                count, dimensions = vectors.shape
+                body = vectors.tobytes()
+            else:
+                count, dimensions, body = 0, 0, b''
+
+            header = {'model': self.server.model_name, 'count': count, 'dimensions': dimensions}
+            send_frame(self.request, json.dumps(header).encode('utf-8'))
+            send_frame(self.request, body)
+        except (ConnectionError, socket.timeout):
+            pass
+        except Exception as e:
+            try:
+                send_frame(self.request, json.dumps({'error': str(e)}).encode('utf-8'))
+            except OSError:
+                pass
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server; one thread per connection, one shared batcher"""
+
+    daemon_threads = True
+    # Every web worker may connect at once; the default backlog of 5 makes
+    # clients with a timeout fail with EAGAIN
+    request_queue_size = 128
+
+    def __init__(self, socket_path, model, model_name, max_batch=256, max_wait=0.01):
+        self.socket_path = socket_path
+        self.model_name = model_name
+        self.batcher = EmbeddingBatcher(model, max_batch=max_batch, max_wait=max_wait)
+        self._remove_stale_socket()
+        super().__init__(socket_path, _RequestHandler)
+        # Web workers usually run as the same user or group
+        os.chmod(socket_path, 0o660)
+        self._batcher_thread = threading.Thread(target=self.batcher.run, daemon=True)
+        self._batcher_thread.start()
+
+    def _remove_stale_socket(self):
+        """Remove a socket file left behind by a crashed server"""
+        try:
+            mode = os.stat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise OSError(f'{self.socket_path} exists and is not a socket')
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+                return
+        raise OSError(f'Another embedding server is listening on {self.socket_path}')
+
+    def server_close(self):
+        self.batcher.stop()
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,136 @@
+"""
+Embedding storage helpers
+=========================
+
+Vectors are stored as float32 bytes in the Embedding table together with
+the model name and a hash of the encoded text, so a model change or an
+edited task/profile simply reads as a miss.
+
+The worker functions at the bottom run inside backfill_embeddings'
+process pool; they only need the model name and never touch the database.
+numpy is imported on use so importing this module stays cheap.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger('recommendations')
+
+DEFAULT_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+
+
+def get_model_name():
+    """Sentence transformer model configured for recommendations"""
+    return getattr(settings, 'RECOMMENDATION_MODEL', DEFAULT_MODEL_NAME)
+
+
+def text_hash(text):
+    """Stable fingerprint of the text a vector was computed from"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def vector_to_bytes(vector):
+    import numpy as np
+    return np.asarray(vector, dtype='<f4').tobytes()
+
+
+def bytes_to_vector(data):
+    import numpy as np
+    return np.frombuffer(bytes(data), dtype='<f4')
+
+
+def load_vectors(kind, texts_by_id, model_name=None):
+    """
+    Fetch stored vectors for {object_id: text} in one query.
+
+    Only vectors produced by the current model from the same text are
+    returned; anything else is a miss the caller has to encode.
+    """
+    from .models import Embedding
+
+    if not texts_by_id:
+        return {}
+
+    model_name = model_name or get_model_name()
+    rows = Embedding.objects.filter(
+        kind=kind,
+        object_id__in=list(texts_by_id),
+        model_name=model_name
+    ).values_list('object_id', 'text_hash', 'vector')
+
+    return {
+        object_id: bytes_to_vector(vector)
+        for object_id, stored_hash, vector in rows
+        if stored_hash == text_hash(texts_by_id[object_id])
+    }
+
+
+def store_vectors(kind, rows, model_name=None):
+    """
+    Upsert vectors in bulk.
+
+    rows: iterable of (object_id, text_hash, vector_bytes)
+    """
+    from .models import Embedding
+
+    model_name = model_name or get_model_name()
+    objects = [
+        Embedding(
+            kind=kind,
+            object_id=object_id,
+            model_name=model_name,
+            text_hash=hashed,
+            vector=data,
+            dimensions=len(data) // 4
+        )
+        for object_id, hashed, data in rows
+    ]
+    if not objects:
+        return 0
+
+    Embedding.objects.bulk_create(
+        objects,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['model_name', 'text_hash', 'vector', 'dimensions', 'updated_at']
+    )
+    return len(objects)
+
+
+# ==============================================================================
+# PROCESS POOL WORKERS
+# ==============================================================================
+
+_worker_model = None
+
+
+def load_model(model_name=None):
+    """Load the sentence transformer (imports torch)"""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name or get_model_name())
+
+
+def init_worker(model_name):
+    """Load one model per worker process"""
+    global _worker_model
+
+    # Each process gets its own cores; avoid oversubscribing with torch threads
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+    _worker_model = load_model(model_name)
+
+
+def encode_batch(object_ids, texts):
+    """Encode one batch in a worker, returning (ids, hashes, vector bytes)"""
+    vectors = _worker_model.encode(texts, batch_size=len(texts), show_progress_bar=False)
+    return (
+        object_ids,
+        [text_hash(text) for text in texts],
+        [vector_to_bytes(vector) for vector in vectors]
+    )
@@ -0,0 +1,266 @@
+"""
+Re-embed open tasks and freelancer profiles after a model change or deploy
+
+Rows are streamed with .iterator() in primary key order, encoded in batches
+across a ProcessPoolExecutor (one model per process) and written back with
+bulk upserts. Progress is checkpointed per kind, so an interrupted run picks
+up after the last fully written batch. Rows whose stored vector already
+matches the current model and text are skipped.
+
+Run: python manage.py backfill_embeddings --workers 4
+"""
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from recommendations import embeddings
+from recommendations.models import Embedding
+from recommendations.services import StructuredRecommendationService
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Backfill task and freelancer embeddings in parallel (resumable)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            choices=['task', 'user', 'all'],
+            default='all',
+            help='What to embed',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (1 = encode in this process)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=256,
+            help='Rows per encode batch',
+        )
+        parser.add_argument(
+            '--all-tasks',
+            action='store_true',
+            help='Embed every task, not only OPEN ones',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-encode rows even if the stored vector is current',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(Path(settings.BASE_DIR) / 'logs' / 'backfill_embeddings.json'),
+            help='Checkpoint file used to resume',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore any existing checkpoint',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        self.model_name = embeddings.get_model_name()
+        self.options = options
+        self.checkpoint_path = Path(options['checkpoint'])
+        self.checkpoint = self.load_checkpoint()
+
+        # Text builders only - no model is loaded in this process
+        self.text_service = StructuredRecommendationService(text_engine='lexical')
+
+        kinds = ['task', 'user'] if options['kind'] == 'all' else [options['kind']]
+        workers = max(1, options['workers'])
+
+        self.stdout.write(f'Model: {self.model_name}, workers: {workers}, batch size: {options["batch_size"]}')
+
+        if workers == 1:
+            embeddings.init_worker(self.model_name)
+            for kind in kinds:
+                self.backfill(kind, executor=None, max_in_flight=1)
+        else:
+            # Workers only encode; all database reads and writes stay here
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=embeddings.init_worker,
+                initargs=(self.model_name,)
+            ) as executor:
+                for kind in kinds:
+                    self.backfill(kind, executor=executor, max_in_flight=workers * 2)
+
+        # Finished cleanly - the next run should rescan from the start
+        self.checkpoint_path.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS('Backfill complete'))
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+
+    def load_checkpoint(self):
+        if self.options['restart'] or not self.checkpoint_path.exists():
+            return {'model': self.model_name}
+
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get('model') != self.model_name:
+            self.stdout.write(self.style.WARNING('Checkpoint was written for another model, starting over'))
+            return {'model': self.model_name}
+
+        self.stdout.write(f'Resuming from checkpoint: {checkpoint}')
+        return checkpoint
+
+    def save_checkpoint(self):
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+
+    def get_queryset(self, kind):
+        last_id = self.checkpoint.get(kind, 0)
+
+        if kind == 'task':
+            queryset = Task.objects.select_related('category')
+            if not self.options['all_tasks']:
+                queryset = queryset.filter(status='OPEN')
+        else:
+            queryset = User.objects.filter(user_type__in=['freelancer', 'both'])
+
+        return queryset.filter(id__gt=last_id).order_by('id')
+
+    def build_text(self, kind, obj):
+        if kind == 'task':
+            return self.text_service._build_task_text(obj)
+        return self.text_service._build_minimal_user_text(obj)
+
+    def iter_batches(self, kind, queryset):
+        """Yield (ids, texts) batches straight from a server-side cursor"""
+        batch_size = self.options['batch_size']
+        ids, texts = [], []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            ids.append(obj.id)
+            texts.append(self.build_text(kind, obj))
+            if len(ids) == batch_size:
+                yield ids, texts
+                ids, texts = [], []
+        if ids:
+            yield ids, texts
+
+    def stale_rows(self, kind, ids, texts):
+        """Drop rows whose stored vector is already current"""
+        if self.options['force']:
+            return ids, texts
+
+        current = dict(
+            Embedding.objects.filter(
+                kind=kind,
+                object_id__in=ids,
+                model_name=self.model_name
+            ).values_list('object_id', 'text_hash')
+        )
+        keep = [
+            i for i, (object_id, text) in enumerate(zip(ids, texts))
+            if current.get(object_id) != embeddings.text_hash(text)
+        ]
+        return [ids[i] for i in keep], [texts[i] for i in keep]
+
+    def backfill(self, kind, executor, max_in_flight):
+        queryset = self.get_queryset(kind)
+        total = queryset.count()
+        self.stdout.write(f'\n[{kind}] {total} rows to scan')
+        if not total:
+            return
+
+        started = time.perf_counter()
+        scanned = written = 0
+
+        # Batches finish out of order; the checkpoint only advances past a
+        # batch once it and every batch before it have been written.
+        batch_last_ids = {}
+        finished = set()
+        next_to_commit = 0
+        in_flight = {}
+
+        def commit_finished():
+            nonlocal next_to_commit
+            advanced = False
+            while next_to_commit in finished:
+                self.checkpoint[kind] = batch_last_ids.pop(next_to_commit)
+                finished.discard(next_to_commit)
+                next_to_commit += 1
+                advanced = True
+            if advanced:
+                self.save_checkpoint()
+
+        def report():
+            elapsed = time.perf_counter() - started
+            rate = scanned / elapsed if elapsed else 0
+            eta = (total - scanned) / rate if rate else 0
+            self.stdout.write(
+                f'  {scanned}/{total} scanned, {written} encoded, '
+                f'{rate:.1f} rows/s, ETA {eta:.0f}s'
+            )
+
+        def collect(done_futures):
+            nonlocal written, scanned
+            for future in done_futures:
+                seq, batch_rows = in_flight.pop(future)
+                object_ids, hashes, vectors = future.result()
+                written += embeddings.store_vectors(
+                    kind, zip(object_ids, hashes, vectors), self.model_name
+                )
+                scanned += batch_rows
+                finished.add(seq)
+            commit_finished()
+            report()
+
+        for seq, (ids, texts) in enumerate(self.iter_batches(kind, queryset)):
+            batch_last_ids[seq] = ids[-1]
+            batch_rows = len(ids)
+            ids, texts = self.stale_rows(kind, ids, texts)
+
+            if not ids:
+                scanned += batch_rows
+                finished.add(seq)
+                commit_finished()
+                continue
+
+            if executor is None:
+                written += embeddings.store_vectors(
+                    kind, zip(*embeddings.encode_batch(ids, texts)), self.model_name
+                )
+                scanned += batch_rows
+                finished.add(seq)
+                commit_finished()
+                report()
+                continue
+
+            in_flight[executor.submit(embeddings.encode_batch, ids, texts)] = (seq, batch_rows)
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'[{kind}] {written} vectors written, {scanned} rows scanned in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,68 @@
+"""
+Measure app startup cost against the configured budget
+
+Every run starts a fresh interpreter and times django.setup(), so the
+numbers match what manage.py commands, migrations and workers pay at boot.
+Exits non-zero when the median exceeds STARTUP_TIME_BUDGET_SECONDS /
+STARTUP_RSS_BUDGET_MB or a heavy ML module is imported at startup.
+
+Run: python manage.py benchmark_startup --runs 5
+"""
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.startup import measure_startup
+
+
+class Command(BaseCommand):
+    help = 'Measure django.setup() time and RSS in fresh processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Number of cold starts to measure',
+        )
+        parser.add_argument(
+            '--settings-module',
+            help='Settings module for the measured process (default: current)',
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be positive')
+
+        results = []
+        for run in range(options['runs']):
+            result = measure_startup(options['settings_module'])
+            results.append(result)
+            rss = f'{result["rss_mb"]:.1f} MB' if result['rss_mb'] is not None else 'n/a'
+            self.stdout.write(f'  run {run + 1}: {result["seconds"]:.3f}s, peak RSS {rss}')
+
+        seconds = statistics.median(result['seconds'] for result in results)
+        rss_values = [result['rss_mb'] for result in results if result['rss_mb'] is not None]
+        rss_mb = statistics.median(rss_values) if rss_values else None
+        heavy = sorted({name for result in results for name in result['heavy_modules']})
+
+        time_budget = settings.STARTUP_TIME_BUDGET_SECONDS
+        rss_budget = settings.STARTUP_RSS_BUDGET_MB
+
+        self.stdout.write(f'\nmedian setup time: {seconds:.3f}s (budget {time_budget}s)')
+        if rss_mb is not None:
+            self.stdout.write(f'median peak RSS: {rss_mb:.1f} MB (budget {rss_budget} MB)')
+        self.stdout.write(f'heavy modules at startup: {", ".join(heavy) or "none"}')
+
+        failures = []
+        if seconds > time_budget:
+            failures.append('setup time')
+        if rss_mb is not None and rss_mb > rss_budget:
+            failures.append('peak RSS')
+        if heavy:
+            failures.append('heavy imports')
+
+        if failures:
+            raise CommandError(f'Startup budget exceeded: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('Startup within budget'))
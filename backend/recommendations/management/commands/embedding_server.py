@@ -0,0 +1,96 @@
+"""
+Run the shared local embedding server
+
+Loads RECOMMENDATION_MODEL once and serves encode requests from every web
+worker on a Unix socket, batching concurrent requests into one forward
+pass. Workers use it when EMBEDDING_SERVER_SOCKET is set and fall back to
+encoding in process while it is down.
+
+Run: python manage.py embedding_server --socket /run/multitask/embeddings.sock
+"""
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations import embeddings
+from recommendations.embedding_server import EmbeddingServer
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = 'Serve sentence embeddings to all workers over a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            default=getattr(settings, 'EMBEDDING_SERVER_SOCKET', ''),
+            help='Socket path (default: EMBEDDING_SERVER_SOCKET)',
+        )
+        parser.add_argument(
+            '--max-batch',
+            type=int,
+            default=256,
+            help='Maximum texts encoded in one forward pass',
+        )
+        parser.add_argument(
+            '--max-wait-ms',
+            type=float,
+            default=10,
+            help='How long to wait for more requests before encoding a batch',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            help='torch intra-op threads (default: torch decides)',
+        )
+
+    def handle(self, *args, **options):
+        socket_path = options['socket']
+        if not socket_path:
+            raise CommandError('No socket path - pass --socket or set EMBEDDING_SERVER_SOCKET')
+        if options['max_batch'] < 1:
+            raise CommandError('--max-batch must be positive')
+
+        if options['threads']:
+            try:
+                import torch
+                torch.set_num_threads(options['threads'])
+            except ImportError:
+                pass
+
+        model_name = embeddings.get_model_name()
+        self.stdout.write(f'Loading {model_name}...')
+        try:
+            model = embeddings.load_model(model_name)
+        except ImportError:
+            raise CommandError('sentence-transformers is not installed')
+
+        try:
+            server = EmbeddingServer(
+                socket_path,
+                model,
+                model_name,
+                max_batch=options['max_batch'],
+                max_wait=options['max_wait_ms'] / 1000,
+            )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        # Stop cleanly (and remove the socket) under process managers too
+        signal.signal(signal.SIGTERM, _interrupt)
+
+        self.stdout.write(self.style.SUCCESS(f'Embedding server listening on {socket_path}'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(
+                f'Stopped after {server.batcher.batches} batches, '
+                f'{server.batcher.encoded} texts encoded'
+            )
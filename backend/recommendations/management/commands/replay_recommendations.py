@@ -0,0 +1,278 @@
+"""
+Offline evaluation of task recommendations against historical applications
+
+Replays datasets/proposals.json: for every sampled application the
+freelancer's recommendations are regenerated as of the moment just before
+they applied, and the tasks they actually applied to (within --horizon-days)
+are the ground truth. With --ground-truth reviewed only applications that
+ended in a review of --min-rating or better (datasets/reviews.json) count.
+
+Each variant reports precision/recall@k next to latency and query counts,
+so a faster engine can be compared with the current one before adopting it.
+
+Run: python manage.py replay_recommendations --limit 200 --k 5 10
+"""
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from recommendations.services import StructuredRecommendationService
+
+
+# Tasks only record creation, completion and last-update times
+# (StructuredRecommendationService._open_tasks)
+CANDIDATE_SET_NOTE = (
+    'Note: tasks open at each replayed moment are approximated from created_at, '
+    'completed_at and, for cancelled and expired tasks, updated_at. Tasks already '
+    'assigned at that moment, and cancelled or expired tasks changed again later, '
+    'still count as open.'
+)
+
+# Variant name -> StructuredRecommendationService kwargs
+REPLAY_VARIANTS = {
+    'semantic': {'text_engine': 'semantic'},
+    'lexical': {'text_engine': 'lexical'},
+    'vectorized': {'text_engine': 'semantic', 'vectorized': True},
+    'precomputed': {'text_engine': 'precomputed', 'vectorized': True},
+}
+
+
+class Command(BaseCommand):
+    help = 'Replay historical applications to measure recommendation quality vs. latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset-path',
+            default=str(Path(settings.BASE_DIR).parent / 'datasets'),
+            help='Directory containing proposals.json and reviews.json',
+        )
+        parser.add_argument(
+            '--variants',
+            nargs='+',
+            choices=sorted(REPLAY_VARIANTS),
+            default=sorted(REPLAY_VARIANTS),
+            help='Engine variants to evaluate',
+        )
+        parser.add_argument(
+            '--k',
+            nargs='+',
+            type=int,
+            default=[5, 10],
+            help='Cutoffs for precision/recall@k',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=200,
+            help='Number of applications to replay (0 = all)',
+        )
+        parser.add_argument(
+            '--horizon-days',
+            type=int,
+            default=30,
+            help='Applications within this many days after the replay point count as relevant',
+        )
+        parser.add_argument(
+            '--ground-truth',
+            choices=['applications', 'reviewed'],
+            default='applications',
+            help='Count every application, or only well-reviewed ones, as relevant',
+        )
+        parser.add_argument(
+            '--min-rating',
+            type=int,
+            default=4,
+            help='Minimum review rating for --ground-truth reviewed',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Sampling seed, keeps runs comparable',
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write the report as JSON to this path',
+        )
+
+    def handle(self, *args, **options):
+        dataset_path = Path(options['dataset_path'])
+        ks = sorted(set(options['k']))
+        if not ks or ks[0] < 1:
+            raise CommandError('--k values must be positive')
+
+        events = self.load_events(dataset_path, options)
+        if not events:
+            raise CommandError('No applications to replay')
+
+        users = User.objects.in_bulk({event['freelancer_id'] for event in events})
+        events = [
+            event for event in events
+            if event['freelancer_id'] in users and users[event['freelancer_id']].is_freelancer
+        ]
+        if not events:
+            raise CommandError('None of the replayed freelancers exist in the database - run load_dataset.py first')
+
+        self.stdout.write(f'Replaying {len(events)} applications (k={ks}, ground truth: {options["ground_truth"]})')
+        self.stdout.write(self.style.WARNING(CANDIDATE_SET_NOTE))
+
+        report = {}
+        for variant in options['variants']:
+            self.stdout.write(f'\nVariant: {variant}')
+            service = StructuredRecommendationService(**REPLAY_VARIANTS[variant])
+            report[variant] = self.evaluate(service, events, users, ks)
+            self.print_summary(report[variant], ks)
+
+        self.print_table(report, ks)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+
+    def load_events(self, dataset_path, options):
+        """Build replay events: (freelancer, time, relevant task ids)"""
+        try:
+            with open(dataset_path / 'proposals.json', 'r', encoding='utf-8') as f:
+                proposals = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f'proposals.json not found in {dataset_path}')
+
+        good_pairs = None
+        if options['ground_truth'] == 'reviewed':
+            try:
+                with open(dataset_path / 'reviews.json', 'r', encoding='utf-8') as f:
+                    reviews = json.load(f)
+            except FileNotFoundError:
+                raise CommandError(f'reviews.json not found in {dataset_path}')
+            good_pairs = {
+                (review['task_id'], review['reviewee_id'])
+                for review in reviews
+                if review['rating'] >= options['min_rating']
+            }
+
+        history = defaultdict(list)
+        for proposal in proposals:
+            history[proposal['freelancer_id']].append(
+                (self.parse_datetime(proposal['created_at']), proposal['task_id'])
+            )
+
+        horizon = timedelta(days=options['horizon_days'])
+        events = []
+        for freelancer_id, applications in history.items():
+            applications.sort()
+            for applied_at, task_id in applications:
+                if good_pairs is not None and (task_id, freelancer_id) not in good_pairs:
+                    continue
+
+                # Everything applied to from this point until the horizon
+                relevant = {
+                    other_task_id
+                    for other_applied_at, other_task_id in applications
+                    if applied_at <= other_applied_at <= applied_at + horizon
+                    and (good_pairs is None or (other_task_id, freelancer_id) in good_pairs)
+                }
+                events.append({
+                    'freelancer_id': freelancer_id,
+                    # Just before the application, so the task is still a candidate
+                    'as_of': applied_at - timedelta(seconds=1),
+                    'relevant': relevant,
+                })
+
+        limit = options['limit']
+        if limit and len(events) > limit:
+            events = random.Random(options['seed']).sample(events, limit)
+
+        events.sort(key=lambda event: event['as_of'])
+        return events
+
+    def parse_datetime(self, dt_str):
+        """Parse dataset timestamps the same way load_dataset.py stores them"""
+        value = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    def evaluate(self, service, events, users, ks):
+        """Replay every event through one service variant"""
+        max_k = max(ks)
+        precision = {k: [] for k in ks}
+        recall = {k: [] for k in ks}
+        latencies = []
+        query_counts = []
+
+        for event in events:
+            user = users[event['freelancer_id']]
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                tasks = service.recommend_tasks_for_freelancer(
+                    user,
+                    limit=max_k,
+                    use_cache=False,
+                    as_of=event['as_of']
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+            query_counts.append(len(queries))
+
+            ranked_ids = [task.id for task in tasks]
+            relevant = event['relevant']
+            for k in ks:
+                hits = len(set(ranked_ids[:k]) & relevant)
+                precision[k].append(hits / k)
+                recall[k].append(hits / len(relevant))
+
+        latencies.sort()
+        return {
+            'events': len(events),
+            'precision': {k: statistics.mean(values) for k, values in precision.items()},
+            'recall': {k: statistics.mean(values) for k, values in recall.items()},
+            'latency_ms': {
+                'mean': statistics.mean(latencies),
+                'p50': latencies[len(latencies) // 2],
+                'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            },
+            'queries': {
+                'mean': statistics.mean(query_counts),
+                'max': max(query_counts),
+            },
+        }
+
+    def print_summary(self, result, ks):
+        for k in ks:
+            self.stdout.write(
+                f'  precision@{k}: {result["precision"][k]:.4f}  recall@{k}: {result["recall"][k]:.4f}'
+            )
+        latency = result['latency_ms']
+        self.stdout.write(
+            f'  latency: mean {latency["mean"]:.1f} ms, p50 {latency["p50"]:.1f} ms, p95 {latency["p95"]:.1f} ms'
+        )
+        self.stdout.write(
+            f'  queries: mean {result["queries"]["mean"]:.1f}, max {result["queries"]["max"]}'
+        )
+
+    def print_table(self, report, ks):
+        """One line per variant for quick comparison"""
+        header = ['variant'] + [f'P@{k}' for k in ks] + [f'R@{k}' for k in ks] + ['p50 ms', 'p95 ms', 'queries']
+        self.stdout.write('\n' + '  '.join(f'{column:>10}' for column in header))
+        for variant, result in report.items():
+            row = [variant]
+            row += [f'{result["precision"][k]:.4f}' for k in ks]
+            row += [f'{result["recall"][k]:.4f}' for k in ks]
+            row += [
+                f'{result["latency_ms"]["p50"]:.1f}',
+                f'{result["latency_ms"]["p95"]:.1f}',
+                f'{result["queries"]["mean"]:.1f}',
+            ]
+            self.stdout.write('  '.join(f'{value:>10}' for value in row))
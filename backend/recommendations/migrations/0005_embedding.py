@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0004_skill_userskill_skill_skills_categor_82208c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Embedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('user', 'User')], max_length=10)),
+                ('object_id', models.BigIntegerField(help_text='Task or User ID')),
+                ('model_name', models.CharField(max_length=200)),
+                ('text_hash', models.CharField(help_text='SHA-1 of the text that was encoded (detects stale vectors)', max_length=40)),
+                ('vector', models.BinaryField()),
+                ('dimensions', models.IntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Embedding',
+                'verbose_name_plural': 'Embeddings',
+                'db_table': 'embeddings',
+                'indexes': [models.Index(fields=['kind', 'model_name'], name='embeddings_kind_3edb08_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -153,4 +153,47 @@ class RecommendationLog(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.recommendation_type} for {self.user.username} at {self.created_at}" 
\ No newline at end of file
+        return f"{self.recommendation_type} for {self.user.username} at {self.created_at}"
+
+
+class Embedding(models.Model):
+    """
+    Stored sentence-transformer vector for a task or a freelancer profile
+
+    Written in bulk by the backfill_embeddings command and read by the
+    'precomputed' text engine, so recommendations don't re-encode every
+    candidate task on each request.
+    """
+
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('user', 'User'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField(help_text="Task or User ID")
+
+    # Which model produced the vector and from what text
+    model_name = models.CharField(max_length=200)
+    text_hash = models.CharField(
+        max_length=40,
+        help_text="SHA-1 of the text that was encoded (detects stale vectors)"
+    )
+
+    # float32 array, little-endian
+    vector = models.BinaryField()
+    dimensions = models.IntegerField()
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'embeddings'
+        verbose_name = 'Embedding'
+        verbose_name_plural = 'Embeddings'
+        unique_together = ['kind', 'object_id']
+        indexes = [
+            models.Index(fields=['kind', 'model_name']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} ({self.model_name})"
@@ -0,0 +1,149 @@
+"""
+Per-user recommendation profiles
+================================
+
+Everything the recommender needs to know about a freelancer before ranking
+(skill ids, onboarding state, interests, budget range, location, remote
+preference and the stored profile vector) kept under one cache key, so the
+setup phase of a recommendation request is a single cache read.
+
+Profiles are rebuilt by signals (see signals.py) after the transaction that
+changed a UserPreference, UserSkill or User row commits. A cache miss
+(eviction, cold cache) builds the profile on the spot.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+from . import embeddings
+
+logger = logging.getLogger('recommendations')
+
+# Bump when the profile layout changes so old entries are ignored
+PROFILE_VERSION = 1
+PROFILE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# User fields that feed the profile; saves limited to other fields are ignored
+PROFILE_USER_FIELDS = {'bio', 'skills', 'city', 'user_type'}
+
+
+def profile_cache_key(user_id):
+    return f'recommendation_profile_v{PROFILE_VERSION}_{user_id}'
+
+
+def build_profile(user):
+    """Build a profile from the database (about three queries)"""
+    from .models import UserPreference
+    from .services import StructuredRecommendationService
+    from .skill_model import UserSkill
+
+    prefs = UserPreference.objects.filter(user=user).first()
+    skill_ids = sorted(UserSkill.objects.filter(user=user).values_list('skill_id', flat=True))
+
+    # Same text the service and backfill_embeddings encode for this user
+    user_text = StructuredRecommendationService(text_engine='lexical')._build_minimal_user_text(user)
+    hashed = embeddings.text_hash(user_text)
+    vectors = embeddings.load_vectors('user', {user.id: user_text})
+
+    return {
+        'user_id': user.id,
+        'skill_ids': skill_ids,
+        'onboarding_completed': bool(prefs and prefs.onboarding_completed),
+        'interests': (prefs.interests or []) if prefs else [],
+        'preferred_task_types': (prefs.preferred_task_types or []) if prefs else [],
+        'min_budget': float(prefs.min_budget) if prefs and prefs.min_budget is not None else None,
+        'max_budget': float(prefs.max_budget) if prefs and prefs.max_budget is not None else None,
+        'location': (prefs.preferred_location if prefs else None) or user.city,
+        'prefer_remote': bool(prefs and prefs.prefer_remote),
+        'text_hash': hashed,
+        'vector': embeddings.vector_to_bytes(vectors[user.id]) if user.id in vectors else None,
+    }
+
+
+def get_profile(user):
+    """Load a user's profile with one cache read, building it on a miss"""
+    try:
+        profile = cache.get(profile_cache_key(user.id))
+        if profile is not None:
+            return profile
+    except Exception as e:
+        logger.warning(f"Profile cache read error: {e}")
+
+    return rebuild_profile(user)
+
+
+def rebuild_profile(user):
+    """Rebuild and cache a profile (user instance or id)"""
+    from accounts.models import User
+
+    if not isinstance(user, User):
+        user = User.objects.filter(id=user).first()
+        if user is None:
+            return None
+
+    profile = build_profile(user)
+    try:
+        cache.set(profile_cache_key(user.id), profile, PROFILE_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Profile cache write error: {e}")
+    return profile
+
+
+def delete_profile(user_id):
+    try:
+        cache.delete(profile_cache_key(user_id))
+    except Exception as e:
+        logger.warning(f"Profile cache delete error: {e}")
+
+
+def update_profile_vector(user_id, hashed, vector_bytes):
+    """Store a freshly encoded user vector in the cached profile"""
+    try:
+        key = profile_cache_key(user_id)
+        profile = cache.get(key)
+        if profile is None:
+            return
+        profile['text_hash'] = hashed
+        profile['vector'] = vector_bytes
+        cache.set(key, profile, PROFILE_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Profile cache write error: {e}")
+
+
+# ==============================================================================
+# REBUILD SCHEDULING
+# ==============================================================================
+
+# One transaction often touches the same user many times (onboarding deletes
+# and recreates every skill, then saves the preferences and the user). Each
+# change marks the user pending on the transaction's connection and
+# registers a callback; after commit the first callback clears the mark and
+# rebuilds, the rest skip. Concurrent transactions run on other connections
+# with their own marks, so each of them still rebuilds after its own commit.
+# A rolled-back transaction can leave a mark behind; the next rebuild of
+# that user on the connection clears it.
+def _pending_rebuilds():
+    connection = transaction.get_connection()
+    pending = getattr(connection, 'pending_profile_rebuilds', None)
+    if pending is None:
+        pending = connection.pending_profile_rebuilds = set()
+    return pending
+
+
+def schedule_profile_rebuild(user_id):
+    """Rebuild a user's profile once the current transaction commits"""
+    pending = _pending_rebuilds()
+    pending.add(user_id)
+
+    def rebuild():
+        if user_id not in pending:
+            return
+        pending.discard(user_id)
+        try:
+            rebuild_profile(user_id)
+        except Exception as e:
+            logger.warning(f"Profile rebuild failed for user {user_id}: {e}")
+            delete_profile(user_id)
+
+    transaction.on_commit(rebuild)
@@ -3,17 +3,13 @@ STRUCTURED SKILL-BASED RECOMMENDATION SYSTEM WITH SAFE CACHING
 ==============================================================
 
 This version includes graceful fallbacks for missing dependencies
+
+numpy, scikit-learn and sentence-transformers (torch) are imported inside
+the methods that use them. signals.py loads this module with the app, and
+importing them at module level made every manage.py command and worker
+boot pay for them.
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    
-import numpy as np
 from django.conf import settings
 from django.db.models import Q, Count, Prefetch
 from django.core.cache import cache
@@ -27,18 +23,74 @@ logger = logging.getLogger('recommendations')
 # Cache timeout for recommendations (5 minutes)
 RECOMMENDATION_CACHE_TIMEOUT = 300
 
+# Cold start: trending tasks considered, and points per trending score unit
+# (a fresh application scores 5, i.e. 50 points; a same-city match is 200)
+COLD_START_TRENDING_CANDIDATES = 200
+COLD_START_TRENDING_WEIGHT = 10
+
+
+def _get_sentence_transformer_class():
+    """Import sentence-transformers on first use, None if not installed"""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    return SentenceTransformer
+
 
 class StructuredRecommendationService:
     """
     Structured Skill-Based Recommendation System with safe caching
     """
 
-    def __init__(self):
-        """Initialize the recommendation service with error handling"""
+    TEXT_ENGINES = ('semantic', 'lexical', 'precomputed')
+
+    # Statuses a task never leaves; with updated_at they bound when it closed
+    REPLAY_CLOSED_STATUSES = ('CANCELLED', 'EXPIRED')
+
+    def __init__(self, text_engine=None, vectorized=None):
+        """
+        Initialize the recommendation service with error handling
+
+        text_engine: 'semantic' (sentence transformer), 'lexical' (TF-IDF) or
+            'precomputed' (stored embeddings, encoding only the misses),
+            defaults to settings.RECOMMENDATION_TEXT_ENGINE
+        vectorized: score skill/location matches with numpy arrays instead of
+            a per-task loop, defaults to settings.RECOMMENDATION_VECTORIZED
+        """
+        if text_engine is None:
+            text_engine = getattr(settings, 'RECOMMENDATION_TEXT_ENGINE', 'semantic')
+        if text_engine not in self.TEXT_ENGINES:
+            raise ValueError(f"Unknown text engine: {text_engine}")
+        self.text_engine = text_engine
+
+        if vectorized is None:
+            vectorized = getattr(settings, 'RECOMMENDATION_VECTORIZED', False)
+        self.vectorized = vectorized
+
+        self.semantic_model = None
+        self._model_load_attempted = False
+        self.embedding_server = getattr(settings, 'EMBEDDING_SERVER_SOCKET', '') or None
+
+        if self.text_engine == 'lexical':
+            # TF-IDF needs no model
+            return
+
+        if self.embedding_server:
+            # Encoding goes to the shared embedding server; the model is only
+            # loaded in this process if the server turns out to be down
+            return
+
+        self._load_semantic_model()
+
+    def _load_semantic_model(self):
+        """Load the sentence transformer into this process (once per service)"""
+        self._model_load_attempted = True
         try:
             model_name = getattr(settings, 'RECOMMENDATION_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
 
-            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            SentenceTransformer = _get_sentence_transformer_class()
+            if SentenceTransformer is None:
                 logger.warning("sentence-transformers not available, using fallback")
                 self.semantic_model = None
                 return
@@ -58,12 +110,38 @@ class StructuredRecommendationService:
             logger.error(f"Error initializing recommendation service: {e}")
             self.semantic_model = None
 
-    def recommend_tasks_for_freelancer(self, user, limit=None, use_cache=True):
+    def _encode(self, texts):
+        """
+        Encode texts with the shared embedding server if configured, else
+        (or while it is down) with the in-process model.
+
+        Returns None when neither is available.
+        """
+        if self.embedding_server:
+            from .embedding_server import EmbeddingServerUnavailable, encode_remote
+
+            try:
+                return encode_remote(texts, self.embedding_server)
+            except EmbeddingServerUnavailable as e:
+                logger.debug(f"Encoding in process: {e}")
+
+        if self.semantic_model is None and not self._model_load_attempted:
+            self._load_semantic_model()
+        if self.semantic_model is None:
+            return None
+
+        return self.semantic_model.encode(texts)
+
+    def recommend_tasks_for_freelancer(self, user, limit=None, use_cache=True, as_of=None):
         """
         Recommend tasks using STRUCTURED SKILL ID MATCHING as primary factor
 
         Includes COLD START ALGORITHM for new users without skills/preferences
 
+        Pass as_of (datetime) to rank against the tasks that were open at that
+        moment instead of now - used by the offline replay harness. Caching
+        is always skipped for as_of requests.
+
         Safe version with error handling
         """
         if user.user_type not in ["freelancer", "both"]:
@@ -72,6 +150,9 @@ class StructuredRecommendationService:
         if limit is None:
             limit = getattr(settings, 'MAX_RECOMMENDATIONS', 10)
 
+        if as_of is not None:
+            use_cache = False
+
         # Check cache first (if enabled) - with error handling
         if use_cache:
             try:
@@ -89,6 +170,9 @@ class StructuredRecommendationService:
 
             self._current_user = user
 
+            # Everything the setup phase needs, in one cache read
+            self._current_profile = self._get_profile(user, refresh=True)
+
             # Check if user has skills (for cold start detection)
             user_skill_ids = self._get_user_skill_ids(user)
             has_skills = len(user_skill_ids) > 0
@@ -99,20 +183,21 @@ class StructuredRecommendationService:
             # COLD START: No skills + No onboarding
             if not has_skills and not has_onboarding:
                 logger.info(f"[COLD START] User {user.username} has no skills/preferences. Using cold start algorithm...")
-                return self._cold_start_recommendations(user, limit, use_cache)
+                return self._cold_start_recommendations(user, limit, use_cache, as_of=as_of)
 
             # STEP 1: Filter tasks (location-based)
-            filtered_tasks = self._filter_tasks_for_user(user)
+            filtered_tasks = self._filter_tasks_for_user(user, as_of=as_of)
 
             if not filtered_tasks.exists():
                 logger.info("No tasks passed filtering, using cold start fallback")
-                return self._cold_start_recommendations(user, limit, use_cache)
+                return self._cold_start_recommendations(user, limit, use_cache, as_of=as_of)
 
             logger.info(f"Filtered to {filtered_tasks.count()} tasks")
             logger.info(f"User has {len(user_skill_ids)} structured skills: {user_skill_ids}")
 
             # STEP 2: Score each task using STRUCTURED matching
-            ranked_tasks = self._rank_tasks_by_structure(
+            rank = self._rank_tasks_vectorized if self.vectorized else self._rank_tasks_by_structure
+            ranked_tasks = rank(
                 filtered_tasks,
                 user,
                 user_skill_ids
@@ -142,25 +227,66 @@ class StructuredRecommendationService:
 
         except Exception as e:
             logger.error(f"Recommendation error: {e}", exc_info=True)
-            return self._cold_start_recommendations(user, limit, use_cache)
+            return self._cold_start_recommendations(user, limit, use_cache, as_of=as_of)
+
+    def _get_profile(self, user, refresh=False):
+        """
+        The user's recommendation profile (see profiles.py), reused for the
+        rest of the current request once loaded
+        """
+        profile = getattr(self, '_current_profile', None)
+        if refresh or profile is None or profile['user_id'] != user.id:
+            from .profiles import get_profile
+            profile = get_profile(user)
+        return profile
 
     def _check_onboarding_status(self, user):
         """Check if user has completed onboarding"""
         try:
-            from .models import UserPreference
-            prefs = UserPreference.objects.filter(user=user, onboarding_completed=True).first()
-            return prefs is not None
+            return self._get_profile(user)['onboarding_completed']
         except Exception as e:
             logger.warning(f"Error checking onboarding status: {e}")
             return False
 
-    def _cold_start_recommendations(self, user, limit, use_cache=True):
+    def _open_tasks(self, as_of=None):
+        """
+        Tasks open for applications now, or at as_of.
+
+        History only records creation and completion times, so a task counts
+        as open at as_of if it existed, had not been completed yet, and was
+        not already cancelled or expired: a task in one of
+        REPLAY_CLOSED_STATUSES last updated at or before as_of has had that
+        status since. Assignment times aren't recorded (updated_at of
+        assigned and completed tasks in the dataset predates later
+        applications), so a task that was assigned before as_of still
+        counts as open (replay_recommendations prints this limit).
+        """
+        if as_of is None:
+            return Task.objects.filter(status='OPEN')
+
+        return Task.objects.filter(
+            created_at__lte=as_of
+        ).filter(
+            Q(completed_at__isnull=True) | Q(completed_at__gt=as_of)
+        ).exclude(
+            status__in=self.REPLAY_CLOSED_STATUSES, updated_at__lte=as_of
+        )
+
+    def _applied_task_ids(self, user, as_of=None):
+        """Task IDs the user had applied to (now, or before as_of)"""
+        applications = TaskApplication.objects.filter(freelancer=user)
+        if as_of is not None:
+            applications = applications.filter(created_at__lt=as_of)
+        return applications.values_list('task_id', flat=True)
+
+    def _cold_start_recommendations(self, user, limit, use_cache=True, as_of=None):
         """
         COLD START ALGORITHM
 
         For new users without skills or preferences, recommend based on:
         1. Location match (same city as user)
-        2. Popularity (most viewed/applied tasks)
+        2. Popularity (most viewed/applied tasks, plus recent activity from
+           tasks/trending.py)
         3. Recency (newest tasks first)
         4. Budget range (mid-range tasks)
 
@@ -170,13 +296,11 @@ class StructuredRecommendationService:
 
         try:
             # Base queryset: OPEN tasks only
-            queryset = Task.objects.filter(status='OPEN').select_related('category', 'client')
+            queryset = self._open_tasks(as_of).select_related('category', 'client')
 
             # Exclude tasks user already applied to
             try:
-                applied_task_ids = TaskApplication.objects.filter(
-                    freelancer=user
-                ).values_list('task_id', flat=True)
+                applied_task_ids = self._applied_task_ids(user, as_of)
                 queryset = queryset.exclude(id__in=applied_task_ids)
             except:
                 pass
@@ -185,7 +309,9 @@ class StructuredRecommendationService:
             queryset = queryset.exclude(client=user)
 
             # Build scoring components
-            from django.db.models import Q, F, Case, When, IntegerField, Value
+            from django.db.models import (
+                Q, F, Case, When, ExpressionWrapper, FloatField, IntegerField, Value
+            )
 
             # Location scoring
             location_score = Case(
@@ -202,15 +328,27 @@ class StructuredRecommendationService:
             # Applications worth more than views
             popularity_score = F('views_count') + (F('applications_count') * 2)
 
+            # Trending score: decayed views/saves/applications of the last
+            # hours. Not known for the past, so left out when replaying as_of
+            hot_tasks = [] if as_of is not None else self._trending_tasks()
+            trend_score = Case(
+                *[When(id=task_id, then=Value(score)) for task_id, score in hot_tasks],
+                default=Value(0.0),
+                output_field=FloatField()
+            ) if hot_tasks else Value(0.0, output_field=FloatField())
+
             # Annotate with scores
             queryset = queryset.annotate(
                 location_score=location_score,
                 popularity_score=popularity_score,
+                trend_score=trend_score,
                 # Combined score: location (40%) + popularity (30%) + recency (30%)
-                cold_start_score=(
+                cold_start_score=ExpressionWrapper(
                     F('location_score') * 4 +  # Location weight: 4x
                     F('popularity_score') +     # Popularity weight: 1x
-                    Value(0)                     # Recency handled by ordering
+                    F('trend_score') * COLD_START_TRENDING_WEIGHT +
+                    Value(0),                    # Recency handled by ordering
+                    output_field=FloatField()
                 )
             )
 
@@ -242,36 +380,23 @@ class StructuredRecommendationService:
         except Exception as e:
             logger.error(f"Cold start error: {e}", exc_info=True)
             # Ultimate fallback: just return recent tasks
-            return list(Task.objects.filter(status='OPEN').order_by('-created_at')[:limit])
+            return list(self._open_tasks(as_of).order_by('-created_at')[:limit])
 
-    def _get_user_skill_ids(self, user):
-        """
-        Get set of user's structured skill IDs with safe caching
-        """
+    def _trending_tasks(self):
+        """[(task_id, score)] of the most active open tasks right now"""
         try:
-            cache_key = f'user_skills_{user.id}'
-            cached_skills = cache.get(cache_key)
-
-            if cached_skills is not None:
-                logger.debug(f"Using cached skills for {user.username}")
-                return cached_skills
+            from tasks.trending import top_tasks
+            return top_tasks(k=COLD_START_TRENDING_CANDIDATES)
         except Exception as e:
-            logger.warning(f"Cache error for user skills: {e}")
+            logger.warning(f"Trending scores unavailable: {e}")
+            return []
 
+    def _get_user_skill_ids(self, user):
+        """
+        Get set of user's structured skill IDs from the cached profile
+        """
         try:
-            from .skill_model import UserSkill
-
-            user_skills = UserSkill.objects.filter(user=user).values_list('skill_id', flat=True)
-            skill_ids = set(user_skills)
-
-            # Try to cache - but don't fail if cache is down
-            try:
-                cache.set(cache_key, skill_ids, 1800)
-                logger.debug(f"Cached skills for {user.username}: {skill_ids}")
-            except Exception as e:
-                logger.warning(f"Failed to cache user skills: {e}")
-
-            return skill_ids
+            return set(self._get_profile(user)['skill_ids'])
         except Exception as e:
             logger.error(f"Error getting user skills: {e}")
             return set()
@@ -299,7 +424,7 @@ class StructuredRecommendationService:
         user_text = self._build_minimal_user_text(user)
 
         # Calculate text similarity (tiebreaker)
-        text_similarities = self._calculate_text_similarity(user_text, task_texts)
+        text_similarities = self._calculate_text_similarity(user_text, task_texts, user=user, tasks=task_list)
 
         for i, task in enumerate(task_list):
             # STEP 1: SKILL ID MATCHING (PRIMARY)
@@ -356,6 +481,82 @@ class StructuredRecommendationService:
         logger.info(f"Ranked {len(ranked_tasks)} tasks by structured data")
         return ranked_tasks
 
+    def _rank_tasks_vectorized(self, tasks, user, user_skill_ids):
+        """
+        Same scoring as _rank_tasks_by_structure, computed over numpy arrays.
+
+        Task skills come from one query on the M2M through table instead of
+        one query per task, and the boosts are applied column-wise.
+        """
+        import numpy as np
+
+        task_list = list(tasks)
+        if not task_list:
+            return []
+
+        task_ids = [task.id for task in task_list]
+        position = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        skill_counts = np.zeros(len(task_list))
+        match_counts = np.zeros(len(task_list))
+        through_rows = Task.required_skills.through.objects.filter(
+            task_id__in=task_ids
+        ).values_list('task_id', 'skill_id')
+        for task_id, skill_id in through_rows:
+            i = position[task_id]
+            skill_counts[i] += 1
+            if skill_id in user_skill_ids:
+                match_counts[i] += 1
+
+        # Same tiers as the loop version
+        skill_boosts = np.select(
+            [match_counts >= 3, match_counts == 2, match_counts == 1, skill_counts > 0],
+            [10.0, 7.0, 5.0, 0.1],
+            default=1.0
+        )
+
+        user_city = (getattr(user, 'city', None) or '').lower()
+        has_city = np.array([bool(task.city) for task in task_list])
+        same_city = np.array([bool(task.city) and task.city.lower() == user_city for task in task_list])
+        is_remote = np.array([bool(getattr(task, 'is_remote', False)) for task in task_list])
+        if user_city:
+            location_boosts = np.select(
+                [has_city & same_city, has_city & is_remote, has_city, is_remote],
+                [2.5, 1.8, 0.2, 2.0],
+                default=1.0
+            )
+        else:
+            location_boosts = np.where(is_remote, 2.0, 1.0)
+
+        task_texts = [self._build_task_text(task) for task in task_list]
+        user_text = self._build_minimal_user_text(user)
+        text_similarities = self._calculate_text_similarity(user_text, task_texts, user=user, tasks=task_list)
+        if text_similarities is None:
+            text_similarities = np.full(len(task_list), 0.5)
+        text_similarities = np.asarray(text_similarities, dtype=float)
+
+        raw_scores = skill_boosts * location_boosts * (0.1 + text_similarities * 0.9)
+        normalized_scores = np.minimum(1.0, raw_scores / 15.0)
+
+        # Stable sort keeps queryset order for ties, like list.sort()
+        order = np.argsort(-raw_scores, kind='stable')
+
+        ranked_tasks = [
+            {
+                'task': task_list[i],
+                'skill_match_count': int(match_counts[i]),
+                'skill_boost': float(skill_boosts[i]),
+                'location_boost': float(location_boosts[i]),
+                'text_similarity': float(text_similarities[i]),
+                'final_score': float(normalized_scores[i]),
+                'raw_score': float(raw_scores[i])
+            }
+            for i in order
+        ]
+
+        logger.info(f"Ranked {len(ranked_tasks)} tasks by structured data (vectorized)")
+        return ranked_tasks
+
     def _calculate_location_boost(self, task, user):
         """Calculate location boost factor"""
         try:
@@ -416,19 +617,27 @@ class StructuredRecommendationService:
 
         return ' '.join(parts) if parts else "Task"
 
-    def _calculate_text_similarity(self, user_text, task_texts):
+    def _calculate_text_similarity(self, user_text, task_texts, user=None, tasks=None):
         """Calculate text similarity with fallback"""
+        if self.text_engine == 'lexical':
+            return self._calculate_lexical_similarity(user_text, task_texts)
+
+        if self.text_engine == 'precomputed' and user is not None and tasks is not None:
+            return self._calculate_precomputed_similarity(user, user_text, tasks, task_texts)
+
+        import numpy as np
+        from sklearn.metrics.pairwise import cosine_similarity
+
         try:
-            if not self.semantic_model or not SENTENCE_TRANSFORMERS_AVAILABLE:
+            # One request for the user and all tasks
+            encoded = self._encode([user_text] + list(task_texts))
+            if encoded is None:
                 logger.debug("Semantic model not available, using fallback similarity")
                 return np.full(len(task_texts), 0.5)  # Neutral similarity
 
-            user_embedding = self.semantic_model.encode(user_text)
-            task_embeddings = self.semantic_model.encode(task_texts)
-
             similarities = cosine_similarity(
-                [user_embedding],
-                task_embeddings
+                encoded[0:1],
+                encoded[1:]
             )[0]
 
             return similarities
@@ -437,29 +646,105 @@ class StructuredRecommendationService:
             logger.error(f"Text similarity error: {e}")
             return np.full(len(task_texts), 0.5)  # Fallback to neutral
 
-    def _filter_tasks_for_user(self, user):
+    def _calculate_precomputed_similarity(self, user, user_text, tasks, task_texts):
+        """
+        Cosine similarity from stored embeddings (see backfill_embeddings).
+
+        Misses - new or edited tasks, profiles changed since the backfill -
+        are encoded in one batch and written back for the next request.
+        """
+        import numpy as np
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        from . import embeddings
+
+        try:
+            task_text_by_id = {task.id: text for task, text in zip(tasks, task_texts)}
+            task_vectors = embeddings.load_vectors('task', task_text_by_id)
+
+            # The profile carries the stored user vector; only fall back to
+            # the table if it is missing or was built from other text
+            profile = self._get_profile(user)
+            if profile.get('vector') is not None and profile.get('text_hash') == embeddings.text_hash(user_text):
+                user_vectors = {user.id: embeddings.bytes_to_vector(profile['vector'])}
+            else:
+                user_vectors = embeddings.load_vectors('user', {user.id: user_text})
+
+            missing_tasks = [task_id for task_id in task_text_by_id if task_id not in task_vectors]
+            missing_user = user.id not in user_vectors
+
+            if missing_tasks or missing_user:
+                texts = [task_text_by_id[task_id] for task_id in missing_tasks]
+                if missing_user:
+                    texts.append(user_text)
+                encoded = self._encode(texts)
+                if encoded is None:
+                    logger.debug("Semantic model not available, using fallback similarity")
+                    return np.full(len(task_texts), 0.5)
+
+                new_task_rows = []
+                for task_id, vector in zip(missing_tasks, encoded):
+                    task_vectors[task_id] = vector
+                    new_task_rows.append((
+                        task_id,
+                        embeddings.text_hash(task_text_by_id[task_id]),
+                        embeddings.vector_to_bytes(vector)
+                    ))
+                embeddings.store_vectors('task', new_task_rows)
+
+                if missing_user:
+                    from .profiles import update_profile_vector
+
+                    user_vectors[user.id] = encoded[-1]
+                    user_row = (
+                        user.id,
+                        embeddings.text_hash(user_text),
+                        embeddings.vector_to_bytes(encoded[-1])
+                    )
+                    embeddings.store_vectors('user', [user_row])
+                    update_profile_vector(*user_row)
+
+            task_matrix = np.vstack([task_vectors[task.id] for task in tasks])
+            return cosine_similarity([user_vectors[user.id]], task_matrix)[0]
+
+        except Exception as e:
+            logger.error(f"Precomputed similarity error: {e}")
+            return np.full(len(task_texts), 0.5)
+
+    def _calculate_lexical_similarity(self, user_text, task_texts):
+        """TF-IDF cosine similarity - no model download, cheap to compute"""
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        try:
+            vectorizer = TfidfVectorizer(
+                max_features=getattr(settings, 'TFIDF_MAX_FEATURES', 100)
+            )
+            matrix = vectorizer.fit_transform([user_text] + list(task_texts))
+            return cosine_similarity(matrix[0:1], matrix[1:])[0]
+        except Exception as e:
+            # e.g. empty vocabulary when every text is a stop word
+            logger.error(f"Lexical similarity error: {e}")
+            return np.full(len(task_texts), 0.5)
+
+    def _filter_tasks_for_user(self, user, as_of=None):
         """Filter tasks by location"""
         try:
             # Get tasks user already applied to
-            applied_task_ids = TaskApplication.objects.filter(
-                freelancer=user
-            ).values_list('task_id', flat=True)
+            applied_task_ids = self._applied_task_ids(user, as_of)
 
             # Base query
-            queryset = Task.objects.exclude(
+            queryset = self._open_tasks(as_of).exclude(
                 id__in=applied_task_ids
             ).exclude(
                 client=user
-            ).filter(
-                status='OPEN'
             ).select_related('category', 'client')
 
-            # Location filter
+            # Location filter (preferred location, else the user's city)
             try:
-                from .models import UserPreference
-                prefs = UserPreference.objects.get(user=user)
-                location = prefs.preferred_location or user.city
-            except:
+                location = self._get_profile(user)['location']
+            except Exception:
                 location = user.city
 
             if location:
@@ -474,7 +759,7 @@ class StructuredRecommendationService:
             return queryset
         except Exception as e:
             logger.error(f"Error filtering tasks: {e}", exc_info=True)
-            return Task.objects.filter(status='OPEN')
+            return self._open_tasks(as_of)
 
     def recommend_service_offerings(self, user, limit=5):
         """
@@ -601,8 +886,8 @@ class StructuredRecommendationService:
                 cache_key = f'recommendations_user_{user.id}_limit_{limit}'
                 cache.delete(cache_key)
             
-            skill_cache_key = f'user_skills_{user.id}'
-            cache.delete(skill_cache_key)
+            from .profiles import delete_profile
+            delete_profile(user.id)
             
             logger.info(f"🔄 Manually cleared all caches for {user.username}")
         except Exception as e:
@@ -886,6 +1171,6 @@ class StructuredRecommendationService:
             return []
 
 
-def get_recommendation_service():
+def get_recommendation_service(**kwargs):
     """Factory function to get recommendation service instance"""
-    return StructuredRecommendationService()
\ No newline at end of file
+    return StructuredRecommendationService(**kwargs)
\ No newline at end of file
@@ -1,17 +1,33 @@
 """
 Signals for automatic cache invalidation
 """
+from django.conf import settings
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
 import logging
 
-from .skill_model import UserSkill
-from .services import get_recommendation_service
+from .models import UserPreference
+from .profiles import PROFILE_USER_FIELDS, schedule_profile_rebuild
+from .skill_model import Skill, UserSkill
+from utils.http_cache import track_versions
 
 logger = logging.getLogger('recommendations')
 
 
+def _clear_recommendation_cache(user):
+    """
+    Clear a user's cached recommendations.
+
+    The service is imported here rather than at module level - this module
+    is loaded with the app, and clearing cache keys needs no model, hence
+    the lexical engine.
+    """
+    from .services import get_recommendation_service
+
+    get_recommendation_service(text_engine='lexical').clear_user_cache(user)
+
+
 @receiver(post_save, sender=UserSkill)
 def clear_cache_on_skill_save(sender, instance, created, **kwargs):
     """
@@ -19,8 +35,8 @@ def clear_cache_on_skill_save(sender, instance, created, **kwargs):
     """
     try:
         user = instance.user
-        service = get_recommendation_service()
-        service.clear_user_cache(user)
+        _clear_recommendation_cache(user)
+        schedule_profile_rebuild(user.id)
 
         action = "created" if created else "updated"
         logger.info(f"Cache cleared for {user.username} (skill {action}: {instance.skill.name})")
@@ -35,9 +51,45 @@ def clear_cache_on_skill_delete(sender, instance, **kwargs):
     """
     try:
         user = instance.user
-        service = get_recommendation_service()
-        service.clear_user_cache(user)
+        _clear_recommendation_cache(user)
+        schedule_profile_rebuild(user.id)
 
         logger.info(f"Cache cleared for {user.username} (skill deleted: {instance.skill.name})")
     except Exception as e:
         logger.warning(f"Error clearing cache on skill delete: {e}")
+
+
+@receiver(post_save, sender=UserPreference)
+@receiver(post_delete, sender=UserPreference)
+def rebuild_profile_on_preference_change(sender, instance, **kwargs):
+    """
+    Rebuild the recommendation profile when preferences change
+    """
+    try:
+        schedule_profile_rebuild(instance.user_id)
+    except Exception as e:
+        logger.warning(f"Error scheduling profile rebuild on preference change: {e}")
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def rebuild_profile_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Rebuild the recommendation profile when profile fields of a user change
+
+    Saves limited to other fields (e.g. last_login on every login) are skipped.
+    """
+    if created:
+        return
+    if update_fields is not None and not PROFILE_USER_FIELDS.intersection(update_fields):
+        return
+
+    try:
+        schedule_profile_rebuild(instance.id)
+    except Exception as e:
+        logger.warning(f"Error scheduling profile rebuild on user save: {e}")
+
+
+# HTTP cache versions (utils/http_cache.py): skill names appear in task and
+# profile responses, a user's skills in their public profile
+track_versions(Skill, lambda skill, update_fields: ['skills'])
+track_versions(UserSkill, lambda user_skill, update_fields: ['users', f'user:{user_skill.user_id}'])
@@ -0,0 +1,337 @@
+"""
+Similar tasks
+=============
+
+"More like this" for a task: the open tasks whose stored embeddings
+(recommendations/embeddings.py, kind 'task') are closest by cosine
+similarity.
+
+Scanning every open task's vector per request grows with the market, so
+each process keeps an approximate nearest-neighbour index in memory:
+IVFIndex, an inverted-file index in plain NumPy. Vectors are clustered
+with k-means into about sqrt(n) cells; a search compares the query with
+the cell centroids and only scores the vectors of the SIMILAR_TASKS_NPROBE
+nearest cells.
+
+The index is built from the Embedding table on first use. Afterwards it
+is kept current incrementally, without retraining:
+- tasks that close in this process are removed by tasks/signals.py
+- every SIMILAR_TASKS_SYNC_INTERVAL seconds a search first applies what
+  changed since the last sync in any process: new or re-encoded task
+  vectors are inserted into their nearest cell, tasks that left OPEN or
+  were deleted are removed
+- once the index has doubled since it was trained the cells are
+  retrained, so they stay balanced
+
+Tasks without a stored vector aren't indexed; `python manage.py
+backfill_embeddings` encodes them, and similar_tasks() encodes a missing
+source task on demand when a model is available.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger('recommendations')
+
+# k-means iterations when (re)training the cells
+KMEANS_ITERATIONS = 8
+
+# Below this many vectors one cell (an exact scan) is as fast
+MIN_TRAINED_SIZE = 256
+
+
+def _normalize(matrix):
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype('float32')
+
+
+class IVFIndex:
+    """
+    Inverted-file index of unit vectors for inner-product (cosine) search
+
+    index = IVFIndex(ids, matrix)
+    index.add(task_id, vector); index.remove(task_id)
+    index.search(vector, k) -> [(task_id, similarity)]
+    """
+
+    def __init__(self, ids, matrix, seed=0):
+        import numpy as np
+
+        self.dimensions = matrix.shape[1] if len(ids) else None
+        self.trained_size = len(ids)
+        self._rng = np.random.default_rng(seed)
+        self._where = {}
+        self._train(list(ids), _normalize(matrix) if len(ids) else matrix)
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, task_id):
+        return task_id in self._where
+
+    def ids(self):
+        return list(self._where)
+
+    def _train(self, ids, matrix):
+        import numpy as np
+
+        n = len(ids)
+        cells = 1 if n < MIN_TRAINED_SIZE else int(np.sqrt(n))
+        if n:
+            centroids = matrix[self._rng.choice(n, size=cells, replace=False)]
+            for _ in range(KMEANS_ITERATIONS if cells > 1 else 0):
+                assignment = np.argmax(matrix @ centroids.T, axis=1)
+                for cell in range(cells):
+                    members = matrix[assignment == cell]
+                    if len(members):
+                        centroids[cell] = members.mean(axis=0)
+                centroids = _normalize(centroids)
+            assignment = np.argmax(matrix @ centroids.T, axis=1)
+        else:
+            centroids = np.zeros((0, 0), dtype='float32')
+            assignment = np.zeros(0, dtype=int)
+
+        self.centroids = centroids
+        self._ids = []
+        self._vectors = []
+        self._where = {}
+        id_array = np.asarray(ids, dtype='int64')
+        for cell in range(len(centroids)):
+            mask = assignment == cell
+            self._ids.append(id_array[mask])
+            self._vectors.append(matrix[mask])
+            for task_id in id_array[mask].tolist():
+                self._where[task_id] = cell
+
+    def retrain(self):
+        """Recluster everything in the index"""
+        import numpy as np
+
+        ids = [task_id for cell_ids in self._ids for task_id in cell_ids.tolist()]
+        matrix = np.vstack(self._vectors) if ids else np.zeros((0, self.dimensions or 0), dtype='float32')
+        self.trained_size = len(ids)
+        self._train(ids, matrix)
+
+    def add(self, task_id, vector):
+        """Insert or replace one vector, in its nearest cell"""
+        import numpy as np
+
+        vector = _normalize(np.asarray(vector, dtype='float32'))
+        if self.dimensions is None or not len(self.centroids):
+            # First vector of an empty index
+            self.dimensions = vector.shape[0]
+            self.trained_size = 1
+            self._train([task_id], vector[None, :])
+            return
+        if vector.shape[0] != self.dimensions:
+            raise ValueError(f'Expected {self.dimensions} dimensions, got {vector.shape[0]}')
+
+        self.remove(task_id)
+        cell = int(np.argmax(self.centroids @ vector))
+        self._ids[cell] = np.append(self._ids[cell], task_id)
+        self._vectors[cell] = np.vstack([self._vectors[cell], vector[None, :]])
+        self._where[task_id] = cell
+
+    def remove(self, task_id):
+        cell = self._where.pop(task_id, None)
+        if cell is None:
+            return False
+        keep = self._ids[cell] != task_id
+        self._ids[cell] = self._ids[cell][keep]
+        self._vectors[cell] = self._vectors[cell][keep]
+        return True
+
+    def vector(self, task_id):
+        cell = self._where.get(task_id)
+        if cell is None:
+            return None
+        return self._vectors[cell][self._ids[cell] == task_id][0]
+
+    def search(self, vector, k, nprobe=8, exclude=()):
+        """[(task_id, similarity)] of the k nearest vectors, most similar first"""
+        import numpy as np
+
+        if not self._where or k <= 0:
+            return []
+        vector = _normalize(np.asarray(vector, dtype='float32'))
+        probe = np.argsort(-(self.centroids @ vector))[:nprobe]
+        ids = np.concatenate([self._ids[cell] for cell in probe])
+        if not len(ids):
+            return []
+        scores = np.vstack([self._vectors[cell] for cell in probe]) @ vector
+
+        if exclude:
+            keep = ~np.isin(ids, list(exclude))
+            ids, scores = ids[keep], scores[keep]
+        if len(ids) > k:
+            top = np.argpartition(-scores, k)[:k]
+            ids, scores = ids[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+class SimilarTaskIndex:
+    """The process's IVFIndex of open tasks, built and synced on demand"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.index = None
+        self.model_name = None
+        self._synced_at = None
+        self._checked_at = 0.0
+
+    def _open_task_vectors(self, task_ids=None, changed_since=None):
+        """[(task_id, vector)] of open tasks with a vector of the current model"""
+        from tasks.models import Task
+
+        from . import embeddings
+        from .models import Embedding
+
+        rows = Embedding.objects.filter(
+            kind='task', model_name=self.model_name,
+            object_id__in=Task.objects.filter(status='OPEN').values('id'),
+        )
+        if task_ids is not None:
+            rows = rows.filter(object_id__in=list(task_ids))
+        if changed_since is not None:
+            rows = rows.filter(updated_at__gte=changed_since)
+        return [
+            (object_id, embeddings.bytes_to_vector(vector))
+            for object_id, vector in rows.values_list('object_id', 'vector')
+        ]
+
+    def build(self):
+        import numpy as np
+
+        from . import embeddings
+
+        self.model_name = embeddings.get_model_name()
+        synced_at = timezone.now()
+        rows = self._open_task_vectors()
+        dimensions = {len(vector) for _, vector in rows}
+        if len(dimensions) > 1:
+            # Mixed rows from an older model config; keep the common size
+            common = max(dimensions, key=lambda size: sum(len(v) == size for _, v in rows))
+            rows = [(task_id, vector) for task_id, vector in rows if len(vector) == common]
+
+        matrix = np.vstack([vector for _, vector in rows]) if rows else np.zeros((0, 0), dtype='float32')
+        self.index = IVFIndex([task_id for task_id, _ in rows], matrix)
+        self._synced_at = synced_at
+        self._checked_at = time.monotonic()
+        logger.info(f"Built similar-task index: {len(self.index)} tasks, {len(self.index.centroids)} cells")
+
+    def sync(self):
+        """Apply vectors and task status changes since the last sync, drop deleted tasks"""
+        from tasks.models import Task
+
+        since, synced_at = self._synced_at, timezone.now()
+
+        # Deleted tasks never show up as changed rows, so compare the index
+        # with the open tasks instead (one id-only query)
+        open_ids = set(Task.objects.filter(status='OPEN').values_list('id', flat=True))
+        for task_id in self.index.ids():
+            if task_id not in open_ids:
+                self.index.remove(task_id)
+
+        # Newly (re)encoded vectors, and reopened tasks whose vector is older
+        reopened = [
+            task_id for task_id in Task.objects.filter(
+                updated_at__gte=since, status='OPEN'
+            ).values_list('id', flat=True)
+            if task_id not in self.index
+        ]
+        rows = self._open_task_vectors(changed_since=since)
+        if reopened:
+            rows += self._open_task_vectors(task_ids=reopened)
+        for task_id, vector in rows:
+            try:
+                self.index.add(task_id, vector)
+            except ValueError as e:
+                logger.warning(f"Skipping vector of task {task_id}: {e}")
+
+        if len(self.index) >= max(2 * self.index.trained_size, MIN_TRAINED_SIZE):
+            self.index.retrain()
+        self._synced_at = synced_at
+
+    def ensure_current(self):
+        from . import embeddings
+
+        with self._lock:
+            if self.index is None or self.model_name != embeddings.get_model_name():
+                self.build()
+                return
+            interval = getattr(settings, 'SIMILAR_TASKS_SYNC_INTERVAL', 30)
+            if time.monotonic() - self._checked_at >= interval:
+                self._checked_at = time.monotonic()
+                self.sync()
+
+    def remove(self, task_id):
+        with self._lock:
+            if self.index is not None:
+                self.index.remove(task_id)
+
+    def search(self, vector, k, exclude=()):
+        self.ensure_current()
+        with self._lock:
+            return self.index.search(
+                vector, k, nprobe=getattr(settings, 'SIMILAR_TASKS_NPROBE', 8), exclude=exclude
+            )
+
+    def vector(self, task_id):
+        self.ensure_current()
+        with self._lock:
+            return self.index.vector(task_id)
+
+
+similar_task_index = SimilarTaskIndex()
+
+
+def task_vector(task):
+    """
+    The task's embedding: from the index, the Embedding table, or - when a
+    model is configured - encoded now and stored. None without a model.
+    """
+    from . import embeddings
+    from .services import get_recommendation_service
+
+    vector = similar_task_index.vector(task.id)
+    if vector is not None:
+        return vector
+
+    service = get_recommendation_service(text_engine='lexical')
+    text = service._build_task_text(task)
+    vector = embeddings.load_vectors('task', {task.id: text}).get(task.id)
+    if vector is not None:
+        return vector
+
+    if getattr(settings, 'RECOMMENDATION_TEXT_ENGINE', 'semantic') == 'lexical':
+        # No model in this deployment
+        return None
+    encoded = service._encode([text])
+    if encoded is None:
+        return None
+    embeddings.store_vectors('task', [
+        (task.id, embeddings.text_hash(text), embeddings.vector_to_bytes(encoded[0]))
+    ])
+    return encoded[0]
+
+
+def similar_tasks(task, k=6):
+    """
+    [(task_id, similarity)] of open tasks most like task, most similar
+    first; empty when task has no embedding
+    """
+    try:
+        vector = task_vector(task)
+    except Exception as e:
+        logger.warning(f"No vector for similar tasks of task {task.id}: {e}")
+        return []
+    if vector is None:
+        return []
+    return similar_task_index.search(vector, k, exclude={task.id})
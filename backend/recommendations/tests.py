@@ -1,3 +1,73 @@
-from django.test import TestCase
+from threading import Event, Thread
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from utils.startup import measure_startup
+
+from .profiles import schedule_profile_rebuild
+
+
+class StartupBudgetTests(SimpleTestCase):
+    """django.setup() must stay cheap - ML libraries load on first use"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.startup = measure_startup()
+
+    def test_no_heavy_modules_imported_at_startup(self):
+        self.assertEqual(self.startup['heavy_modules'], [])
+
+    def test_setup_time_within_budget(self):
+        self.assertLessEqual(self.startup['seconds'], settings.STARTUP_TIME_BUDGET_SECONDS)
+
+    def test_peak_rss_within_budget(self):
+        if self.startup['rss_mb'] is None:
+            self.skipTest('RSS not measurable on this platform')
+        self.assertLessEqual(self.startup['rss_mb'], settings.STARTUP_RSS_BUDGET_MB)
+
+
+class ProfileRebuildSchedulingTests(TransactionTestCase):
+    """A profile is rebuilt once per committed transaction that changed it"""
+
+    USER_ID = 7
+
+    def schedule_in_transaction(self, scheduled, release):
+        try:
+            with transaction.atomic():
+                schedule_profile_rebuild(self.USER_ID)
+                scheduled.set()
+                release.wait(5)
+        finally:
+            connections.close_all()
+
+    def test_repeated_changes_rebuild_once(self):
+        with mock.patch('recommendations.profiles.rebuild_profile') as rebuild:
+            with transaction.atomic():
+                for _ in range(3):
+                    schedule_profile_rebuild(self.USER_ID)
+        rebuild.assert_called_once_with(self.USER_ID)
+
+    def test_interleaved_transactions_each_rebuild(self):
+        # A's rebuild may read the database before B's changes commit
+        a_scheduled, a_release = Event(), Event()
+        b_scheduled, b_release = Event(), Event()
+        a = Thread(target=self.schedule_in_transaction, args=(a_scheduled, a_release))
+        b = Thread(target=self.schedule_in_transaction, args=(b_scheduled, b_release))
+
+        with mock.patch('recommendations.profiles.rebuild_profile') as rebuild:
+            a.start()
+            self.assertTrue(a_scheduled.wait(5))
+            b.start()
+            self.assertTrue(b_scheduled.wait(5))
+
+            a_release.set()
+            a.join(5)
+            self.assertEqual(rebuild.call_count, 1)
+
+            b_release.set()
+            b.join(5)
+            self.assertEqual(rebuild.call_count, 2)
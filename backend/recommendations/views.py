@@ -4,8 +4,9 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
-from tasks.models import Task, Category
-from tasks.serializers import PublicUserSerializer, CategorySerializer
+from tasks.models import Task
+from tasks.categories import active_categories_payload
+from tasks.serializers import PublicUserSerializer
 from accounts.models import User
 from .models import UserPreference
 from .skill_model import Skill, UserSkill
@@ -14,6 +15,7 @@ from .serializers import (
     SkillSerializer, UserSkillSerializer, FreelancerDiscoverySerializer
 )
 from .services import get_recommendation_service
+from utils.http_cache import conditional_view
 from django.core.cache import cache
 from django.db import transaction
 import time
@@ -414,6 +416,7 @@ def onboarding_status(request):
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@conditional_view(['skills'], cache_anonymous=True)
 def get_skills(request):
     """
     Get all available skills, optionally filtered by category
@@ -443,13 +446,12 @@ def get_skills(request):
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@conditional_view(['categories', 'tasks'])
 def get_categories(request):
     """
     Get all active categories for onboarding
     """
-    categories = Category.objects.filter(is_active=True).order_by('order', 'name')
-    serializer = CategorySerializer(categories, many=True)
-    return Response(serializer.data)
+    return Response(active_categories_payload())
 
 
 @extend_schema(
@@ -16,7 +16,11 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ['title', 'client', 'category', 'status', 'budget', 'created_at']
     list_filter = ['status', 'task_type', 'category', 'is_remote']
     search_fields = ['title', 'description', 'client__username']
-    readonly_fields = ['views_count', 'applications_count', 'created_at', 'updated_at']
+    readonly_fields = [
+        'views_count', 'applications_count', 'pending_applications_count',
+        'accepted_applications_count', 'rejected_applications_count',
+        'withdrawn_applications_count', 'created_at', 'updated_at'
+    ]
     ordering = ['-created_at']
     
     fieldsets = (
@@ -33,7 +37,11 @@ class TaskAdmin(admin.ModelAdmin):
             'fields': ('status', 'assigned_to')
         }),
         ('Metrics', {
-            'fields': ('views_count', 'applications_count', 'created_at', 'updated_at')
+            'fields': (
+                'views_count', 'applications_count', 'pending_applications_count',
+                'accepted_applications_count', 'rejected_applications_count',
+                'withdrawn_applications_count', 'created_at', 'updated_at'
+            )
         }),
     )
 
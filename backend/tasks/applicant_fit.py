@@ -0,0 +1,184 @@
+"""
+Applicant ranking
+=================
+
+`?ordering=fit` on a task's applications ranks the applicants by how well
+they fit the task instead of by date. Each applicant gets a 0-1 score,
+a weighted sum (FIT_WEIGHTS) of:
+
+- skills: share of the task's required skills in the freelancer's skills
+  (0.5 when the task lists none)
+- rating: average review rating out of 5, shrunk towards RATING_PRIOR by
+  RATING_PRIOR_WEIGHT reviews so one 5-star review doesn't top the list
+- completion: completed share of the freelancer's finished assigned tasks
+  (Laplace-smoothed), times experience completed / (completed + 5)
+- price: 1 up to the budget, falling to 0 at twice the budget
+- proposal: TF-IDF cosine similarity of proposal + cover letter with the
+  task's title and description
+
+All applicants are scored together: four queries (applications, the
+task's skills, skill matches, assigned task counts) and numpy arrays,
+not a query per applicant.
+
+The ranking is cached per task for APPLICANT_RANKING_CACHE_TIMEOUT
+seconds. tasks/signals.py drops it when an application is created,
+changed or deleted, and an edit of the task (budget, skills, text) makes
+the cached one stale through Task.updated_at. Ratings and completion
+stats of the applicants can be that many seconds old.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Task, TaskApplication
+
+logger = logging.getLogger('tasks')
+
+FIT_CACHE_PREFIX = 'applicant_fit:v1'
+
+FIT_WEIGHTS = {
+    'skills': 0.35,
+    'rating': 0.2,
+    'completion': 0.15,
+    'price': 0.15,
+    'proposal': 0.15,
+}
+
+RATING_PRIOR = 3.5
+RATING_PRIOR_WEIGHT = 3
+
+# Completed tasks at which experience counts half
+EXPERIENCE_HALF = 5
+
+
+def fit_cache_key(task_id):
+    return f'{FIT_CACHE_PREFIX}:{task_id}'
+
+
+def _stamp(task):
+    return task.updated_at.isoformat() if task.updated_at else None
+
+
+def _proposal_similarity(task, proposals):
+    """TF-IDF cosine similarity of each proposal with the task text"""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    try:
+        vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        matrix = vectorizer.fit_transform([f'{task.title} {task.description}', *proposals])
+        return cosine_similarity(matrix[0:1], matrix[1:])[0]
+    except ValueError:
+        # Empty vocabulary: every text is stop words
+        return np.zeros(len(proposals))
+
+
+def score_applications(task):
+    """
+    [(application_id, score, components)] for all of the task's
+    applications, best fit first (newest first among equal scores)
+    """
+    import numpy as np
+
+    from recommendations.skill_model import UserSkill
+
+    applications = list(
+        TaskApplication.objects.filter(task=task).order_by('-created_at').values_list(
+            'id', 'freelancer_id', 'offered_price', 'proposal', 'cover_letter',
+            'freelancer__rating_sum', 'freelancer__total_reviews',
+        )
+    )
+    if not applications:
+        return []
+
+    ids, freelancer_ids, prices, proposals, cover_letters, rating_sums, review_counts = zip(*applications)
+    position = {freelancer_id: i for i, freelancer_id in enumerate(freelancer_ids)}
+    n = len(applications)
+
+    # Skills
+    task_skill_ids = set(task.required_skills.values_list('id', flat=True))
+    if task_skill_ids:
+        matches = np.zeros(n)
+        for freelancer_id, count in UserSkill.objects.filter(
+            user_id__in=freelancer_ids, skill_id__in=task_skill_ids
+        ).values('user_id').annotate(count=Count('skill_id', distinct=True)).values_list('user_id', 'count'):
+            matches[position[freelancer_id]] = count
+        skills = matches / len(task_skill_ids)
+    else:
+        skills = np.full(n, 0.5)
+
+    # Rating
+    rating_sums = np.array(rating_sums, dtype=float)
+    review_counts = np.array(review_counts, dtype=float)
+    rating = np.clip(
+        (rating_sums + RATING_PRIOR * RATING_PRIOR_WEIGHT) / (review_counts + RATING_PRIOR_WEIGHT) / 5, 0, 1
+    )
+
+    # Completion
+    completed, finished = np.zeros(n), np.zeros(n)
+    for freelancer_id, done, ended in Task.objects.filter(
+        assigned_to_id__in=freelancer_ids, status__in=['COMPLETED', 'CANCELLED']
+    ).values('assigned_to_id').annotate(
+        done=Count('id', filter=Q(status='COMPLETED')), ended=Count('id')
+    ).values_list('assigned_to_id', 'done', 'ended'):
+        completed[position[freelancer_id]] = done
+        finished[position[freelancer_id]] = ended
+    completion = (completed + 1) / (finished + 2) * (completed / (completed + EXPERIENCE_HALF))
+
+    # Price
+    prices = np.array([float(price) for price in prices])
+    budget = float(task.budget or 0)
+    price = np.clip(2 - prices / budget, 0, 1) if budget > 0 else np.full(n, 0.5)
+
+    # Proposal
+    proposal = _proposal_similarity(
+        task, [f'{text} {cover or ""}' for text, cover in zip(proposals, cover_letters)]
+    )
+
+    components = {
+        'skills': skills, 'rating': rating, 'completion': completion,
+        'price': price, 'proposal': proposal,
+    }
+    scores = sum(FIT_WEIGHTS[name] * values for name, values in components.items())
+
+    # Stable: ties keep newest first
+    order = np.argsort(-scores, kind='stable')
+    return [
+        (
+            ids[i], round(float(scores[i]), 4),
+            {name: round(float(values[i]), 3) for name, values in components.items()},
+        )
+        for i in order
+    ]
+
+
+def get_applicant_ranking(task):
+    """score_applications(task), from the cache when current"""
+    key = fit_cache_key(task.id)
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Error reading applicant ranking cache: {e}")
+        cached = None
+    if cached is not None and cached['stamp'] == _stamp(task):
+        return cached['ranking']
+
+    ranking = score_applications(task)
+    try:
+        cache.set(
+            key, {'stamp': _stamp(task), 'ranking': ranking},
+            getattr(settings, 'APPLICANT_RANKING_CACHE_TIMEOUT', 600)
+        )
+    except Exception as e:
+        logger.warning(f"Error writing applicant ranking cache: {e}")
+    return ranking
+
+
+def invalidate_applicant_ranking(task_id):
+    try:
+        cache.delete(fit_cache_key(task_id))
+    except Exception as e:
+        logger.warning(f"Error invalidating applicant ranking of task {task_id}: {e}")
@@ -0,0 +1,135 @@
+"""
+Task application counters
+=========================
+
+Task.applications_count and the per-status counts
+(pending_/accepted_/rejected_/withdrawn_applications_count) are changed
+with UPDATE ... SET x = x + n in the transaction that creates, deletes
+or moves the applications, so concurrent applies never lose a count and
+nothing recounts the applications. Creates, deletes and save()s are
+counted by tasks/signals.py.
+
+Status changes go through set_application_status(): it locks the
+application rows first (SELECT ... FOR UPDATE), so the statuses it
+counts are the ones it replaces even when two requests race.
+
+`python manage.py repair_application_counts` recomputes the counters
+from the applications.
+"""
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from utils.http_cache import bump_versions
+
+from .models import Task, TaskApplication
+
+STATUS_COUNT_FIELDS = {
+    'PENDING': 'pending_applications_count',
+    'ACCEPTED': 'accepted_applications_count',
+    'REJECTED': 'rejected_applications_count',
+    'WITHDRAWN': 'withdrawn_applications_count',
+}
+
+
+def apply_application_deltas(task_id, deltas, freelancer_ids=()):
+    """deltas: {field: n} applied to one task with F() expressions"""
+    updates = {
+        field: F(field) + delta
+        for field, delta in deltas.items()
+        if delta
+    }
+    if updates:
+        Task.objects.filter(pk=task_id).update(**updates)
+    # update() skips signals - lists, the task and the applicants' own
+    # views must still revalidate
+    bump_versions([
+        'tasks', f'task:{task_id}',
+        *(f'viewer:{freelancer_id}' for freelancer_id in freelancer_ids)
+    ])
+
+
+def record_application_created(application):
+    """Count a new application (post_save, in the inserting transaction)"""
+    apply_application_deltas(application.task_id, {
+        'applications_count': 1,
+        STATUS_COUNT_FIELDS[application.status]: 1,
+    })
+
+
+def record_application_deleted(application):
+    """Uncount a deleted application"""
+    apply_application_deltas(application.task_id, {
+        'applications_count': -1,
+        STATUS_COUNT_FIELDS[application.status]: -1,
+    })
+
+
+def set_application_status(task_id, applications, status):
+    """
+    Move the given applications of one task to status
+
+    applications: TaskApplication queryset (filtered to task_id)
+    Returns the number of applications that changed.
+    """
+    with transaction.atomic():
+        rows = list(
+            applications.filter(task_id=task_id)
+            .exclude(status=status)
+            .select_for_update()
+            .values_list('id', 'status', 'freelancer_id')
+        )
+        if not rows:
+            return 0
+
+        TaskApplication.objects.filter(pk__in=[row[0] for row in rows]).update(
+            status=status, updated_at=timezone.now()
+        )
+
+        deltas = {STATUS_COUNT_FIELDS[status]: len(rows)}
+        for _, old_status, _ in rows:
+            field = STATUS_COUNT_FIELDS[old_status]
+            deltas[field] = deltas.get(field, 0) - 1
+        apply_application_deltas(task_id, deltas, freelancer_ids={row[2] for row in rows})
+    return len(rows)
+
+
+def repair_application_counts(task_ids=None):
+    """
+    Recompute the application counters from the applications
+
+    Returns the number of tasks whose stored counts were wrong.
+    """
+    per_task = TaskApplication.objects.filter(
+        task=OuterRef('pk')
+    ).order_by().values('task')
+
+    def count(condition=None):
+        counted = per_task.annotate(
+            total=Count('id', filter=condition) if condition is not None else Count('id')
+        ).values('total')
+        return Coalesce(Subquery(counted), Value(0), output_field=IntegerField())
+
+    actual = {'applications_count': count()}
+    for status, field in STATUS_COUNT_FIELDS.items():
+        actual[field] = count(Q(status=status))
+
+    tasks = Task.objects.all()
+    if task_ids is not None:
+        tasks = tasks.filter(pk__in=list(task_ids))
+
+    mismatch = Q()
+    for field in actual:
+        mismatch |= ~Q(**{field: F(f'actual_{field}')})
+    drifted_ids = list(
+        tasks.annotate(**{f'actual_{field}': value for field, value in actual.items()})
+        .filter(mismatch)
+        .values_list('pk', flat=True)
+    )
+    if not drifted_ids:
+        return 0
+
+    Task.objects.filter(pk__in=drifted_ids).update(**actual)
+    bump_versions(['tasks', *(f'task:{task_id}' for task_id in drifted_ids)])
+    return len(drifted_ids)
@@ -0,0 +1,274 @@
+"""
+Bulk task creation
+==================
+
+BulkTaskImporter validates rows with the TaskCreateUpdateSerializer rules
+and inserts valid ones in chunks: one bulk_create for the tasks and one
+for their task/skill links per chunk. Categories and skills are looked up
+once per import instead of once per row.
+
+Rows go through the same duplicate check as single creates (the client's
+open tasks, including chunks of this import already inserted), and each
+row is also compared with the rows accepted before it in the same import
+through an LSHIndex of their signatures. allow_duplicate=True skips both.
+
+bulk_create skips save() and model signals, so each chunk does their work
+itself: MinHash signatures, search vectors, the statistics counters and
+HTTP cache versions.
+
+Rows are consumed one at a time (iter_csv_rows / iter_ndjson_rows read an
+uploaded file line by line), so an import never holds the whole file.
+"""
+import csv
+import io
+import json
+import logging
+
+from django.db import transaction
+from rest_framework import serializers
+
+from utils.http_cache import bump_versions
+
+from .duplicates import LSHIndex, get_threshold, signature
+from .models import Category, Task
+from .search import update_search_vectors
+from .serializers import TaskCreateUpdateSerializer
+from .statistics import adjust_counters, task_counter_deltas
+
+logger = logging.getLogger('tasks')
+
+DEFAULT_CHUNK_SIZE = 200
+
+# Errors listed in the response; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Separators accepted inside a CSV required_skills cell ("3;7;12")
+SKILL_SEPARATORS = (';', '|', ',')
+
+
+class BulkTaskRowSerializer(TaskCreateUpdateSerializer):
+    """
+    TaskCreateUpdateSerializer rules without per-row queries
+
+    Category and skill IDs are checked against sets loaded once per import
+    (context: category_ids, skill_ids). Images are not part of bulk rows;
+    duplicates are checked for context['client_id'] unless the import sets
+    context['allow_duplicate'].
+    """
+    category = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta(TaskCreateUpdateSerializer.Meta):
+        fields = [
+            field for field in TaskCreateUpdateSerializer.Meta.fields
+            if field not in ('image', 'images', 'allow_duplicate')
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Plain IDs instead of the parent's per-ID Skill lookups
+        self.fields['required_skills'] = serializers.ListField(
+            child=serializers.IntegerField(), required=False
+        )
+
+    def validate_category(self, value):
+        if value is not None and value not in self.context['category_ids']:
+            raise serializers.ValidationError(f'Invalid category "{value}".')
+        return value
+
+    def validate_required_skills(self, value):
+        unknown = sorted(set(value) - self.context['skill_ids'])
+        if unknown:
+            raise serializers.ValidationError(f'Invalid skill IDs: {unknown}.')
+        return sorted(set(value))
+
+    def check_duplicates(self, attrs):
+        if not self.context.get('allow_duplicate'):
+            super().check_duplicates(attrs)
+
+
+class BulkTaskImporter:
+    """
+    Validate and insert task rows for one client
+
+    importer = BulkTaskImporter(client)
+    for row in rows:
+        importer.add(row)
+    summary = importer.finish()
+    """
+
+    def __init__(self, client, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, max_rows=None,
+                 allow_duplicate=False):
+        from recommendations.models import Skill
+
+        self.client = client
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.max_rows = max_rows
+        self.allow_duplicate = allow_duplicate
+
+        self.context = {
+            'category_ids': set(Category.objects.values_list('id', flat=True)),
+            'skill_ids': set(Skill.objects.filter(is_active=True).values_list('id', flat=True)),
+            'client_id': client.id,
+            'allow_duplicate': allow_duplicate,
+        }
+        # Signatures of the rows accepted so far, keyed by row number
+        self._accepted = LSHIndex()
+        self._threshold = get_threshold()
+        self.rows_seen = 0
+        self.truncated = False
+        self.created_ids = []
+        self.valid_count = 0
+        self.errors = []
+        self.error_count = 0
+        self._pending = []
+
+    def add(self, data, row_number=None):
+        """Validate one row; valid rows are inserted when the chunk fills"""
+        if self.truncated:
+            return
+        if self.max_rows is not None and self.rows_seen >= self.max_rows:
+            # Callers stop reading once truncated is set
+            self.truncated = True
+            self._error(row_number, {'non_field_errors': [
+                f'Row limit of {self.max_rows} reached; this and later rows were not imported.'
+            ]})
+            return
+
+        self.rows_seen += 1
+        row_number = row_number or self.rows_seen
+
+        if not isinstance(data, dict):
+            self._error(row_number, {'non_field_errors': ['Each row must be an object.']})
+            return
+
+        serializer = BulkTaskRowSerializer(data=data, context=self.context)
+        if not serializer.is_valid():
+            self._error(row_number, serializer.errors)
+            return
+
+        data = serializer.validated_data
+        sig = signature(data.get('title'), data.get('description'))
+        if not self.allow_duplicate:
+            earlier = self._accepted.query(sig, self._threshold)
+            if earlier:
+                self._error(row_number, {
+                    'duplicate_of_row': [key for key, _ in earlier],
+                    'non_field_errors': [
+                        f'This looks like row {earlier[0][0]} of this import. '
+                        'Send allow_duplicate=true to import it anyway.'
+                    ],
+                })
+                return
+        self._accepted.add(row_number, sig)
+
+        self.valid_count += 1
+        if not self.dry_run:
+            self._pending.append((data, sig))
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+
+    def reject(self, row_number, message):
+        """Record a row that could not be parsed"""
+        self.rows_seen += 1
+        self._error(row_number, {'non_field_errors': [message]})
+
+    def finish(self):
+        """Insert the last chunk and return the summary"""
+        if self._pending:
+            self._flush()
+        return {
+            'rows': self.rows_seen,
+            'truncated': self.truncated,
+            'valid': self.valid_count,
+            'created': len(self.created_ids),
+            'task_ids': self.created_ids,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'dry_run': self.dry_run,
+        }
+
+    def _error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def _flush(self):
+        rows, self._pending = self._pending, []
+        skill_lists = []
+        tasks = []
+        for data, sig in rows:
+            data = dict(data)
+            skill_lists.append(data.pop('required_skills', []))
+            category_id = data.pop('category', None)
+            tasks.append(Task(
+                client=self.client, category_id=category_id, minhash=sig.tobytes(), **data
+            ))
+
+        links_model = Task.required_skills.through
+        with transaction.atomic():
+            created = Task.objects.bulk_create(tasks)
+            links_model.objects.bulk_create([
+                links_model(task_id=task.id, skill_id=skill_id)
+                for task, skill_ids in zip(created, skill_lists)
+                for skill_id in skill_ids
+            ])
+
+            # Work the save signals would have done
+            task_ids = [task.id for task in created]
+            update_search_vectors(task_ids)
+            deltas = {}
+            for task in created:
+                for name, delta in task_counter_deltas(task.status, task.budget).items():
+                    deltas[name] = deltas.get(name, 0) + delta
+            adjust_counters(deltas)
+            bump_versions(['tasks', f'user:{self.client.id}'])
+
+        self.created_ids.extend(task_ids)
+        logger.info(f"Bulk created {len(task_ids)} tasks for {self.client.username}")
+
+
+# ==============================================================================
+# FILE READERS
+# ==============================================================================
+
+def _text_lines(uploaded_file):
+    """Decoded lines of an upload, read incrementally"""
+    uploaded_file.seek(0)
+    return io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+
+
+def iter_csv_rows(uploaded_file):
+    """
+    (row_number, data) for each CSV row; header names are task fields.
+    Empty cells are left out, required_skills is split on ; | or ,
+    """
+    reader = csv.DictReader(_text_lines(uploaded_file))
+    for data in reader:
+        row = {
+            key.strip(): value.strip()
+            for key, value in data.items()
+            if key and value is not None and value.strip() != ''
+        }
+        if 'required_skills' in row:
+            cell = row['required_skills']
+            separator = next((sep for sep in SKILL_SEPARATORS if sep in cell), None)
+            row['required_skills'] = [
+                part.strip() for part in (cell.split(separator) if separator else [cell])
+                if part.strip()
+            ]
+        # Line of the row in the file (header is line 1)
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(uploaded_file):
+    """(line_number, data) for each non-empty NDJSON line"""
+    for line_number, line in enumerate(_text_lines(uploaded_file), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            # The caller reports the row and moves on
+            yield line_number, ValueError(f'Invalid JSON: {e}')
@@ -0,0 +1,78 @@
+"""
+Category payloads and open-task counts
+======================================
+
+Open-task counts for all categories come from one grouped query, cached
+under the 'tasks' version of utils/http_cache.py - any task write moves
+the version, so the counts are never stale.
+
+The active category list is cached as one blob under the 'categories'
+version and merged with the counts on read, so listing categories costs
+no queries while nothing changes.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from utils.http_cache import get_versions
+
+logger = logging.getLogger('tasks')
+
+CATEGORY_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _cached(key, compute):
+    try:
+        value = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Error reading category cache: {e}")
+        value = None
+    if value is None:
+        value = compute()
+        try:
+            cache.set(key, value, CATEGORY_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Error writing category cache: {e}")
+    return value
+
+
+def open_task_counts():
+    """{category_id: number of OPEN tasks}"""
+    from .models import Task
+
+    version = get_versions(['tasks'])['tasks']
+    return _cached(
+        f'category_open_counts:{version}',
+        lambda: dict(
+            Task.objects.filter(status='OPEN', category__isnull=False)
+            .values_list('category')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+    )
+
+
+def active_categories_payload():
+    """Serialized active categories with their open-task counts"""
+    from .models import Category
+    from .serializers import CategorySerializer
+
+    version = get_versions(['categories'])['categories']
+    categories = _cached(
+        f'category_payload:{version}',
+        lambda: [
+            dict(row) for row in CategorySerializer(
+                Category.objects.filter(is_active=True).order_by('order', 'name'),
+                many=True,
+                # Counts are merged in below, from their own cache entry
+                context={'open_task_counts': {}}
+            ).data
+        ]
+    )
+
+    counts = open_task_counts()
+    return [
+        {**category, 'tasks_count': counts.get(category['id'], 0)}
+        for category in categories
+    ]
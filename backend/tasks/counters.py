@@ -0,0 +1,219 @@
+"""
+Buffered counters
+=================
+
+Hot counters (task views) are incremented in Redis - or, while Redis is
+down, in an in-process sharded counter - and periodically applied to the
+database as `UPDATE ... SET field = field + n`, instead of a row write per
+hit.
+
+Flushing:
+- every process that records hits starts a background flusher thread
+  (TASK_VIEW_FLUSH_INTERVAL seconds; 0 disables it)
+- `python manage.py flush_task_views` flushes on demand (cron, deploys)
+
+Redis flushes RENAME the pending hash before reading it, so concurrent
+flushers never apply the same hits twice. Counts are best effort: hits in
+flight when a process dies can be lost, never double counted.
+"""
+import atexit
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from utils.redis_client import get_redis, mark_redis_down
+
+logger = logging.getLogger('tasks')
+
+UPDATE_CHUNK_SIZE = 500
+
+
+class BufferedCounter:
+    """Per-object counter buffered in Redis or in process"""
+
+    SHARDS = 16
+
+    def __init__(self, name, apply, interval_setting):
+        """
+        name: Redis hash key
+        apply: callable({object_id: amount}) writing the counts to the database
+        interval_setting: settings name holding the flush interval (seconds)
+        """
+        self.name = name
+        self.apply = apply
+        self.interval_setting = interval_setting
+        self._shards = [(threading.Lock(), Counter()) for _ in range(self.SHARDS)]
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def incr(self, object_id, amount=1):
+        self._ensure_flusher()
+
+        client = get_redis()
+        if client is not None:
+            try:
+                client.hincrby(self.name, object_id, amount)
+                return
+            except Exception as e:
+                logger.warning(f"Redis counter error, buffering in process: {e}")
+                mark_redis_down()
+
+        lock, counts = self._shards[object_id % self.SHARDS]
+        with lock:
+            counts[object_id] += amount
+
+    def pending(self, object_id):
+        """Hits recorded but not flushed yet (this process + Redis)"""
+        lock, counts = self._shards[object_id % self.SHARDS]
+        with lock:
+            total = counts.get(object_id, 0)
+
+        client = get_redis()
+        if client is not None:
+            try:
+                total += int(client.hget(self.name, object_id) or 0)
+            except Exception as e:
+                logger.warning(f"Redis counter read error: {e}")
+                mark_redis_down()
+        return total
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Apply buffered counts to the database; returns objects updated"""
+        counts = self._take_local()
+        redis_counts, flushing_key = self._take_redis()
+        for object_id, amount in redis_counts.items():
+            counts[object_id] += amount
+
+        if not counts:
+            return 0
+
+        try:
+            self.apply(dict(counts))
+        except Exception:
+            # Put the hits back for the next flush
+            self._restore(counts)
+            raise
+        finally:
+            if flushing_key:
+                self._delete_key(flushing_key)
+
+        return len(counts)
+
+    def _take_local(self):
+        taken = Counter()
+        for lock, counts in self._shards:
+            with lock:
+                taken.update(counts)
+                counts.clear()
+        return taken
+
+    def _take_redis(self):
+        client = get_redis()
+        if client is None:
+            return {}, None
+
+        flushing_key = f'{self.name}:flushing:{uuid.uuid4().hex}'
+        try:
+            # Atomic hand-off: hits recorded from now on go to a new hash
+            client.rename(self.name, flushing_key)
+        except Exception as e:
+            if 'no such key' not in str(e).lower():
+                logger.warning(f"Redis counter flush error: {e}")
+                mark_redis_down()
+            return {}, None
+
+        try:
+            raw = client.hgetall(flushing_key)
+        except Exception as e:
+            logger.warning(f"Redis counter flush error: {e}")
+            mark_redis_down()
+            return {}, None
+
+        return {int(key): int(value) for key, value in raw.items()}, flushing_key
+
+    def _delete_key(self, key):
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis counter cleanup error: {e}")
+
+    def _restore(self, counts):
+        for object_id, amount in counts.items():
+            lock, shard = self._shards[object_id % self.SHARDS]
+            with lock:
+                shard[object_id] += amount
+
+    # ------------------------------------------------------------------
+    # Background flusher
+    # ------------------------------------------------------------------
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        interval = getattr(settings, self.interval_setting, 30)
+        if not interval:
+            return
+
+        with self._flusher_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher,
+                args=(interval,),
+                name=f'{self.name}-flusher',
+                daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self._flush_quietly)
+
+    def _run_flusher(self, interval):
+        while True:
+            time.sleep(interval)
+            self._flush_quietly()
+
+    def _flush_quietly(self):
+        try:
+            flushed = self.flush()
+            if flushed:
+                logger.debug(f"Flushed {self.name} for {flushed} objects")
+        except Exception as e:
+            logger.error(f"Error flushing {self.name}: {e}")
+        finally:
+            # This thread's connection must not outlive the flush
+            close_old_connections()
+
+
+def _apply_task_views(counts):
+    """One UPDATE ... SET views_count = views_count + n per distinct n"""
+    from .models import Task
+
+    task_ids_by_amount = defaultdict(list)
+    for task_id, amount in counts.items():
+        task_ids_by_amount[amount].append(task_id)
+
+    with transaction.atomic():
+        for amount, task_ids in task_ids_by_amount.items():
+            for start in range(0, len(task_ids), UPDATE_CHUNK_SIZE):
+                Task.objects.filter(
+                    id__in=task_ids[start:start + UPDATE_CHUNK_SIZE]
+                ).update(views_count=F('views_count') + amount)
+
+
+task_views = BufferedCounter('task_views', _apply_task_views, 'TASK_VIEW_FLUSH_INTERVAL')
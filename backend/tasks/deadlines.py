@@ -0,0 +1,168 @@
+"""
+Overdue task sweeper
+====================
+
+OPEN tasks whose deadline has passed are moved to EXPIRED in batches:
+each batch locks up to batch_size overdue tasks (a partial index on
+deadline WHERE status = 'OPEN' finds them), expires them with one UPDATE,
+withdraws their pending applications with one more, and fixes the
+application counters with one UPDATE per distinct count.
+
+update() skips signals, so each batch does their work itself: statistics
+counters, HTTP cache versions and notifications (one bulk insert, pushed
+over the WebSocket after commit).
+
+Run `python manage.py sweep_overdue_tasks` from cron, e.g. every 10 minutes.
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from utils.http_cache import bump_versions
+
+from .application_counts import STATUS_COUNT_FIELDS
+from .models import Task, TaskApplication
+from .statistics import adjust_counters, task_counter_deltas
+
+logger = logging.getLogger('tasks')
+
+EXPIRED_STATUS = 'EXPIRED'
+
+
+def overdue_tasks(now=None):
+    """OPEN tasks past their deadline"""
+    return Task.objects.filter(
+        status='OPEN', deadline__isnull=False, deadline__lt=now or timezone.now()
+    )
+
+
+def sweep_overdue_tasks(now=None, batch_size=None, notify=True):
+    """
+    Expire overdue OPEN tasks batch by batch
+
+    Returns {'tasks': n, 'applications': n, 'batches': n}.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'TASK_DEADLINE_SWEEP_BATCH_SIZE', 500)
+    summary = {'tasks': 0, 'applications': 0, 'batches': 0}
+
+    while True:
+        tasks, applications = _sweep_batch(now, batch_size, notify)
+        if not tasks:
+            break
+        summary['tasks'] += tasks
+        summary['applications'] += applications
+        summary['batches'] += 1
+        if tasks < batch_size:
+            break
+
+    if summary['tasks']:
+        logger.info(
+            f"Expired {summary['tasks']} overdue tasks and withdrew "
+            f"{summary['applications']} applications in {summary['batches']} batches"
+        )
+    return summary
+
+
+def _sweep_batch(now, batch_size, notify):
+    with transaction.atomic():
+        # TaskUpdateView holds the row lock while a client's edit is saved;
+        # those tasks are left for the next run instead of waited on
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        tasks = list(
+            overdue_tasks(now)
+            .order_by('deadline', 'id')
+            .select_for_update(skip_locked=skip_locked)
+            .values_list('id', 'client_id', 'budget', 'title')[:batch_size]
+        )
+        if not tasks:
+            return 0, 0
+        task_ids = [task[0] for task in tasks]
+
+        Task.objects.filter(pk__in=task_ids).update(status=EXPIRED_STATUS, updated_at=now)
+
+        pending = TaskApplication.objects.filter(task_id__in=task_ids, status='PENDING')
+        withdrawn = list(pending.values_list('id', 'task_id', 'freelancer_id'))
+        if withdrawn:
+            TaskApplication.objects.filter(
+                pk__in=[application[0] for application in withdrawn]
+            ).update(status='WITHDRAWN', updated_at=now)
+            _move_application_counts(Counter(application[1] for application in withdrawn))
+
+        deltas = Counter()
+        for _, _, budget, _ in tasks:
+            deltas.update(task_counter_deltas('OPEN', budget, sign=-1))
+            deltas.update(task_counter_deltas(EXPIRED_STATUS, budget))
+        adjust_counters(dict(deltas))
+
+        bump_versions([
+            'tasks',
+            *(f'task:{task_id}' for task_id in task_ids),
+            *(f'user:{client_id}' for _, client_id, _, _ in tasks),
+            *(f'viewer:{freelancer_id}' for _, _, freelancer_id in withdrawn),
+        ])
+
+        if notify:
+            _notify(tasks, withdrawn)
+
+    return len(tasks), len(withdrawn)
+
+
+def _move_application_counts(withdrawn_per_task):
+    """PENDING -> WITHDRAWN counters: one UPDATE per distinct count"""
+    by_amount = defaultdict(list)
+    for task_id, amount in withdrawn_per_task.items():
+        by_amount[amount].append(task_id)
+
+    pending_field = STATUS_COUNT_FIELDS['PENDING']
+    withdrawn_field = STATUS_COUNT_FIELDS['WITHDRAWN']
+    for amount, task_ids in by_amount.items():
+        Task.objects.filter(pk__in=task_ids).update(**{
+            pending_field: F(pending_field) - amount,
+            withdrawn_field: F(withdrawn_field) + amount,
+        })
+
+
+def _notify(tasks, withdrawn):
+    """One notification per expired task and per withdrawn application"""
+    from notifications.models import Notification
+    from notifications.signals import send_notification_via_websocket
+
+    titles = {task_id: title for task_id, _, _, title in tasks}
+    notifications = [
+        Notification(
+            recipient_id=client_id,
+            notification_type='task_update',
+            title='Task Expired',
+            message=f'Your task "{title}" passed its deadline and is no longer open',
+            task_id=task_id,
+            link=f'/tasks/{task_id}'
+        )
+        for task_id, client_id, _, title in tasks
+    ]
+    notifications += [
+        Notification(
+            recipient_id=freelancer_id,
+            notification_type='task_update',
+            title='Application Withdrawn',
+            message=f'"{titles[task_id]}" passed its deadline, so your application was withdrawn',
+            task_id=task_id,
+            application_id=application_id,
+            link=f'/tasks/{task_id}'
+        )
+        for application_id, task_id, freelancer_id in withdrawn
+    ]
+    created = Notification.objects.bulk_create(notifications)
+
+    def push():
+        for notification in created:
+            try:
+                send_notification_via_websocket(notification.recipient_id, notification)
+            except Exception as e:
+                logger.warning(f"Error pushing notification {notification.id}: {e}")
+
+    transaction.on_commit(push)
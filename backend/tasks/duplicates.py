@@ -0,0 +1,172 @@
+"""
+Near-duplicate task detection
+=============================
+
+Clients often repost a task with a few words changed. Each task stores a
+MinHash signature of its title and description (Task.minhash, set by
+Task.save() and by bulk creation): NUM_PERMUTATIONS
+minimums of hashed word 3-shingles. The share of equal positions between
+two signatures estimates the Jaccard similarity of their shingle sets.
+
+LSH banding finds candidates without comparing every pair: signatures are
+split into BANDS bands and tasks sharing any whole band land in the same
+bucket. With 16 bands of 4 rows, pairs at 0.8 similarity share a bucket
+with probability > 0.99, pairs at 0.3 about 12% of the time.
+
+find_client_duplicates() checks a new or edited task against the same
+client's open tasks (TaskCreateUpdateSerializer.validate, also per row of
+a bulk import);
+`python manage.py find_duplicate_tasks` reports existing duplicates.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from itertools import combinations
+
+from django.conf import settings
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+# Largest prime below 2**32 for the hash functions (a * x + b) mod p:
+# a * x + b stays below 2**64
+_PRIME = 4294967291
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_permutations = None
+
+
+def get_threshold():
+    return getattr(settings, 'TASK_DUPLICATE_THRESHOLD', 0.8)
+
+
+def _get_permutations():
+    """Fixed (a, b) per hash function, so stored signatures stay comparable"""
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+
+        rng = np.random.default_rng(20240601)
+        _permutations = (
+            rng.integers(1, _PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64),
+            rng.integers(0, _PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64),
+        )
+    return _permutations
+
+
+def shingles(title, description):
+    """Word 3-shingles of the lowercased text (single words for very short texts)"""
+    tokens = _TOKEN_RE.findall(f'{title or ""} {description or ""}'.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return set(tokens)
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def signature(title, description):
+    """MinHash signature (uint32 array) of a task's text"""
+    import numpy as np
+
+    hashed = np.array([
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), 'little') % _PRIME
+        for shingle in shingles(title, description)
+    ] or [0], dtype=np.uint64)
+
+    a, b = _get_permutations()
+    values = (a[:, None] * hashed[None, :] + b[:, None]) % _PRIME
+    return values.min(axis=1).astype('<u4')
+
+
+def signature_bytes(title, description):
+    return signature(title, description).tobytes()
+
+
+def from_bytes(data):
+    import numpy as np
+
+    return np.frombuffer(bytes(data), dtype='<u4')
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return float((first == second).mean())
+
+
+def band_keys(sig):
+    """One bucket key per band"""
+    raw = sig.tobytes()
+    size = ROWS_PER_BAND * 4
+    return [(band, raw[band * size:(band + 1) * size]) for band in range(BANDS)]
+
+
+class LSHIndex:
+    """Buckets of signatures sharing a band"""
+
+    def __init__(self):
+        self.signatures = {}
+        self.buckets = defaultdict(set)
+
+    def add(self, key, sig):
+        self.signatures[key] = sig
+        for band_key in band_keys(sig):
+            self.buckets[band_key].add(key)
+
+    def candidates(self, sig):
+        found = set()
+        for band_key in band_keys(sig):
+            found |= self.buckets.get(band_key, set())
+        return found
+
+    def query(self, sig, threshold):
+        """[(key, similarity)] at or above threshold, most similar first"""
+        matches = [
+            (key, similarity(sig, self.signatures[key]))
+            for key in self.candidates(sig)
+        ]
+        return sorted(
+            [match for match in matches if match[1] >= threshold],
+            key=lambda match: -match[1]
+        )
+
+    def pairs(self, threshold):
+        """{(key_a, key_b): similarity} for all pairs at or above threshold"""
+        found = {}
+        for keys in self.buckets.values():
+            for first, second in combinations(sorted(keys), 2):
+                if (first, second) not in found:
+                    found[(first, second)] = similarity(self.signatures[first], self.signatures[second])
+        return {pair: score for pair, score in found.items() if score >= threshold}
+
+
+def find_client_duplicates(client_id, title, description, exclude_id=None, threshold=None):
+    """
+    [(task_id, title, similarity)] of the client's open tasks that look like
+    the given text, most similar first
+    """
+    from .models import Task
+
+    threshold = get_threshold() if threshold is None else threshold
+    tasks = Task.objects.filter(client_id=client_id, status='OPEN')
+    if exclude_id is not None:
+        tasks = tasks.exclude(pk=exclude_id)
+
+    index = LSHIndex()
+    titles, unsigned = {}, []
+    for task_id, task_title, stored in tasks.values_list('id', 'title', 'minhash'):
+        titles[task_id] = task_title
+        if stored is None:
+            unsigned.append(task_id)
+        else:
+            index.add(task_id, from_bytes(stored))
+    if unsigned:
+        # Saved before signatures existed (find_duplicate_tasks fills them in)
+        for task_id, task_title, task_description in Task.objects.filter(
+            pk__in=unsigned
+        ).values_list('id', 'title', 'description'):
+            index.add(task_id, signature(task_title, task_description))
+
+    return [
+        (task_id, titles[task_id], score)
+        for task_id, score in index.query(signature(title, description), threshold)
+    ]
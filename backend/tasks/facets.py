@@ -0,0 +1,159 @@
+"""
+Task list facets
+================
+
+Counts per category, city, task type, remote flag and budget bucket for
+the tasks matching the current task list filters, for the browse UI's
+filter sidebar.
+
+All facets come from one GROUP BY over the five facet columns (the budget
+bucket is a CASE over budget): each row is one combination with its
+count, and the per-facet counts are sums over those rows. One query
+instead of one per facet, and the number of rows is bounded by the
+combinations that actually occur.
+
+Results are cached for TASK_FACETS_CACHE_TIMEOUT seconds under the
+normalized filter parameters (ordering, paging and fields don't change
+the counts), so the hot unfiltered open-market facets are computed at
+most once per timeout. Counts can be that many seconds old.
+"""
+import hashlib
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from .models import Task
+
+logger = logging.getLogger('tasks')
+
+FACETS_CACHE_PREFIX = 'task_facets:v1'
+
+# Query parameters that change which tasks match (see TaskListView)
+FILTER_PARAMS = (
+    'status', 'task_type', 'category', 'city', 'is_remote',
+    'min_budget', 'max_budget', 'skills[]', 'skills_match', 'search',
+)
+
+# Upper bounds of the budget buckets; the last bucket is open-ended
+BUDGET_BUCKET_EDGES = [50, 100, 250, 500, 1000]
+
+# Most frequent cities returned
+MAX_CITY_VALUES = 20
+
+
+def normalized_filters(request):
+    """Filter parameters with sorted keys and values, blanks dropped"""
+    normalized = []
+    for key in FILTER_PARAMS:
+        values = sorted({value.strip() for value in request.query_params.getlist(key) if value.strip()})
+        if values:
+            normalized.append((key, tuple(values)))
+    return normalized
+
+
+def facets_cache_key(filters):
+    digest = hashlib.md5(repr(filters).encode(), usedforsecurity=False).hexdigest()
+    return f'{FACETS_CACHE_PREFIX}:{digest}'
+
+
+def budget_buckets():
+    """[(index, min_budget, max_budget)], max_budget None for the last bucket"""
+    lowers = [0, *BUDGET_BUCKET_EDGES]
+    uppers = [*BUDGET_BUCKET_EDGES, None]
+    return list(enumerate(zip(lowers, uppers)))
+
+
+def budget_bucket_expression():
+    return Case(
+        *[When(budget__lt=upper, then=Value(index)) for index, (_, upper) in budget_buckets() if upper],
+        default=Value(len(BUDGET_BUCKET_EDGES)),
+        output_field=IntegerField(),
+    )
+
+
+def compute_facets(queryset):
+    """{'total': n, 'facets': {...}} for a filtered task queryset"""
+    rows = (
+        queryset.prefetch_related(None).order_by()
+        .values(
+            'category_id', 'category__name', 'category__slug',
+            'city', 'task_type', 'is_remote', budget_bucket=budget_bucket_expression(),
+        )
+        .annotate(count=Count('id'))
+    )
+
+    total = 0
+    categories, category_info = Counter(), {}
+    cities, task_types, remote, budgets = Counter(), Counter(), Counter(), Counter()
+    for row in rows:
+        count = row['count']
+        total += count
+        if row['category_id'] is not None:
+            categories[row['category_id']] += count
+            category_info[row['category_id']] = (row['category__name'], row['category__slug'])
+        if row['city']:
+            cities[row['city']] += count
+        task_types[row['task_type']] += count
+        remote[row['is_remote']] += count
+        budgets[row['budget_bucket']] += count
+
+    type_labels = dict(Task.TASK_TYPE_CHOICES)
+    return {
+        'total': total,
+        'facets': {
+            'category': [
+                {'value': category_id, 'label': category_info[category_id][0],
+                 'slug': category_info[category_id][1], 'count': count}
+                for category_id, count in _by_count(categories)
+            ],
+            'city': [
+                {'value': city, 'count': count}
+                for city, count in _by_count(cities)[:MAX_CITY_VALUES]
+            ],
+            'task_type': [
+                {'value': task_type, 'label': type_labels.get(task_type, task_type), 'count': count}
+                for task_type, count in _by_count(task_types)
+            ],
+            'is_remote': [
+                {'value': is_remote, 'count': count}
+                for is_remote, count in _by_count(remote)
+            ],
+            # Every bucket, in budget order, so the UI can show empty ones
+            'budget': [
+                {'min_budget': lower, 'max_budget': upper, 'count': budgets.get(index, 0)}
+                for index, (lower, upper) in budget_buckets()
+            ],
+        },
+    }
+
+
+def _by_count(counter):
+    """(value, count) pairs, largest count first, then by value"""
+    return sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+def get_task_facets(request, get_queryset):
+    """
+    Facets for the request's filters, from the cache when fresh
+
+    get_queryset() returns the filtered queryset; it is only called on a
+    cache miss.
+    """
+    key = facets_cache_key(normalized_filters(request))
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Error reading task facets cache: {e}")
+        cached = None
+    if cached is not None:
+        return cached
+
+    facets = compute_facets(get_queryset())
+    try:
+        cache.set(key, facets, getattr(settings, 'TASK_FACETS_CACHE_TIMEOUT', 60))
+    except Exception as e:
+        logger.warning(f"Error writing task facets cache: {e}")
+    return facets
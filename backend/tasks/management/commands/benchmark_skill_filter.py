@@ -0,0 +1,112 @@
+"""
+Compare the skill filter query plans: join + DISTINCT vs EXISTS
+
+Prints EXPLAIN output and the median time to fetch the first page for the
+old `required_skills__id__in=... .distinct()` filter and for the EXISTS
+filter used by the task list (tasks/search.py), and checks that both
+return the same tasks.
+
+Run: python manage.py benchmark_skill_filter --skills 3 7 --search design
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from tasks.models import Task
+from tasks.search import filter_by_skills, search_tasks
+
+
+class Command(BaseCommand):
+    help = 'Show query plans and timings for the task skill filter'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skills',
+            type=int,
+            nargs='+',
+            help='Skill IDs to filter by (default: the three most required skills)',
+        )
+        parser.add_argument(
+            '--match',
+            choices=['any', 'all'],
+            default='any',
+            help='Match any or all of the skills',
+        )
+        parser.add_argument('--search', default='', help='Also apply a search query')
+        parser.add_argument('--ordering', default='-created_at', help='Ordering field')
+        parser.add_argument('--page-size', type=int, default=12)
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='EXPLAIN ANALYZE (PostgreSQL only)',
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be positive')
+
+        skill_ids = options['skills'] or self.most_required_skills()
+        if not skill_ids:
+            raise CommandError('No task requires any skill - pass --skills')
+
+        base = Task.objects.all()
+        if options['search']:
+            base = search_tasks(base, options['search'])
+        base = base.order_by(options['ordering'], '-id')
+
+        variants = {
+            'EXISTS': filter_by_skills(base, skill_ids, match=options['match']),
+            'join + DISTINCT': self.legacy_filter(base, skill_ids, options['match']),
+        }
+
+        self.stdout.write(f'skills: {skill_ids} (match {options["match"]})\n')
+        page_ids = {}
+        for name, queryset in variants.items():
+            page = queryset.values_list('id', flat=True)[:options['page_size']]
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name}'))
+            self.stdout.write(self.explain(page, options['analyze']))
+
+            timings = []
+            for _ in range(options['runs']):
+                started = time.perf_counter()
+                page_ids[name] = list(page.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f'median {statistics.median(timings):.2f} ms, '
+                f'count {queryset.count()}\n'
+            )
+
+        if page_ids['EXISTS'] != page_ids['join + DISTINCT']:
+            raise CommandError('The two filters returned different tasks')
+        self.stdout.write(self.style.SUCCESS('Both filters return the same first page'))
+
+    def explain(self, queryset, analyze):
+        """
+        EXPLAIN through the cursor - QuerySet.explain() drops the plan
+        details of DISTINCT queries on SQLite
+        """
+        prefix = connection.ops.explain_query_prefix(**({'analyze': True} if analyze else {}))
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            # PostgreSQL returns one text column, SQLite (id, parent, notused, detail)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+    def most_required_skills(self):
+        return list(
+            Task.required_skills.through.objects.values('skill_id').annotate(
+                uses=Count('id')
+            ).order_by('-uses').values_list('skill_id', flat=True)[:3]
+        )
+
+    def legacy_filter(self, queryset, skill_ids, match):
+        """The filter TaskListView used before the EXISTS version"""
+        if match == 'all':
+            for skill_id in skill_ids:
+                queryset = queryset.filter(required_skills__id=skill_id)
+            return queryset.distinct()
+        return queryset.filter(required_skills__id__in=skill_ids).distinct()
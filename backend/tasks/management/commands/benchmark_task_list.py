@@ -0,0 +1,87 @@
+"""
+Compare task list serialization: TaskListSerializer vs TaskListProjection
+
+Times building a page of task list rows both ways - queries included,
+with the same select_related/prefetch_related the list view uses - and
+prints rows per second. Checks that both produce the same rows.
+
+Run: python manage.py benchmark_task_list --page-size 12 50 100 --user alice
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.models import Task
+from tasks.projections import TaskListProjection, parse_fields
+from tasks.serializers import TaskListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare rows per second of TaskListSerializer and the .values() projection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, nargs='+', default=[12, 50, 100])
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--user', help='Username of the viewer (default: anonymous)')
+        parser.add_argument('--fields', default='', help='Sparse fieldset for the projection, e.g. id,title,budget')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be positive')
+
+        user = AnonymousUser()
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user "{options["user"]}"')
+
+        query = {'fields': options['fields']} if options['fields'] else {}
+        request = Request(APIRequestFactory().get('/api/tasks/', query, HTTP_HOST='localhost'))
+        request.user = user
+        fields = parse_fields(request)
+
+        base = Task.objects.order_by('-created_at', '-id')
+        available = base.count()
+        if not available:
+            raise CommandError('No tasks to serialize')
+
+        for page_size in options['page_size']:
+            page_size = min(page_size, available)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== page size {page_size}'))
+
+            def serializer_page():
+                page = list(
+                    base.select_related('client', 'category')
+                    .prefetch_related('required_skills')
+                    .defer('search_vector')[:page_size]
+                )
+                return TaskListSerializer(page, many=True, context={'request': request}).data
+
+            def projection_page():
+                projection = TaskListProjection(request, fields)
+                return projection.render(projection.project(base)[:page_size])
+
+            results = {}
+            for name, build in (('serializer', serializer_page), ('projection', projection_page)):
+                timings = []
+                for _ in range(options['runs']):
+                    started = time.perf_counter()
+                    results[name] = build()
+                    timings.append(time.perf_counter() - started)
+                median = statistics.median(timings)
+                self.stdout.write(
+                    f'{name:<11} median {median * 1000:8.2f} ms  {page_size / median:10.0f} rows/s'
+                )
+
+            expected = [dict(row) for row in results['serializer']]
+            if fields is not None:
+                expected = [{name: row[name] for name in fields} for row in expected]
+            if expected != results['projection']:
+                raise CommandError('The projection returned different rows')
+        self.stdout.write(self.style.SUCCESS('Both produce the same rows'))
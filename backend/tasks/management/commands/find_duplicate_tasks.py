@@ -0,0 +1,71 @@
+"""
+Report near-duplicate tasks
+
+Groups open tasks by MinHash/LSH buckets (tasks/duplicates.py) and lists
+the pairs whose estimated similarity reaches the threshold - by default
+only pairs posted by the same client. Tasks saved before signatures
+existed get theirs computed and stored on the way.
+
+Run: python manage.py find_duplicate_tasks [--threshold 0.8] [--all-clients] [--all-statuses]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.duplicates import LSHIndex, from_bytes, get_threshold, signature_bytes
+from tasks.models import Task
+
+UPDATE_CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Find near-duplicate tasks with MinHash/LSH'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=None, help='Minimum estimated similarity (0-1)')
+        parser.add_argument('--all-clients', action='store_true', help='Also pair tasks of different clients')
+        parser.add_argument('--all-statuses', action='store_true', help='Not only OPEN tasks')
+
+    def handle(self, *args, **options):
+        threshold = options['threshold'] if options['threshold'] is not None else get_threshold()
+        if not 0 < threshold <= 1:
+            raise CommandError('--threshold must be between 0 and 1')
+
+        tasks = Task.objects.all() if options['all_statuses'] else Task.objects.filter(status='OPEN')
+        filled = self.fill_signatures(tasks)
+        if filled:
+            self.stdout.write(f'Computed {filled} missing signatures')
+
+        # Per client unless --all-clients: LSH keys are (client, task)
+        index = LSHIndex()
+        titles = {}
+        for task_id, client_id, title, stored in tasks.values_list(
+            'id', 'client_id', 'title', 'minhash'
+        ).iterator():
+            group = None if options['all_clients'] else client_id
+            index.add((group, task_id), from_bytes(stored))
+            titles[task_id] = (client_id, title)
+
+        pairs = [
+            (first[1], second[1], score)
+            for (first, second), score in index.pairs(threshold).items()
+            if first[0] == second[0]
+        ]
+        for first, second, score in sorted(pairs, key=lambda pair: -pair[2]):
+            self.stdout.write(
+                f'{score:.2f}  #{first} "{titles[first][1]}" ~ #{second} "{titles[second][1]}"'
+                f'  (clients {titles[first][0]}, {titles[second][0]})'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(pairs)} likely duplicate pairs among {len(titles)} tasks'
+        ))
+
+    def fill_signatures(self, tasks):
+        missing = tasks.filter(minhash__isnull=True).values_list('id', 'title', 'description')
+        batch, filled = [], 0
+        for task_id, title, description in missing.iterator():
+            batch.append(Task(id=task_id, minhash=signature_bytes(title, description)))
+            if len(batch) >= UPDATE_CHUNK_SIZE:
+                filled += Task.objects.bulk_update(batch, ['minhash'])
+                batch = []
+        if batch:
+            filled += Task.objects.bulk_update(batch, ['minhash'])
+        return filled
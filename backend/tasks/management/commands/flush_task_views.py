@@ -0,0 +1,20 @@
+"""
+Apply buffered task view hits to Task.views_count
+
+Web processes flush on their own every TASK_VIEW_FLUSH_INTERVAL seconds;
+run this from cron or before reading exact counts (reports, deploys). It
+flushes hits buffered in Redis and in this process.
+
+Run: python manage.py flush_task_views
+"""
+from django.core.management.base import BaseCommand
+
+from tasks.counters import task_views
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered task view counts to the database'
+
+    def handle(self, *args, **options):
+        flushed = task_views.flush()
+        self.stdout.write(self.style.SUCCESS(f'Flushed view counts for {flushed} tasks'))
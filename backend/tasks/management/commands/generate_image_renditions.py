@@ -0,0 +1,82 @@
+"""
+Render thumbnail/preview renditions of uploaded images
+
+New uploads are rendered after their save (utils/images.py); run this
+once for images uploaded before renditions existed, or with --force
+after changing the rendition sizes or format.
+
+Run: python manage.py generate_image_renditions [--model user] [--force] [--workers 4]
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from accounts.models import PortfolioItem, User
+from tasks.models import Task, TaskImage
+from utils.images import generate_renditions, renditions_field
+
+# --model name: (model, image field)
+IMAGE_FIELDS = {
+    'task': (Task, 'image'),
+    'taskimage': (TaskImage, 'image'),
+    'user': (User, 'profile_picture'),
+    'portfolioitem': (PortfolioItem, 'image'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Render thumbnail and preview renditions of uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=sorted(IMAGE_FIELDS),
+            action='append',
+            dest='models',
+            help='Only these models (repeatable)',
+        )
+        parser.add_argument('--force', action='store_true', help='Re-render images that have renditions')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max(getattr(settings, 'IMAGE_RENDITION_WORKERS', 2), 1),
+            help='Rendering threads',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be positive')
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for name in options['models'] or sorted(IMAGE_FIELDS):
+                model, field_name = IMAGE_FIELDS[name]
+                pending = self.pending(model, field_name, options['force'])
+                results = list(pool.map(lambda pk: self.render(model, pk, field_name), pending))
+                self.stdout.write(
+                    f'{model._meta.label}: rendered {results.count(True)}, '
+                    f'failed {results.count(False)}'
+                )
+
+        self.stdout.write(self.style.SUCCESS('Done'))
+
+    def pending(self, model, field_name, force):
+        """pks of objects with an image and, without force, no current renditions"""
+        rows = model._default_manager.exclude(**{field_name: ''}).exclude(
+            **{f'{field_name}__isnull': True}
+        ).values_list('pk', field_name, renditions_field(field_name))
+        return [
+            pk for pk, source, record in rows
+            if force or (record or {}).get('source') != source
+        ]
+
+    def render(self, model, pk, field_name):
+        try:
+            generate_renditions(model, pk, field_name)
+            return True
+        except Exception as e:
+            self.stderr.write(f'{model._meta.label} {pk}: {e}')
+            return False
+        finally:
+            connections.close_all()
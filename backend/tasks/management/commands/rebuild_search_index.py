@@ -0,0 +1,38 @@
+"""
+Recompute task search vectors
+
+Needed after changing TASK_SEARCH_CONFIG or loading tasks with bulk
+operations that bypass signals. Runs in batches of one UPDATE each.
+
+Run: python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand
+
+from tasks.models import Task
+from tasks.search import update_search_vectors, uses_postgres_search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild full-text search vectors for all tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tasks updated per statement',
+        )
+
+    def handle(self, *args, **options):
+        if not uses_postgres_search():
+            self.stdout.write('Not on PostgreSQL - the in-memory index rebuilds itself on first search')
+            return
+
+        batch_size = max(1, options['batch_size'])
+        ids = list(Task.objects.order_by('id').values_list('id', flat=True))
+
+        for start in range(0, len(ids), batch_size):
+            update_search_vectors(ids[start:start + batch_size])
+            self.stdout.write(f'  {min(start + batch_size, len(ids))}/{len(ids)} tasks')
+
+        self.stdout.write(self.style.SUCCESS(f'Search vectors rebuilt for {len(ids)} tasks'))
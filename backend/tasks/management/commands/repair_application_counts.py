@@ -0,0 +1,29 @@
+"""
+Recompute tasks' application counters from their applications
+
+Applies, deletes and status changes update Task.applications_count and
+the per-status counts incrementally; run this after changing applications
+in bulk (raw SQL, imports, seed data) or to correct drift.
+
+Run: python manage.py repair_application_counts [--task-id 12 --task-id 15]
+"""
+from django.core.management.base import BaseCommand
+
+from tasks.application_counts import repair_application_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute applications_count and the per-status counts of tasks from their applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--task-id',
+            type=int,
+            action='append',
+            dest='task_ids',
+            help='Only repair these tasks (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        repaired = repair_application_counts(options['task_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Repaired application counts for {repaired} tasks'))
@@ -0,0 +1,29 @@
+"""
+Recompute users' rating aggregates from their reviews
+
+New reviews update User.rating_sum / total_reviews / average_rating
+incrementally; run this after editing or deleting reviews, or changing
+their visibility, in bulk.
+
+Run: python manage.py repair_user_ratings [--user-id 12 --user-id 15]
+"""
+from django.core.management.base import BaseCommand
+
+from tasks.ratings import repair_user_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute rating sum, count and average for users from their public reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='Only repair these users (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        repaired = repair_user_ratings(options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Repaired ratings for {repaired} users'))
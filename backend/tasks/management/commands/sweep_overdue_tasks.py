@@ -0,0 +1,44 @@
+"""
+Expire OPEN tasks whose deadline has passed
+
+Moves them to EXPIRED in batches, withdraws their pending applications
+and notifies clients and applicants (tasks/deadlines.py). Run it from
+cron, e.g. every 10 minutes.
+
+Run: python manage.py sweep_overdue_tasks [--batch-size 500] [--dry-run]
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.deadlines import overdue_tasks, sweep_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = 'Expire overdue open tasks and withdraw their pending applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'TASK_DEADLINE_SWEEP_BATCH_SIZE', 500),
+            help='Tasks per transaction',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count overdue tasks')
+        parser.add_argument('--no-notify', action='store_true', help="Don't send notifications")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        if options['dry_run']:
+            self.stdout.write(f'{overdue_tasks().count()} overdue open tasks')
+            return
+
+        summary = sweep_overdue_tasks(
+            batch_size=options['batch_size'],
+            notify=not options['no_notify'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {summary['tasks']} tasks, withdrew {summary['applications']} "
+            f"applications ({summary['batches']} batches)"
+        ))
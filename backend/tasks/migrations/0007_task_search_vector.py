@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:38
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    """GIN indexes and initial vectors - PostgreSQL only (SQLite uses the in-memory index)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    from django.contrib.postgres.search import SearchVector
+    from django.conf import settings
+
+    schema_editor.execute(
+        'CREATE INDEX tasks_search_vector_gin ON tasks USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)'
+    )
+
+    config = getattr(settings, 'TASK_SEARCH_CONFIG', 'english')
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(
+        search_vector=(
+            SearchVector('title', weight='A', config=config)
+            + SearchVector('description', weight='B', config=config)
+            + SearchVector('location', weight='C', config=config)
+        )
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS tasks_search_vector_gin')
+    schema_editor.execute('DROP INDEX IF EXISTS tasks_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_add_saved_task_model'),
+    ]
+
+    operations = [
+        # No-op on other databases
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='review',
+            name='reviews_reviewe_8697f0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='savedtask',
+            name='saved_tasks_user_id_b68e0f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_status_ec5702_idx',
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewee', '-created_at', '-id'], name='reviews_reviewe_d273f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewee', 'rating', 'id'], name='reviews_reviewe_77a452_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedtask',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='saved_tasks_user_id_0c7f4d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at', '-id'], name='tasks_created_07ab2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='tasks_status_8014e4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['budget', 'id'], name='tasks_budget_e7d748_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['deadline', 'id'], name='tasks_deadlin_b3eb56_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['applications_count', 'id'], name='tasks_applica_4bb15a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskapplication',
+            index=models.Index(fields=['freelancer', '-created_at', '-id'], name='task_applic_freelan_ce4194_idx'),
+        ),
+    ]
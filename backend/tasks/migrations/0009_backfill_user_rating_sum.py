@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:05
+
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import (
+    Case, Count, DecimalField, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Round
+from django.db.models.lookups import GreaterThan
+
+
+def backfill_user_ratings(apps, schema_editor):
+    """
+    Rebuild User.rating_sum, total_reviews and average_rating from public
+    reviews (same expressions as tasks.ratings.repair_user_ratings)
+
+    total_reviews and average_rating may have been loaded from elsewhere
+    (load_dataset.py copies them from users.json); the incremental updates
+    in apply_review_rating are only right once all three agree.
+    """
+    Review = apps.get_model('tasks', 'Review')
+    User = apps.get_model('accounts', 'User')
+
+    public_reviews = Review.objects.filter(
+        reviewee=OuterRef('pk'), is_public=True
+    ).order_by().values('reviewee')
+    actual_sum = Coalesce(
+        Subquery(public_reviews.annotate(total=Sum('rating')).values('total')),
+        0, output_field=IntegerField()
+    )
+    actual_count = Coalesce(
+        Subquery(public_reviews.annotate(total=Count('id')).values('total')),
+        0, output_field=IntegerField()
+    )
+    rating_field = DecimalField(max_digits=3, decimal_places=2)
+    average = Cast(
+        Cast(actual_sum, FloatField()) / actual_count,
+        DecimalField(max_digits=12, decimal_places=6)
+    )
+
+    User.objects.update(
+        rating_sum=actual_sum,
+        total_reviews=actual_count,
+        average_rating=Case(
+            When(GreaterThan(actual_count, 0), then=Round(average, 2, output_field=rating_field)),
+            default=Value(Decimal('0.00')),
+            output_field=rating_field,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_rating_sum'),
+        ('tasks', '0008_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_ratings, migrations.RunPython.noop),
+    ]
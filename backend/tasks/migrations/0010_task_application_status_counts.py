@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+STATUS_COUNT_FIELDS = {
+    'PENDING': 'pending_applications_count',
+    'ACCEPTED': 'accepted_applications_count',
+    'REJECTED': 'rejected_applications_count',
+    'WITHDRAWN': 'withdrawn_applications_count',
+}
+
+
+def backfill_application_counts(apps, schema_editor):
+    """Fill the counters from existing applications"""
+    Task = apps.get_model('tasks', 'Task')
+    TaskApplication = apps.get_model('tasks', 'TaskApplication')
+
+    counts = {}
+    rows = (
+        TaskApplication.objects.values('task', 'status')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        task_counts = counts.setdefault(row['task'], {'applications_count': 0})
+        task_counts['applications_count'] += row['total']
+        task_counts[STATUS_COUNT_FIELDS[row['status']]] = row['total']
+
+    for task_id, task_counts in counts.items():
+        Task.objects.filter(pk=task_id).update(**task_counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_backfill_user_rating_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='accepted_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='pending_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rejected_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='withdrawn_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_application_counts, migrations.RunPython.noop),
+    ]
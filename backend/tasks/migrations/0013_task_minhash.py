@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
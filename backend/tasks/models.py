@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -41,6 +42,8 @@ class Task(models.Model):
         ('IN_PROGRESS', 'In Progress'),
         ('COMPLETED', 'Completed'),
         ('CANCELLED', 'Cancelled'),
+        # Left OPEN past its deadline (set by tasks/deadlines.py)
+        ('EXPIRED', 'Expired'),
     ]
     
     # Task type
@@ -121,10 +124,18 @@ class Task(models.Model):
 
     # Attachments
     image = models.ImageField(upload_to='task_images/', null=True, blank=True)
+    # Storage names of the thumb/preview renditions (utils/images.py)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     # Engagement metrics
     views_count = models.IntegerField(default=0)
     applications_count = models.IntegerField(default=0)
+    # applications_count split by TaskApplication.status
+    # (maintained by tasks/application_counts.py)
+    pending_applications_count = models.IntegerField(default=0)
+    accepted_applications_count = models.IntegerField(default=0)
+    rejected_applications_count = models.IntegerField(default=0)
+    withdrawn_applications_count = models.IntegerField(default=0)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -157,21 +168,85 @@ class Task(models.Model):
         help_text="Final agreed amount (from accepted application)"
     )
 
+    # Full-text search (maintained by tasks/signals.py, see tasks/search.py)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    # MinHash of title + description for near-duplicate checks (tasks/duplicates.py)
+    minhash = models.BinaryField(null=True, blank=True, editable=False)
+
     class Meta:
         db_table = 'tasks'
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['status', '-created_at']),
+            # Keyset pagination: each sort field is paired with id
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status', '-created_at', '-id']),
+            models.Index(fields=['budget', 'id']),
+            models.Index(fields=['deadline', 'id']),
+            # Overdue sweep: OPEN tasks by deadline (tasks/deadlines.py)
+            models.Index(
+                fields=['deadline', 'id'],
+                condition=models.Q(status='OPEN', deadline__isnull=False),
+                name='tasks_open_deadline_idx',
+            ),
+            models.Index(fields=['applications_count', 'id']),
             models.Index(fields=['category', 'status']),
             models.Index(fields=['client']),
             models.Index(fields=['assigned_to']),
             models.Index(fields=['city']),
+            # GIN indexes on search_vector and title (pg_trgm) are created in
+            # migration 0007 on PostgreSQL only
         ]
     
+    # Maintained with UPDATE ... SET x = x + n (tasks/counters.py,
+    # tasks/application_counts.py); a full save() of a stale instance
+    # must not write them back
+    COUNTER_FIELDS = frozenset([
+        'views_count', 'applications_count', 'pending_applications_count',
+        'accepted_applications_count', 'rejected_applications_count',
+        'withdrawn_applications_count',
+    ])
+
     def __str__(self):
         return f"{self.title} - {self.client.username}"
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not args and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.name != 'minhash'
+                and field.attname not in deferred
+            ]
+
+        update_fields = kwargs.get('update_fields')
+        rehash = self._signature_outdated(update_fields)
+        if rehash:
+            from .duplicates import signature_bytes
+            self.minhash = signature_bytes(self.title, self.description)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'minhash'}
+        super().save(*args, **kwargs)
+        if rehash:
+            self._signature_text = {'title': self.title, 'description': self.description}
+
+    def _signature_outdated(self, update_fields):
+        """
+        Whether minhash needs recomputing: a new task, or a save of a title
+        or description that differs from the loaded one (remembered by
+        tasks/signals.py; a field that wasn't loaded counts as changed)
+        """
+        if self._state.adding:
+            return True
+        saved = {'title', 'description'}
+        if update_fields is not None:
+            saved &= set(update_fields)
+        loaded = getattr(self, '_signature_text', {})
+        return any(name not in loaded or loaded[name] != getattr(self, name) for name in saved)
     
     @property
     def is_open(self):
@@ -238,6 +313,7 @@ class TaskApplication(models.Model):
         indexes = [
             models.Index(fields=['task', 'status']),
             models.Index(fields=['freelancer', 'status']),
+            models.Index(fields=['freelancer', '-created_at', '-id']),
             models.Index(fields=['status', '-created_at']),
         ]
     
@@ -317,7 +393,8 @@ class Review(models.Model):
         ordering = ['-created_at']
         unique_together = ['task', 'reviewer']  # One review per person per task
         indexes = [
-            models.Index(fields=['reviewee', '-created_at']),
+            models.Index(fields=['reviewee', '-created_at', '-id']),
+            models.Index(fields=['reviewee', 'rating', 'id']),
             models.Index(fields=['rating']),
             models.Index(fields=['task']),
         ]
@@ -336,6 +413,8 @@ class TaskImage(models.Model):
         related_name='images'
     )
     image = models.ImageField(upload_to='task_images/')
+    # Storage names of the thumb/preview renditions (utils/images.py)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True, null=True)
     order = models.IntegerField(default=0)
 
@@ -376,7 +455,7 @@ class SavedTask(models.Model):
         ordering = ['-created_at']
         unique_together = ['user', 'task']  # Can only save once
         indexes = [
-            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),
         ]
 
     def __str__(self):
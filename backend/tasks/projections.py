@@ -0,0 +1,244 @@
+"""
+Projection-based task list payloads
+===================================
+
+TaskListProjection builds the same rows as TaskListSerializer from a
+.values() projection: no model instances and no serializer fields per
+row. Skills come from one query on the task/skill through table and the
+viewer fields from ViewerState (tasks/viewer_state.py), as in the
+serializer.
+
+Column conversions (decimals, datetimes) reuse one DRF field per column,
+so the output matches the serializer's formatting exactly.
+
+?fields=id,title,budget limits the row to those fields (sparse
+fieldsets); only the columns they need are selected.
+
+TASK_LIST_PROJECTION = False in settings switches the list views back to
+TaskListSerializer. `python manage.py benchmark_task_list` compares the two.
+"""
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import models
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from accounts.serializers import UserSummarySerializer
+from utils.images import rendition_name
+
+from .models import Task
+from .serializers import CategorySummarySerializer, TaskListSerializer
+from .viewer_state import ViewerState
+
+FIELDS_QUERY_PARAM = 'fields'
+
+LIST_FIELDS = tuple(TaskListSerializer.Meta.fields)
+VIEWER_FIELDS = ('is_applied', 'is_saved', 'can_apply')
+CLIENT_FIELDS = tuple(UserSummarySerializer.Meta.fields)
+CATEGORY_FIELDS = tuple(CategorySummarySerializer.Meta.fields)
+
+# What ViewerState needs from a task
+_TaskRef = namedtuple('_TaskRef', ['id', 'client_id', 'status'])
+
+
+def parse_fields(request):
+    """Requested fields in serializer order, or None for all"""
+    raw = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not raw:
+        return None
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = sorted(requested - set(LIST_FIELDS))
+    if unknown:
+        raise ValidationError({FIELDS_QUERY_PARAM: f'Unknown fields: {", ".join(unknown)}.'})
+    return [name for name in LIST_FIELDS if name in requested]
+
+
+def _converter(model_field):
+    """to_representation for columns whose JSON form differs from the Python value"""
+    if isinstance(model_field, models.DecimalField):
+        return serializers.DecimalField(
+            max_digits=model_field.max_digits, decimal_places=model_field.decimal_places
+        ).to_representation
+    if isinstance(model_field, models.DateTimeField):
+        return serializers.DateTimeField().to_representation
+    if isinstance(model_field, models.DateField):
+        return serializers.DateField().to_representation
+    return None
+
+
+def _columns(model, names, prefix=''):
+    """[(output name, values() key, converter)] for plain model columns"""
+    columns = []
+    for name in names:
+        field = model._meta.get_field(name)
+        columns.append((name, f'{prefix}{field.attname}', _converter(field)))
+    return columns
+
+
+class TaskListProjection:
+    """
+    projection = TaskListProjection(request, fields)
+    rows = projection.project(queryset)   # .values() queryset, paginate it
+    data = projection.render(page)
+    """
+
+    def __init__(self, request, fields=None):
+        from accounts.models import User
+        from .models import Category
+
+        self.request = request
+        self.fields = list(fields or LIST_FIELDS)
+        wanted = set(self.fields)
+
+        # Plain task columns: everything except nested and computed fields
+        self.task_columns = _columns(Task, [
+            name for name in self.fields
+            if name not in ('client', 'category', 'required_skills') + VIEWER_FIELDS
+        ])
+        self.client_columns = _columns(
+            User, [name for name in CLIENT_FIELDS if name not in ('full_name', 'profile_picture')], 'client__'
+        ) if 'client' in wanted else []
+        self.category_columns = _columns(
+            Category, CATEGORY_FIELDS, 'category__'
+        ) if 'category' in wanted else []
+
+        self.picture_storage = User._meta.get_field('profile_picture').storage
+        self.with_skills = 'required_skills' in wanted
+        self.viewer_fields = [name for name in VIEWER_FIELDS if name in wanted]
+
+    def project(self, queryset):
+        """The queryset as a .values() projection of the needed columns"""
+        keys = {'id'}
+        keys.update(key for _, key, _ in self.task_columns)
+        if self.client_columns:
+            keys.update(key for _, key, _ in self.client_columns)
+            keys.update([
+                'client__first_name', 'client__last_name',
+                'client__profile_picture', 'client__profile_picture_renditions',
+            ])
+        if self.category_columns:
+            keys.update(key for _, key, _ in self.category_columns)
+        if self.viewer_fields:
+            keys.update(['client_id', 'status'])
+
+        # Keep the sort columns: keyset pagination builds cursors from them
+        for term in queryset.query.order_by:
+            if isinstance(term, str) and '__' not in term and not term.startswith('?'):
+                name = term.lstrip('-')
+                if name in queryset.query.annotations:
+                    keys.add(name)
+                elif name != 'pk':
+                    keys.add(Task._meta.get_field(name).attname)
+
+        return queryset.prefetch_related(None).values(*sorted(keys))
+
+    def render(self, rows):
+        """Serialized rows for a page of project() results"""
+        rows = list(rows)
+        skills = self.skills_by_task(rows) if self.with_skills else None
+        state = None
+        if self.viewer_fields:
+            state = ViewerState(self.request.user, [
+                _TaskRef(row['id'], row['client_id'], row['status']) for row in rows
+            ])
+
+        columns = {name: (key, convert) for name, key, convert in self.task_columns}
+        data = []
+        for row in rows:
+            item = {}
+            for name in self.fields:
+                if name in columns:
+                    key, convert = columns[name]
+                    value = row[key]
+                    item[name] = convert(value) if convert is not None and value is not None else value
+                elif name == 'client':
+                    item[name] = self.render_client(row)
+                elif name == 'category':
+                    item[name] = self.render_nested(row, self.category_columns, 'category__id')
+                elif name == 'required_skills':
+                    item[name] = skills.get(row['id'], [])
+                else:
+                    ref = _TaskRef(row['id'], row['client_id'], row['status'])
+                    item[name] = getattr(state, name)(ref)
+            data.append(item)
+        return data
+
+    def render_nested(self, row, columns, id_key):
+        if row[id_key] is None:
+            return None
+        nested = {}
+        for name, key, convert in columns:
+            value = row[key]
+            nested[name] = convert(value) if convert is not None and value is not None else value
+        return nested
+
+    def render_client(self, row):
+        client = self.render_nested(row, self.client_columns, 'client__id')
+        if client is None:
+            return None
+        # Same as User.get_full_name()
+        full_name = f"{row['client__first_name']} {row['client__last_name']}".strip()
+        client['full_name'] = full_name or row['client__username']
+        picture = row['client__profile_picture']
+        if picture:
+            # The thumbnail rendition, as in UserSummarySerializer
+            url = self.picture_storage.url(
+                rendition_name(picture, row['client__profile_picture_renditions'], 'thumb')
+            )
+            client['profile_picture'] = self.request.build_absolute_uri(url) if self.request else url
+        else:
+            client['profile_picture'] = None
+        return {name: client[name] for name in CLIENT_FIELDS}
+
+    def skills_by_task(self, rows):
+        """{task_id: [skill dict]} for the page, in Skill's default order"""
+        from recommendations.models import Skill
+        from recommendations.serializers import SkillSerializer
+
+        task_ids = [row['id'] for row in rows]
+        if not task_ids:
+            return {}
+
+        names = SkillSerializer.Meta.fields
+        columns = _columns(Skill, names, 'skill__')
+        ordering = [
+            f'-skill__{term[1:]}' if term.startswith('-') else f'skill__{term}'
+            for term in Skill._meta.ordering
+        ]
+        links = Task.required_skills.through.objects.filter(
+            task_id__in=task_ids
+        ).order_by(*ordering).values_list('task_id', *(key for _, key, _ in columns))
+
+        skills = defaultdict(list)
+        for task_id, *values in links:
+            skills[task_id].append({
+                name: convert(value) if convert is not None and value is not None else value
+                for (name, _, convert), value in zip(columns, values)
+            })
+        return skills
+
+
+class TaskListProjectionMixin:
+    """
+    List views of TaskListSerializer rows: serve the page from a
+    TaskListProjection, with ?fields= sparse fieldsets
+    """
+
+    def list(self, request, *args, **kwargs):
+        fields = parse_fields(request)
+        if not getattr(settings, 'TASK_LIST_PROJECTION', True):
+            response = super().list(request, *args, **kwargs)
+            if fields is not None:
+                rows = response.data['results'] if 'results' in response.data else response.data
+                rows[:] = [{name: row[name] for name in fields} for row in rows]
+            return response
+
+        projection = TaskListProjection(request, fields)
+        queryset = projection.project(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.render(page))
+        return Response(projection.render(queryset))
@@ -0,0 +1,111 @@
+"""
+User rating aggregates
+======================
+
+User.rating_sum and User.total_reviews hold the sum and count of a user's
+public review ratings, so a new review updates average_rating with one
+UPDATE ... SET x = x + n instead of aggregating every review.
+
+`python manage.py repair_user_ratings` recomputes all three fields from
+the reviews.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    Case, Count, DecimalField, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Round
+from django.db.models.lookups import GreaterThan
+
+from utils.http_cache import bump_versions
+
+from .models import Review
+
+RATING_FIELD = DecimalField(max_digits=3, decimal_places=2)
+
+
+def average_expression(rating_sum, count):
+    """rating_sum / count rounded to 2 places, 0 without reviews"""
+    # Float division (SQLite would divide NUMERIC integers as integers), then
+    # numeric again for round(numeric, int) on PostgreSQL
+    average = Cast(
+        Cast(rating_sum, FloatField()) / count,
+        DecimalField(max_digits=12, decimal_places=6)
+    )
+    return Case(
+        When(GreaterThan(count, 0), then=Round(average, 2, output_field=RATING_FIELD)),
+        default=Value(Decimal('0.00')),
+        output_field=RATING_FIELD,
+    )
+
+
+def apply_review_rating(review):
+    """
+    Add a new public review to its reviewee's aggregates
+
+    Call inside the transaction that inserts the review. The SET
+    expressions all read the row's old values, so the average matches the
+    new sum and count.
+    """
+    if not review.is_public:
+        return
+
+    User = get_user_model()
+    User.objects.filter(pk=review.reviewee_id).update(
+        rating_sum=F('rating_sum') + review.rating,
+        total_reviews=F('total_reviews') + 1,
+        average_rating=average_expression(
+            F('rating_sum') + review.rating, F('total_reviews') + 1
+        ),
+    )
+    # update() skips signals - public profiles must still revalidate
+    bump_versions(['users', f'user:{review.reviewee_id}'])
+
+
+def repair_user_ratings(user_ids=None):
+    """
+    Recompute rating_sum, total_reviews and average_rating from reviews
+
+    Returns the number of users whose stored values were wrong.
+    """
+    User = get_user_model()
+    public_reviews = Review.objects.filter(
+        reviewee=OuterRef('pk'), is_public=True
+    ).order_by().values('reviewee')
+    actual_sum = Coalesce(
+        Subquery(public_reviews.annotate(total=Sum('rating')).values('total')),
+        0, output_field=IntegerField()
+    )
+    actual_count = Coalesce(
+        Subquery(public_reviews.annotate(total=Count('id')).values('total')),
+        0, output_field=IntegerField()
+    )
+
+    users = User.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=list(user_ids))
+
+    drifted = users.annotate(
+        actual_sum=actual_sum,
+        actual_count=actual_count,
+    ).annotate(
+        actual_average=average_expression(F('actual_sum'), F('actual_count'))
+    ).exclude(
+        rating_sum=F('actual_sum'),
+        total_reviews=F('actual_count'),
+        average_rating=F('actual_average'),
+    )
+    drifted_ids = list(drifted.values_list('pk', flat=True))
+    if not drifted_ids:
+        return 0
+
+    User.objects.filter(pk__in=drifted_ids).update(
+        rating_sum=actual_sum,
+        total_reviews=actual_count,
+    )
+    User.objects.filter(pk__in=drifted_ids).update(
+        average_rating=average_expression(F('rating_sum'), F('total_reviews'))
+    )
+    bump_versions(['users', *(f'user:{user_id}' for user_id in drifted_ids)])
+    return len(drifted_ids)
@@ -0,0 +1,313 @@
+"""
+Task search backend
+===================
+
+PostgreSQL: tasks.search_vector is a weighted tsvector (title A, description
+B, location C) kept current by signals and indexed with GIN. Queries use
+websearch_to_tsquery syntax ("logo design", -wordpress, react OR vue), are
+ranked with ts_rank, and a pg_trgm word-similarity match on the title
+catches typos ("javscript").
+
+Other databases (SQLite test runs): an in-process inverted index with the
+same field weights and trigram-based fuzzy term matching.
+
+TaskSearchFilter / TaskOrderingFilter plug into TaskListView; searching
+annotates search_rank, and ?ordering=relevance (the default while
+searching) orders by it.
+
+filter_by_skills matches required skills with EXISTS subqueries on the
+task/skill link table instead of a join + DISTINCT over tasks.
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Q, Value, When
+from rest_framework import filters
+
+# Fields that feed the search vector, with their tsvector weights
+SEARCH_FIELD_WEIGHTS = {
+    'title': 'A',
+    'description': 'B',
+    'location': 'C',
+}
+
+# ts_rank's default weights for D, C, B, A - mirrored by the in-memory index
+_WEIGHT_VALUES = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+TRIGRAM_THRESHOLD = 0.3
+
+
+def get_search_config():
+    return getattr(settings, 'TASK_SEARCH_CONFIG', 'english')
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def search_vector_expression():
+    """Weighted tsvector over the searchable task fields"""
+    from django.contrib.postgres.search import SearchVector
+
+    config = get_search_config()
+    vector = None
+    for field, weight in SEARCH_FIELD_WEIGHTS.items():
+        part = SearchVector(field, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(task_ids=None):
+    """
+    Recompute stored search vectors in one UPDATE (all tasks if task_ids is
+    None). On other databases this refreshes the in-memory index instead.
+    """
+    from .models import Task
+
+    if not uses_postgres_search():
+        memory_index.refresh(task_ids)
+        return
+
+    queryset = Task.objects.all()
+    if task_ids is not None:
+        queryset = queryset.filter(id__in=list(task_ids))
+    queryset.update(search_vector=search_vector_expression())
+
+
+def remove_from_index(task_id):
+    if not uses_postgres_search():
+        memory_index.remove(task_id)
+
+
+def search_tasks(queryset, search):
+    """Filter queryset to tasks matching search, annotated with search_rank"""
+    search = search.strip()
+    if not search:
+        return queryset
+
+    if uses_postgres_search():
+        return _postgres_search(queryset, search)
+    return _memory_search(queryset, search)
+
+
+def _postgres_search(queryset, search):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+
+    query = SearchQuery(search, search_type='websearch', config=get_search_config())
+    # Word similarity compares the query with the closest part of the title,
+    # so a typo still matches in a long title
+    return queryset.filter(
+        Q(search_vector=query) | Q(title__trigram_word_similar=search)
+    ).annotate(
+        search_rank=SearchRank(F('search_vector'), query) + TrigramWordSimilarity(search, 'title')
+    )
+
+
+def _memory_search(queryset, search):
+    scores = memory_index.search(search)
+    if not scores:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.filter(id__in=list(scores)).annotate(
+        search_rank=Case(
+            *[When(id=task_id, then=Value(score)) for task_id, score in scores.items()],
+            default=Value(0.0),
+            output_field=FloatField()
+        )
+    )
+
+
+def filter_by_skills(queryset, skill_ids, match='any'):
+    """
+    Tasks requiring any (or all) of skill_ids
+
+    Each condition is an EXISTS probe on the (task_id, skill_id) unique index
+    of the link table, so rows are never multiplied and no DISTINCT is needed.
+    """
+    from .models import Task
+
+    skill_ids = sorted(set(skill_ids))
+    if not skill_ids:
+        return queryset
+
+    links = Task.required_skills.through.objects.filter(task_id=OuterRef('pk'))
+    if match == 'all':
+        for skill_id in skill_ids:
+            queryset = queryset.filter(Exists(links.filter(skill_id=skill_id)))
+        return queryset
+    return queryset.filter(Exists(links.filter(skill_id__in=skill_ids)))
+
+
+# ==============================================================================
+# IN-MEMORY FALLBACK
+# ==============================================================================
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall((text or '').lower()) if len(token) > 1]
+
+
+def trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a, b):
+    """Same measure as pg_trgm's similarity()"""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+class InMemoryTaskIndex:
+    """
+    Inverted index over task text for databases without full-text search
+
+    Built lazily on first search and kept current by the task signals of
+    this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._postings = defaultdict(dict)   # term -> {task_id: weighted tf}
+        self._documents = {}                 # task_id -> set of terms
+
+    def reset(self):
+        with self._lock:
+            self._built = False
+            self._postings.clear()
+            self._documents.clear()
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            from .models import Task
+            for row in Task.objects.values('id', *SEARCH_FIELD_WEIGHTS).iterator():
+                self._add(row)
+            self._built = True
+
+    def _add(self, row):
+        task_id = row['id']
+        self._remove(task_id)
+        weights = defaultdict(float)
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for term in tokenize(row[field]):
+                weights[term] += _WEIGHT_VALUES[weight]
+        for term, weight in weights.items():
+            self._postings[term][task_id] = weight
+        self._documents[task_id] = set(weights)
+
+    def _remove(self, task_id):
+        for term in self._documents.pop(task_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(task_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def refresh(self, task_ids=None):
+        """Re-read tasks from the database (ignored until the index is built)"""
+        if not self._built:
+            return
+        from .models import Task
+        with self._lock:
+            if task_ids is None:
+                self._built = False
+                self._postings.clear()
+                self._documents.clear()
+                self._ensure_built()
+                return
+            task_ids = list(task_ids)
+            found = set()
+            for row in Task.objects.filter(id__in=task_ids).values('id', *SEARCH_FIELD_WEIGHTS):
+                self._add(row)
+                found.add(row['id'])
+            for task_id in set(task_ids) - found:
+                self._remove(task_id)
+
+    def remove(self, task_id):
+        if not self._built:
+            return
+        with self._lock:
+            self._remove(task_id)
+
+    def _matching_terms(self, term):
+        """The term itself, or indexed terms within trigram distance (typos)"""
+        if term in self._postings:
+            return [term]
+        return [
+            candidate for candidate in self._postings
+            if trigram_similarity(term, candidate) >= TRIGRAM_THRESHOLD
+        ]
+
+    def search(self, text):
+        """{task_id: score} for tasks matching every query term"""
+        self._ensure_built()
+        terms = tokenize(text)
+        if not terms:
+            return {}
+
+        with self._lock:
+            total = len(self._documents) or 1
+            scores = None
+            for term in terms:
+                term_scores = defaultdict(float)
+                for match in self._matching_terms(term):
+                    postings = self._postings[match]
+                    idf = math.log(1 + total / len(postings))
+                    for task_id, weight in postings.items():
+                        term_scores[task_id] = max(term_scores[task_id], weight * idf)
+                if scores is None:
+                    scores = dict(term_scores)
+                else:
+                    scores = {
+                        task_id: score + term_scores[task_id]
+                        for task_id, score in scores.items()
+                        if task_id in term_scores
+                    }
+                if not scores:
+                    return {}
+            return scores
+
+
+memory_index = InMemoryTaskIndex()
+
+
+# ==============================================================================
+# DRF FILTER BACKENDS
+# ==============================================================================
+
+class TaskSearchFilter(filters.SearchFilter):
+    """?search= backed by full-text search instead of icontains"""
+
+    def filter_queryset(self, request, queryset, view):
+        search = ' '.join(self.get_search_terms(request))
+        if not search:
+            return queryset
+        return search_tasks(queryset, search)
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """
+    Adds ?ordering=relevance - the default while searching - which orders
+    by search_rank with newest first on ties
+    """
+
+    relevance_ordering = ['-search_rank', '-created_at']
+
+    def get_ordering(self, request, queryset, view):
+        searching = 'search_rank' in queryset.query.annotations
+        param = request.query_params.get(self.ordering_param, '').strip()
+
+        if searching and param in ('', 'relevance'):
+            return self.relevance_ordering
+        return super().get_ordering(request, queryset, view)
@@ -8,7 +8,9 @@ from .models import (
     TaskImage,
     SavedTask
 )
-from accounts.serializers import PublicUserSerializer
+from accounts.serializers import PublicUserSerializer, UserSummarySerializer
+from utils.images import ImageRenditionField
+from .viewer_state import get_viewer_state
 
 User = get_user_model()
 
@@ -26,23 +28,67 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_tasks_count(self, obj):
-        return obj.tasks.filter(status='OPEN').count()
+        """Open tasks, from one grouped count shared by the whole response"""
+        counts = self.context.get('open_task_counts')
+        if counts is None:
+            from .categories import open_task_counts
+            counts = self.context['open_task_counts'] = open_task_counts()
+        return counts.get(obj.id, 0)
+
+
+class CategorySummarySerializer(serializers.ModelSerializer):
+    """Category fields shown on task list rows"""
+
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'slug', 'icon']
+        read_only_fields = fields
 
 
 class TaskImageSerializer(serializers.ModelSerializer):
     """Serializer for task images"""
-    
+    thumbnail = ImageRenditionField('image', 'thumb')
+    preview = ImageRenditionField('image', 'preview')
+
     class Meta:
         model = TaskImage
-        fields = ['id', 'image', 'caption', 'order', 'uploaded_at']
+        fields = ['id', 'image', 'thumbnail', 'preview', 'caption', 'order', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
 
-class TaskListSerializer(serializers.ModelSerializer):
-    """Serializer for task list view (minimal data)"""
-    client = PublicUserSerializer(read_only=True)
-    category = CategorySerializer(read_only=True)
+class ViewerStateMixin:
+    """
+    is_applied / is_saved / can_apply for the current user, loaded for all
+    tasks of the response at once (see tasks/viewer_state.py)
+    """
+
+    def get_is_applied(self, obj):
+        """Check if current user already applied"""
+        return get_viewer_state(self, obj).is_applied(obj)
+
+    def get_is_saved(self, obj):
+        """Check if current user saved the task"""
+        return get_viewer_state(self, obj).is_saved(obj)
+
+    def get_can_apply(self, obj):
+        """Check if current user can apply"""
+        return get_viewer_state(self, obj).can_apply(obj)
+
+
+class TaskListSerializer(ViewerStateMixin, serializers.ModelSerializer):
+    """
+    Serializer for task list view (minimal data)
+
+    client and category are summaries built from select_related rows and
+    required_skills reads a prefetch, so a page costs a fixed number of
+    queries. TaskDetailSerializer has the full client profile.
+    """
+    client = UserSummarySerializer(read_only=True)
+    category = CategorySummarySerializer(read_only=True)
     required_skills = serializers.SerializerMethodField()
+    is_applied = serializers.SerializerMethodField()
+    is_saved = serializers.SerializerMethodField()
+    can_apply = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
@@ -50,7 +96,8 @@ class TaskListSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'client', 'category',
             'task_type', 'listing_type', 'budget', 'is_negotiable', 'location', 'city',
             'is_remote', 'deadline', 'status', 'views_count',
-            'applications_count', 'required_skills', 'created_at'
+            'applications_count', 'required_skills', 'is_applied', 'is_saved',
+            'can_apply', 'created_at'
         ]
         read_only_fields = fields
 
@@ -64,13 +111,16 @@ class TaskListSerializer(serializers.ModelSerializer):
             return []
 
 
-class TaskDetailSerializer(serializers.ModelSerializer):
+class TaskDetailSerializer(ViewerStateMixin, serializers.ModelSerializer):
     """Serializer for task detail view (full data)"""
     client = PublicUserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     assigned_to = PublicUserSerializer(read_only=True)
     images = TaskImageSerializer(many=True, read_only=True)
+    image_thumbnail = ImageRenditionField('image', 'thumb')
+    image_preview = ImageRenditionField('image', 'preview')
     is_applied = serializers.SerializerMethodField()
+    is_saved = serializers.SerializerMethodField()
     can_apply = serializers.SerializerMethodField()
     required_skills = serializers.SerializerMethodField()
     escrow = serializers.SerializerMethodField()
@@ -81,8 +131,9 @@ class TaskDetailSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'client', 'category',
             'task_type', 'listing_type', 'budget', 'is_negotiable', 'location', 'city',
             'is_remote', 'deadline', 'estimated_duration', 'status',
-            'assigned_to', 'image', 'images', 'views_count',
-            'applications_count', 'required_skills', 'is_applied', 'can_apply',
+            'assigned_to', 'image', 'image_thumbnail', 'image_preview', 'images', 'views_count',
+            'applications_count', 'pending_applications_count', 'accepted_applications_count',
+            'rejected_applications_count', 'withdrawn_applications_count', 'required_skills', 'is_applied', 'is_saved', 'can_apply',
             'requires_payment', 'payment_status', 'final_amount', 'escrow',
             'created_at', 'updated_at', 'completed_at'
         ]
@@ -97,56 +148,31 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         except:
             return []
     
-    def get_is_applied(self, obj):
-        """Check if current user already applied"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return TaskApplication.objects.filter(
-                task=obj,
-                freelancer=request.user
-            ).exists()
-        return False
-    
-    def get_can_apply(self, obj):
-        """Check if current user can apply"""
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return False
-        
-        user = request.user
-        
-        # Can't apply to own task
-        if obj.client == user:
-            return False
-        
-        # Must be freelancer
-        if not user.is_freelancer:
-            return False
-        
-        # Task must be open
-        if obj.status != 'OPEN':
-            return False
-        
-        # Already applied
-        if self.get_is_applied(obj):
-            return False
-
-        return True
-
     def get_escrow(self, obj):
         """Get escrow details if exists"""
         try:
-            if hasattr(obj, 'escrow'):
+            escrow = get_viewer_state(self, obj).escrow(obj)
+            if escrow is not None:
                 from payments.serializers import EscrowSerializer
-                return EscrowSerializer(obj.escrow).data
+                return EscrowSerializer(escrow).data
         except:
             pass
         return None
 
 
 class TaskCreateUpdateSerializer(serializers.ModelSerializer):
-    """Serializer for creating/updating tasks"""
+    """
+    Serializer for creating/updating tasks
+
+    A task that looks like a repost of one of the client's open tasks
+    (tasks/duplicates.py) is rejected with `duplicate_of` unless
+    allow_duplicate is true.
+    """
     images = TaskImageSerializer(many=True, required=False)
+    allow_duplicate = serializers.BooleanField(
+        write_only=True, required=False, default=False,
+        help_text="Post even if it looks like one of your open tasks"
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -165,7 +191,7 @@ class TaskCreateUpdateSerializer(serializers.ModelSerializer):
             'title', 'description', 'category', 'task_type',
             'budget', 'is_negotiable', 'location', 'city',
             'is_remote', 'deadline', 'estimated_duration', 'image', 'images',
-            'required_skills'
+            'required_skills', 'allow_duplicate'
         ]
     
     def validate_budget(self, value):
@@ -191,8 +217,44 @@ class TaskCreateUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({
                 'location': 'Location is required for physical tasks'
             })
-        
+
+        if not attrs.pop('allow_duplicate', False):
+            self.check_duplicates(attrs)
+
         return attrs
+
+    def check_duplicates(self, attrs):
+        """Reject near-copies of the client's other open tasks"""
+        from .duplicates import find_client_duplicates
+
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            client_id = request.user.id
+        else:
+            # Bulk rows (tasks/bulk.py) have no request, only the importing client
+            client_id = self.context.get('client_id')
+        if client_id is None:
+            return
+        if self.instance is not None and not {'title', 'description'} & set(attrs):
+            return
+
+        if self.instance is not None:
+            client_id = self.instance.client_id
+        title = attrs.get('title', getattr(self.instance, 'title', ''))
+        description = attrs.get('description', getattr(self.instance, 'description', ''))
+        duplicates = find_client_duplicates(
+            client_id, title, description,
+            exclude_id=self.instance.pk if self.instance is not None else None
+        )
+        if duplicates:
+            listed = ', '.join(f'#{task_id} "{task_title}"' for task_id, task_title, _ in duplicates[:3])
+            raise serializers.ValidationError({
+                'duplicate_of': [task_id for task_id, _, _ in duplicates],
+                'non_field_errors': [
+                    f'This looks like your open task {listed}. '
+                    'Edit that task, or send allow_duplicate=true to post it anyway.'
+                ],
+            })
     
     def create(self, validated_data):
         """Create task with client from request"""
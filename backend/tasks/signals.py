@@ -0,0 +1,238 @@
+"""
+Signals for keeping task search data, cached statistics, application
+counters, applicant rankings and HTTP cache versions current
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from payments.models import Escrow
+from recommendations.similar import similar_task_index
+from utils.http_cache import track_m2m_versions, track_versions
+from utils.images import track_renditions
+
+from .applicant_fit import invalidate_applicant_ranking
+from .application_counts import (
+    STATUS_COUNT_FIELDS, apply_application_deltas, record_application_created, record_application_deleted
+)
+from .models import Category, SavedTask, Task, TaskApplication, TaskImage
+from .search import SEARCH_FIELD_WEIGHTS, remove_from_index, update_search_vectors
+from .statistics import adjust_counters, invalidate_platform_statistics, task_counter_deltas
+from .trending import record_task_event
+
+logger = logging.getLogger('tasks')
+
+
+@receiver(post_save, sender=Task)
+def update_search_vector_on_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Recompute the task's search vector when its searchable text changes
+
+    Saves limited to other fields (view counter, status changes) are skipped.
+    """
+    if update_fields is not None and not set(SEARCH_FIELD_WEIGHTS).intersection(update_fields):
+        return
+
+    try:
+        update_search_vectors([instance.id])
+    except Exception as e:
+        logger.warning(f"Error updating search vector for task {instance.id}: {e}")
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_from_search_index(sender, instance, **kwargs):
+    """
+    Drop a deleted task from the in-memory index (non-PostgreSQL only)
+    """
+    try:
+        remove_from_index(instance.id)
+    except Exception as e:
+        logger.warning(f"Error removing task {instance.id} from search index: {e}")
+
+
+# ==============================================================================
+# STATISTICS COUNTERS
+# ==============================================================================
+
+@receiver(post_init, sender=Task)
+def remember_task_statistics_fields(sender, instance, **kwargs):
+    """
+    Remember the loaded status and budget so a save can adjust the counters
+
+    Skipped for instances loaded without those fields (.only()/.defer()).
+    """
+    deferred = instance.get_deferred_fields()
+    if 'status' in deferred or 'budget' in deferred:
+        instance._statistics_state = None
+    else:
+        instance._statistics_state = (instance.status, instance.budget)
+
+
+@receiver(post_save, sender=Task)
+def update_statistics_on_task_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_statistics_state', None)
+    current = (instance.status, instance.budget)
+
+    if created:
+        adjust_counters(task_counter_deltas(*current))
+    elif previous is not None and previous != current:
+        deltas = task_counter_deltas(*previous, sign=-1)
+        for name, delta in task_counter_deltas(*current).items():
+            deltas[name] = deltas.get(name, 0) + delta
+        adjust_counters(deltas)
+
+    instance._statistics_state = current
+
+
+@receiver(post_delete, sender=Task)
+def update_statistics_on_task_delete(sender, instance, **kwargs):
+    adjust_counters(task_counter_deltas(instance.status, instance.budget, sign=-1))
+
+
+@receiver(post_save, sender=TaskApplication)
+def update_statistics_on_application_save(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters({'total_applications': 1})
+
+
+@receiver(post_delete, sender=TaskApplication)
+def update_statistics_on_application_delete(sender, instance, **kwargs):
+    adjust_counters({'total_applications': -1})
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_statistics_on_category_change(sender, instance, **kwargs):
+    """Categories change rarely - rebuild the snapshot on the next read"""
+    try:
+        invalidate_platform_statistics()
+    except Exception as e:
+        logger.warning(f"Error invalidating task statistics: {e}")
+
+
+# ==============================================================================
+# APPLICATION COUNTERS (tasks/application_counts.py)
+# ==============================================================================
+
+@receiver(post_init, sender=TaskApplication)
+def remember_application_status(sender, instance, **kwargs):
+    """Remember the loaded status so a save() that changes it moves the counts"""
+    if 'status' in instance.get_deferred_fields():
+        instance._counted_status = None
+    else:
+        instance._counted_status = instance.status
+
+
+@receiver(post_save, sender=TaskApplication)
+def update_application_counts_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_counted_status', None)
+    if created:
+        record_application_created(instance)
+    elif previous is not None and previous != instance.status:
+        # Views use set_application_status(), which locks the rows; this
+        # covers saves from elsewhere (admin, shell)
+        apply_application_deltas(instance.task_id, {
+            STATUS_COUNT_FIELDS[previous]: -1,
+            STATUS_COUNT_FIELDS[instance.status]: 1,
+        })
+    instance._counted_status = instance.status
+
+
+@receiver(post_delete, sender=TaskApplication)
+def update_application_counts_on_delete(sender, instance, **kwargs):
+    record_application_deleted(instance)
+
+
+# ==============================================================================
+# DUPLICATE SIGNATURES (tasks/duplicates.py)
+# ==============================================================================
+
+@receiver(post_init, sender=Task)
+def remember_task_signature_text(sender, instance, **kwargs):
+    """
+    Remember the loaded title and description so save() only recomputes
+    the MinHash signature when they change (tasks/duplicates.py)
+    """
+    deferred = instance.get_deferred_fields()
+    instance._signature_text = {
+        name: getattr(instance, name) for name in ('title', 'description') if name not in deferred
+    }
+
+
+# ==============================================================================
+# APPLICANT RANKING (tasks/applicant_fit.py)
+# ==============================================================================
+
+@receiver(post_save, sender=TaskApplication)
+@receiver(post_delete, sender=TaskApplication)
+def invalidate_applicant_ranking_on_change(sender, instance, **kwargs):
+    task_id = instance.task_id
+    transaction.on_commit(lambda: invalidate_applicant_ranking(task_id))
+
+
+# ==============================================================================
+# TRENDING (tasks/trending.py)
+# ==============================================================================
+
+@receiver(post_save, sender=SavedTask)
+def record_trending_save(sender, instance, created, **kwargs):
+    if created:
+        record_task_event(instance.task_id, 'save')
+
+
+@receiver(post_save, sender=TaskApplication)
+def record_trending_application(sender, instance, created, **kwargs):
+    if created:
+        record_task_event(instance.task_id, 'application')
+
+
+# ==============================================================================
+# SIMILAR TASKS (recommendations/similar.py)
+# ==============================================================================
+
+@receiver(post_save, sender=Task)
+def remove_closed_task_from_similar_index(sender, instance, **kwargs):
+    # Other processes pick the change up at their next sync
+    if instance.status != 'OPEN':
+        task_id = instance.pk
+        transaction.on_commit(lambda: similar_task_index.remove(task_id))
+
+
+@receiver(post_delete, sender=Task)
+def remove_deleted_task_from_similar_index(sender, instance, **kwargs):
+    task_id = instance.pk
+    transaction.on_commit(lambda: similar_task_index.remove(task_id))
+
+
+# ==============================================================================
+# HTTP CACHE VERSIONS (utils/http_cache.py)
+# ==============================================================================
+
+def _task_scopes(task, update_fields=None):
+    scopes = ['tasks', f'task:{task.id}', f'user:{task.client_id}']
+    if task.assigned_to_id:
+        scopes.append(f'user:{task.assigned_to_id}')
+    return scopes
+
+
+track_versions(Task, _task_scopes)
+track_versions(TaskImage, lambda image, update_fields: ['tasks', f'task:{image.task_id}'])
+track_versions(
+    TaskApplication,
+    lambda application, update_fields: [f'task:{application.task_id}', f'viewer:{application.freelancer_id}']
+)
+track_versions(SavedTask, lambda saved, update_fields: [f'viewer:{saved.user_id}'])
+track_versions(Category, lambda category, update_fields: ['categories'])
+track_versions(Escrow, lambda escrow, update_fields: [f'task:{escrow.task_id}'])
+track_m2m_versions(
+    Task.required_skills.through,
+    lambda instance: _task_scopes(instance) if isinstance(instance, Task) else ['tasks']
+)
+
+
+# ==============================================================================
+# IMAGE RENDITIONS (utils/images.py)
+# ==============================================================================
+
+track_renditions(Task, 'image', lambda task: [f'task:{task.id}'])
+track_renditions(TaskImage, 'image', lambda image: [f'task:{image.task_id}'])
@@ -0,0 +1,183 @@
+"""
+Platform and per-user task statistics
+=====================================
+
+Platform statistics are computed with conditional aggregation and cached
+as a snapshot: one cache key per counter. Task, application and category
+signals adjust the counters with cache.incr after each commit, so the
+landing page reads them without touching the database.
+
+Counters can drift (queryset.update(), races with a recompute), so the
+snapshot expires after TASK_STATS_RECOMPUTE_INTERVAL seconds and
+`python manage.py recompute_task_statistics` rebuilds it on demand.
+"""
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+logger = logging.getLogger('tasks')
+
+STATS_CACHE_PREFIX = 'task_stats:v1'
+
+# Task status -> counter
+STATUS_COUNTERS = {
+    'OPEN': 'open_tasks',
+    'IN_PROGRESS': 'in_progress_tasks',
+    'COMPLETED': 'completed_tasks',
+}
+
+# Budgets are summed in cents so the counter stays an integer for cache.incr
+COUNTERS = [
+    'total_tasks',
+    *STATUS_COUNTERS.values(),
+    'total_applications',
+    'categories_count',
+    'budget_cents_total',
+]
+
+
+def stat_cache_key(name):
+    return f'{STATS_CACHE_PREFIX}:{name}'
+
+
+def get_recompute_interval():
+    return getattr(settings, 'TASK_STATS_RECOMPUTE_INTERVAL', 3600)
+
+
+def to_cents(budget):
+    return int(Decimal(budget or 0) * 100)
+
+
+# ==============================================================================
+# PLATFORM STATISTICS
+# ==============================================================================
+
+def compute_platform_counters():
+    """Counters straight from the database"""
+    from .models import Category, Task, TaskApplication
+
+    counters = Task.objects.aggregate(
+        total_tasks=Count('id'),
+        open_tasks=Count('id', filter=Q(status='OPEN')),
+        in_progress_tasks=Count('id', filter=Q(status='IN_PROGRESS')),
+        completed_tasks=Count('id', filter=Q(status='COMPLETED')),
+        budget_total=Sum('budget'),
+    )
+    counters['budget_cents_total'] = to_cents(counters.pop('budget_total'))
+    counters['total_applications'] = TaskApplication.objects.count()
+    counters['categories_count'] = Category.objects.filter(is_active=True).count()
+    return counters
+
+
+def recompute_platform_statistics():
+    """Rebuild the cached snapshot; returns the counters"""
+    counters = compute_platform_counters()
+    cache.set_many(
+        {stat_cache_key(name): value for name, value in counters.items()},
+        timeout=get_recompute_interval()
+    )
+    return counters
+
+
+def invalidate_platform_statistics():
+    cache.delete_many([stat_cache_key(name) for name in COUNTERS])
+
+
+def get_platform_statistics():
+    """Statistics for the landing page, from the snapshot when it is complete"""
+    keys = {stat_cache_key(name): name for name in COUNTERS}
+    try:
+        cached = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Error reading task statistics cache: {e}")
+        cached = {}
+
+    if len(cached) == len(keys):
+        counters = {keys[key]: value for key, value in cached.items()}
+    else:
+        counters = recompute_platform_statistics()
+
+    total_tasks = counters['total_tasks']
+    budget_total = Decimal(counters['budget_cents_total']) / 100
+    return {
+        'total_tasks': total_tasks,
+        'open_tasks': counters['open_tasks'],
+        'in_progress_tasks': counters['in_progress_tasks'],
+        'completed_tasks': counters['completed_tasks'],
+        'total_applications': counters['total_applications'],
+        'categories_count': counters['categories_count'],
+        'average_budget': (budget_total / total_tasks).quantize(Decimal('0.01')) if total_tasks else 0,
+    }
+
+
+def adjust_counters(deltas):
+    """
+    Apply {counter: delta} to the snapshot once the transaction commits
+
+    Missing keys are left alone: the next read recomputes the snapshot.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    def apply():
+        for name, delta in deltas.items():
+            try:
+                cache.incr(stat_cache_key(name), delta)
+            except ValueError:
+                # Snapshot expired or never built
+                pass
+            except Exception as e:
+                logger.warning(f"Error updating task statistic {name}: {e}")
+
+    transaction.on_commit(apply)
+
+
+def task_counter_deltas(status, budget, sign=1):
+    """Counter deltas for adding (sign=1) or removing (sign=-1) a task"""
+    deltas = {
+        'total_tasks': sign,
+        'budget_cents_total': sign * to_cents(budget),
+    }
+    if status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[status]] = sign
+    return deltas
+
+
+# ==============================================================================
+# PER-USER STATISTICS
+# ==============================================================================
+
+def get_user_statistics(user):
+    """Task statistics for one user, with one conditional aggregation per table"""
+    from .models import Task, TaskApplication
+
+    posted = Q(client=user)
+    assigned = Q(assigned_to=user)
+    task_counts = Task.objects.filter(posted | assigned).aggregate(
+        posted_tasks=Count('id', filter=posted),
+        open_tasks=Count('id', filter=posted & Q(status='OPEN')),
+        in_progress_tasks=Count('id', filter=posted & Q(status='IN_PROGRESS')),
+        completed_tasks=Count('id', filter=posted & Q(status='COMPLETED')),
+        tasks_completed_as_freelancer=Count('id', filter=assigned & Q(status='COMPLETED')),
+    )
+    application_counts = TaskApplication.objects.filter(freelancer=user).aggregate(
+        applications_sent=Count('id'),
+        applications_accepted=Count('id', filter=Q(status='ACCEPTED')),
+        applications_pending=Count('id', filter=Q(status='PENDING')),
+    )
+
+    return {
+        'posted_tasks': task_counts['posted_tasks'],
+        'open_tasks': task_counts['open_tasks'],
+        'in_progress_tasks': task_counts['in_progress_tasks'],
+        'completed_tasks': task_counts['completed_tasks'],
+        'applications_sent': application_counts['applications_sent'],
+        'applications_accepted': application_counts['applications_accepted'],
+        'applications_pending': application_counts['applications_pending'],
+        'tasks_completed_as_freelancer': task_counts['tasks_completed_as_freelancer'],
+    }
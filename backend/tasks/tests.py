@@ -1,3 +1,121 @@
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from recommendations.models import Skill
+
+from .models import Category, Review, Task
+from .ratings import apply_review_rating
+
+User = get_user_model()
+
+
+class TaskListQueryCountTests(TestCase):
+    """A task list page costs the same number of queries at any size"""
+
+    PAGE_SIZE = 12
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Design', slug='design')
+        cls.skills = [
+            Skill.objects.create(name=f'Skill {i}', slug=f'skill-{i}')
+            for i in range(3)
+        ]
+        cls.freelancer = User.objects.create(
+            username='freelancer', email='freelancer@example.com', user_type='freelancer'
+        )
+
+    def setUp(self):
+        # Anonymous pages are cached server-side (utils/http_cache.py)
+        cache.clear()
+
+    def create_tasks(self, count):
+        start = Task.objects.count()
+        for i in range(start, start + count):
+            # A different client per row, as on a real browse page
+            client = User.objects.create(
+                username=f'client{i}', email=f'client{i}@example.com', user_type='client'
+            )
+            task = Task.objects.create(
+                client=client, category=self.category, title=f'Task {i}',
+                description='Task description', task_type='DIGITAL', budget=50
+            )
+            task.required_skills.set(self.skills)
+
+    def get_page(self, client):
+        response = client.get('/api/tasks/', {'page_size': self.PAGE_SIZE}, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_anonymous_page_query_count_is_constant(self):
+        self.create_tasks(2)
+        # COUNT, the page, the required_skills prefetch
+        with self.assertNumQueries(3):
+            self.get_page(APIClient())
+
+        self.create_tasks(self.PAGE_SIZE)
+        cache.clear()
+        with self.assertNumQueries(3):
+            response = self.get_page(APIClient())
+        self.assertEqual(len(response.data['results']), self.PAGE_SIZE)
+
+    def test_authenticated_page_query_count_is_constant(self):
+        self.create_tasks(self.PAGE_SIZE)
+        api = APIClient()
+        api.force_authenticate(self.freelancer)
+        # ...plus the viewer's applications and saved tasks for the page
+        with self.assertNumQueries(5):
+            response = self.get_page(api)
+
+        row = response.data['results'][0]
+        self.assertEqual(
+            set(row['client']),
+            {'id', 'username', 'first_name', 'last_name', 'full_name', 'profile_picture',
+             'city', 'country', 'average_rating', 'total_reviews', 'is_verified', 'user_type'}
+        )
+        self.assertEqual(set(row['category']), {'id', 'name', 'slug', 'icon'})
+        self.assertEqual(len(row['required_skills']), 3)
+        self.assertTrue(row['can_apply'])
+
+
+class UserRatingAggregateTests(TestCase):
+    """A new review updates rating aggregates rebuilt from the public reviews"""
+
+    def setUp(self):
+        self.client_user = User.objects.create(
+            username='client', email='client@example.com', user_type='client'
+        )
+        # As loaded from users.json: counts without matching reviews
+        self.freelancer = User.objects.create(
+            username='freelancer', email='freelancer@example.com', user_type='freelancer',
+            total_reviews=78, average_rating=Decimal('4.50')
+        )
+        self.task = Task.objects.create(
+            client=self.client_user, assigned_to=self.freelancer, title='Logo',
+            description='Design a logo', task_type='DIGITAL', budget=50, status='COMPLETED'
+        )
+
+    def assert_ratings(self, rating_sum, total_reviews, average_rating):
+        self.freelancer.refresh_from_db()
+        self.assertEqual(
+            (self.freelancer.rating_sum, self.freelancer.total_reviews, self.freelancer.average_rating),
+            (rating_sum, total_reviews, Decimal(average_rating))
+        )
+
+    def test_review_after_backfill_of_loaded_counts(self):
+        migration = import_module('tasks.migrations.0009_backfill_user_rating_sum')
+        migration.backfill_user_ratings(apps, None)
+        self.assert_ratings(0, 0, '0.00')
 
-# Create your tests here.
+        review = Review.objects.create(
+            task=self.task, reviewer=self.client_user, reviewee=self.freelancer,
+            rating=5, comment='Great work'
+        )
+        apply_review_rating(review)
+        self.assert_ratings(5, 1, '5.00')
@@ -0,0 +1,292 @@
+"""
+Trending tasks
+==============
+
+views_count and applications_count are lifetime totals; trending scores
+count recent activity. Each view, save or application adds its weight to
+the task's score, decaying by half every TRENDING_HALF_LIFE_HOURS.
+
+Scores use forward decay: an event at time t adds
+weight * 2 ** ((t - landmark) / half_life), so newer events add more and
+stored scores never have to be decayed one by one - the ranking is
+already the decayed ranking. The landmark moves once per generation
+(GENERATION_SECONDS): the first process to see a new generation copies
+the previous one into it scaled down by 2 ** (-generation / half_life)
+(one ZUNIONSTORE per scope) and drops scores that have decayed to
+nothing, so the numbers stay small.
+
+Scores are kept in Redis sorted sets, one per scope - all open tasks,
+per city, per category, per city and category - so the top k of a scope
+is one ZREVRANGE, O(log n + k). While Redis is unreachable they are kept
+in process (per process, lost on restart) and ranked with a heap.
+
+trending_scores() feeds the same scores into cold-start recommendations
+as a popularity signal.
+"""
+import heapq
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from utils.redis_client import get_redis, mark_redis_down
+
+logger = logging.getLogger('tasks')
+
+KEY_PREFIX = 'trending'
+
+EVENT_WEIGHTS = {
+    'view': 1,
+    'save': 3,
+    'application': 5,
+}
+
+GENERATION_SECONDS = 60 * 60 * 24
+
+# Scores below this (in events "now") are dropped at a generation change
+MIN_SCORE = 0.05
+
+ALL_SCOPE = 'all'
+
+
+def get_half_life_seconds():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 6) * 3600
+
+
+def generation(now=None):
+    return int((now if now is not None else time.time()) // GENERATION_SECONDS)
+
+
+def _growth(now, gen):
+    """2 ** ((now - landmark) / half_life) for the generation's landmark"""
+    return 2 ** ((now - gen * GENERATION_SECONDS) / get_half_life_seconds())
+
+
+def scope_name(city=None, category_id=None):
+    """Scope of a trending list: all, city:<city>, category:<id> or both"""
+    parts = []
+    if city and city.strip():
+        parts.append(f'city:{city.strip().lower()}')
+    if category_id:
+        parts.append(f'category:{int(category_id)}')
+    return ':'.join(parts) or ALL_SCOPE
+
+
+def task_scopes(city, category_id):
+    """Every scope a task with this city and category is ranked in"""
+    scopes = {ALL_SCOPE, scope_name(city=city), scope_name(category_id=category_id),
+              scope_name(city=city, category_id=category_id)}
+    return sorted(scopes)
+
+
+def _key(gen, scope):
+    return f'{KEY_PREFIX}:g{gen}:{scope}'
+
+
+def _scopes_key(gen):
+    return f'{KEY_PREFIX}:g{gen}:scopes'
+
+
+# ==============================================================================
+# IN-PROCESS FALLBACK
+# ==============================================================================
+
+class _LocalScores:
+    """Decayed scores of this process while Redis is down"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._scores = defaultdict(dict)
+
+    def _roll(self, gen):
+        if self._generation is None:
+            self._generation = gen
+        elif gen > self._generation:
+            factor = 2 ** (-(gen - self._generation) * GENERATION_SECONDS / get_half_life_seconds())
+            for scope, scores in list(self._scores.items()):
+                kept = {task_id: score * factor for task_id, score in scores.items()}
+                self._scores[scope] = {
+                    task_id: score for task_id, score in kept.items() if score >= MIN_SCORE
+                }
+            self._generation = gen
+
+    def add(self, gen, scopes, task_id, amount):
+        with self._lock:
+            self._roll(gen)
+            for scope in scopes:
+                scores = self._scores[scope]
+                scores[task_id] = scores.get(task_id, 0.0) + amount
+
+    def top(self, gen, scope, k):
+        with self._lock:
+            self._roll(gen)
+            return heapq.nlargest(k, self._scores.get(scope, {}).items(), key=lambda item: item[1])
+
+    def scores(self, gen, scope, task_ids):
+        with self._lock:
+            self._roll(gen)
+            scores = self._scores.get(scope, {})
+            return {task_id: scores[task_id] for task_id in task_ids if task_id in scores}
+
+    def remove(self, scope, task_ids):
+        with self._lock:
+            scores = self._scores.get(scope, {})
+            for task_id in task_ids:
+                scores.pop(task_id, None)
+
+
+_local = _LocalScores()
+
+# Generations this process has seen carried over in Redis
+_carried = set()
+_carried_lock = threading.Lock()
+
+
+def _carry_over(client, gen):
+    """
+    Copy the previous generation's scores into gen, once per generation
+
+    A SET NX flag picks the process that does it; ZUNIONSTORE includes the
+    new key itself, so events recorded meanwhile are kept.
+    """
+    if gen in _carried:
+        return
+    with _carried_lock:
+        if gen in _carried:
+            return
+        ttl = GENERATION_SECONDS * 2
+        if client.set(f'{KEY_PREFIX}:g{gen}:carried', 1, nx=True, ex=ttl):
+            factor = 2 ** (-GENERATION_SECONDS / get_half_life_seconds())
+            scopes = [scope.decode() for scope in client.smembers(_scopes_key(gen - 1))]
+            pipe = client.pipeline(transaction=False)
+            for scope in scopes:
+                key = _key(gen, scope)
+                pipe.zunionstore(key, {key: 1, _key(gen - 1, scope): factor})
+                pipe.zremrangebyscore(key, '-inf', f'({MIN_SCORE}')
+                pipe.expire(key, ttl)
+            if scopes:
+                pipe.sadd(_scopes_key(gen), *scopes)
+                pipe.expire(_scopes_key(gen), ttl)
+            pipe.execute()
+        _carried.add(gen)
+
+
+# ==============================================================================
+# RECORDING
+# ==============================================================================
+
+def record_event(task_id, city, category_id, event, now=None):
+    """Add one event (view, save, application) to the task's scores"""
+    now = now if now is not None else time.time()
+    gen = generation(now)
+    amount = EVENT_WEIGHTS[event] * _growth(now, gen)
+    scopes = task_scopes(city, category_id)
+
+    client = get_redis()
+    if client is not None:
+        try:
+            _carry_over(client, gen)
+            ttl = GENERATION_SECONDS * 2
+            pipe = client.pipeline(transaction=False)
+            for scope in scopes:
+                pipe.zincrby(_key(gen, scope), amount, task_id)
+                pipe.expire(_key(gen, scope), ttl)
+            pipe.sadd(_scopes_key(gen), *scopes)
+            pipe.expire(_scopes_key(gen), ttl)
+            pipe.execute()
+            return
+        except Exception as e:
+            logger.warning(f"Redis trending error, scoring in process: {e}")
+            mark_redis_down()
+
+    _local.add(gen, scopes, task_id, amount)
+
+
+def record_task_event(task_id, event):
+    """
+    record_event() for an OPEN task once the current transaction commits
+    (looks up the task's city and category)
+    """
+    def record():
+        from .models import Task
+
+        task = Task.objects.filter(pk=task_id, status='OPEN').values('city', 'category_id').first()
+        if task is None:
+            return
+        try:
+            record_event(task_id, task['city'], task['category_id'], event)
+        except Exception as e:
+            logger.warning(f"Error recording trending {event} for task {task_id}: {e}")
+
+    transaction.on_commit(record)
+
+
+# ==============================================================================
+# READING
+# ==============================================================================
+
+def top_tasks(scope=ALL_SCOPE, k=10, now=None):
+    """[(task_id, score)] of the k highest scores in scope, highest first"""
+    now = now if now is not None else time.time()
+    gen = generation(now)
+    decay = 1 / _growth(now, gen)
+
+    client = get_redis()
+    if client is not None:
+        try:
+            _carry_over(client, gen)
+            rows = client.zrevrange(_key(gen, scope), 0, k - 1, withscores=True)
+            return [(int(task_id), score * decay) for task_id, score in rows]
+        except Exception as e:
+            logger.warning(f"Redis trending read error: {e}")
+            mark_redis_down()
+
+    return [(task_id, score * decay) for task_id, score in _local.top(gen, scope, k)]
+
+
+def trending_scores(task_ids, scope=ALL_SCOPE, now=None):
+    """{task_id: score} for the given tasks (tasks without activity are left out)"""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
+    now = now if now is not None else time.time()
+    gen = generation(now)
+    decay = 1 / _growth(now, gen)
+
+    client = get_redis()
+    if client is not None:
+        try:
+            _carry_over(client, gen)
+            values = client.zmscore(_key(gen, scope), task_ids)
+            return {
+                task_id: score * decay
+                for task_id, score in zip(task_ids, values) if score is not None
+            }
+        except Exception as e:
+            logger.warning(f"Redis trending read error: {e}")
+            mark_redis_down()
+
+    return {task_id: score * decay for task_id, score in _local.scores(gen, scope, task_ids).items()}
+
+
+def remove_tasks(scope, task_ids, now=None):
+    """Drop tasks from a scope (closed tasks found while reading it)"""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    gen = generation(now)
+
+    client = get_redis()
+    if client is not None:
+        try:
+            client.zrem(_key(gen, scope), *task_ids)
+            return
+        except Exception as e:
+            logger.warning(f"Redis trending cleanup error: {e}")
+            mark_redis_down()
+
+    _local.remove(scope, task_ids)
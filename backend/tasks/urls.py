@@ -8,8 +8,13 @@ urlpatterns = [
     # Tasks
     path('', views.TaskListView.as_view(), name='task-list'),
     path('create/', views.TaskCreateView.as_view(), name='task-create'),
+    path('bulk/', views.TaskBulkCreateView.as_view(), name='task-bulk-create'),
+    path('import/', views.TaskImportView.as_view(), name='task-import'),
+    path('facets/', views.TaskFacetsView.as_view(), name='task-facets'),
+    path('trending/', views.TaskTrendingView.as_view(), name='task-trending'),
     path('my-tasks/', views.MyTasksView.as_view(), name='my-tasks'),
     path('<int:pk>/', views.TaskDetailView.as_view(), name='task-detail'),
+    path('<int:pk>/similar/', views.TaskSimilarView.as_view(), name='task-similar'),
     path('<int:pk>/update/', views.TaskUpdateView.as_view(), name='task-update'),
     path('<int:pk>/delete/', views.TaskDeleteView.as_view(), name='task-delete'),
     
@@ -35,6 +40,7 @@ urlpatterns = [
 
     # Saved Tasks
     path('saved/', views.SavedTaskListCreateView.as_view(), name='saved-tasks'),
+    path('saved-state/', views.saved_state, name='saved-state'),
     path('<int:task_id>/save/', views.toggle_task_saved, name='toggle-save-task'),
     path('<int:task_id>/saved/', views.check_task_saved, name='check-task-saved'),
     path('saved/<int:task_id>/', views.SavedTaskDeleteView.as_view(), name='unsave-task'),
@@ -0,0 +1,126 @@
+"""
+Per-request viewer state for task serializers
+=============================================
+
+is_applied / is_saved / can_apply depend on the current user. Instead of
+querying per task, ViewerState loads the user's applications, saved tasks
+and escrows for every task of the response - one query each, on first
+use - and the serializers read from it.
+
+The state lives in the serializer context, so nested and list serializers
+of one response share it.
+"""
+from rest_framework.serializers import ListSerializer
+
+from .models import SavedTask, TaskApplication
+
+CONTEXT_KEY = 'viewer_state'
+
+
+class ViewerState:
+    """The current user's relation to a set of tasks"""
+
+    def __init__(self, user, tasks):
+        self.user = user if user is not None and user.is_authenticated else None
+        self.tasks = {task.id: task for task in tasks if task is not None}
+        self._applied = None
+        self._saved = None
+        self._escrows = None
+
+    def covers(self, task):
+        return task.id in self.tasks
+
+    def _task_ids(self):
+        return list(self.tasks)
+
+    def applied_ids(self):
+        if self._applied is None:
+            self._applied = set()
+            if self.user is not None:
+                self._applied = set(TaskApplication.objects.filter(
+                    freelancer=self.user,
+                    task_id__in=self._task_ids()
+                ).values_list('task_id', flat=True))
+        return self._applied
+
+    def saved_ids(self):
+        if self._saved is None:
+            self._saved = set()
+            if self.user is not None:
+                self._saved = set(SavedTask.objects.filter(
+                    user=self.user,
+                    task_id__in=self._task_ids()
+                ).values_list('task_id', flat=True))
+        return self._saved
+
+    def is_applied(self, task):
+        return task.id in self.applied_ids()
+
+    def is_saved(self, task):
+        return task.id in self.saved_ids()
+
+    def can_apply(self, task):
+        user = self.user
+        if user is None:
+            return False
+        # Not on own task, freelancers only, open tasks, once
+        return (
+            task.client_id != user.id
+            and user.is_freelancer
+            and task.status == 'OPEN'
+            and not self.is_applied(task)
+        )
+
+    def escrow(self, task):
+        """The task's escrow or None - uses select_related data when present"""
+        if 'escrow' in task._state.fields_cache:
+            return task._state.fields_cache['escrow']
+
+        if self._escrows is None:
+            from payments.models import Escrow
+            self._escrows = {
+                escrow.task_id: escrow
+                for escrow in Escrow.objects.filter(task_id__in=self._task_ids())
+            }
+        return self._escrows.get(task.id)
+
+
+def _response_tasks(serializer, task):
+    """
+    All tasks the response serializes alongside this one: the page of a
+    list, or the `task` of every row of a list of applications/saved tasks
+    """
+    path = []
+    node = serializer
+    while node.parent is not None:
+        if isinstance(node.parent, ListSerializer):
+            items = node.parent.instance or []
+            for source in reversed(path):
+                for attr in source.split('.'):
+                    items = [getattr(item, attr, None) for item in items if item is not None]
+            return [item for item in items if item is not None]
+        path.append(node.source)
+        node = node.parent
+    return [task]
+
+
+def get_viewer_state(serializer, task):
+    """The ViewerState of this response, built on first use"""
+    context = serializer.context
+    state = context.get(CONTEXT_KEY)
+    if state is None or not state.covers(task):
+        request = context.get('request')
+        user = getattr(request, 'user', None)
+        tasks = _response_tasks(serializer, task)
+        if task.id not in {t.id for t in tasks}:
+            tasks.append(task)
+        state = ViewerState(user, tasks)
+        context[CONTEXT_KEY] = state
+    return state
+
+
+def viewer_scopes(request):
+    """HTTP cache scopes (utils/http_cache.py) for viewer-dependent fields"""
+    if not request.user.is_authenticated:
+        return []
+    return [f'viewer:{request.user.id}', f'user:{request.user.id}']
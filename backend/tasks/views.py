@@ -1,14 +1,38 @@
 from rest_framework import generics, permissions, status, filters
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Avg, Count
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
+import csv
+from functools import partial
+
+from notifications.signals import notify_application_status
+from recommendations.similar import similar_tasks
+from utils.http_cache import conditional_response
+from utils.pagination import KeysetPagination
+
 from .models import Category, Task, TaskApplication, Review, SavedTask
+from .applicant_fit import get_applicant_ranking
+from .application_counts import set_application_status
+from .bulk import BulkTaskImporter, iter_csv_rows, iter_ndjson_rows
+from .categories import active_categories_payload
+from .counters import task_views
+from .facets import get_task_facets
+from . import trending
+from .projections import TaskListProjectionMixin
+from .search import TaskOrderingFilter, TaskSearchFilter, filter_by_skills
+from .ratings import apply_review_rating
+from .statistics import get_platform_statistics, get_user_statistics
+from .viewer_state import viewer_scopes
 from .serializers import (
     CategorySerializer,
     TaskListSerializer,
@@ -33,6 +57,13 @@ class CategoryListView(generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
     pagination_class = None  # Disable pagination - return all categories
 
+    def list(self, request, *args, **kwargs):
+        # tasks_count changes with tasks
+        return conditional_response(
+            request, lambda: Response(active_categories_payload()),
+            ['categories', 'tasks']
+        )
+
     @extend_schema(
         summary="List categories",
         description="Get list of all active task categories"
@@ -45,21 +76,60 @@ class CategoryListView(generics.ListAPIView):
 # TASK VIEWS
 # ==============================================================================
 
-class TaskListView(generics.ListAPIView):
+def limit_param(request, default, maximum):
+    """?limit= clamped to 1..maximum"""
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except ValueError:
+        raise ValidationError({'limit': 'Must be an integer.'})
+    return max(1, min(limit, maximum))
+
+
+def open_tasks_in_order(ranked):
+    """
+    [(task, score)] for [(task_id, score)], keeping only tasks that are
+    still open, for TaskListSerializer
+    """
+    tasks = Task.objects.filter(status='OPEN').select_related('client', 'category').prefetch_related(
+        'required_skills'
+    ).defer('search_vector').in_bulk([task_id for task_id, _ in ranked])
+    return [(tasks[task_id], score) for task_id, score in ranked if task_id in tasks]
+
+
+# Filters shared by the task list and its facets
+TASK_FILTER_PARAMETERS = [
+    OpenApiParameter('status', OpenApiTypes.STR, description='Filter by status (OPEN, IN_PROGRESS, etc)'),
+    OpenApiParameter('task_type', OpenApiTypes.STR, description='Filter by type (PHYSICAL, DIGITAL, BOTH)'),
+    OpenApiParameter('category', OpenApiTypes.INT, description='Filter by category ID'),
+    OpenApiParameter('city', OpenApiTypes.STR, description='Filter by city'),
+    OpenApiParameter('is_remote', OpenApiTypes.BOOL, description='Filter remote tasks'),
+    OpenApiParameter('min_budget', OpenApiTypes.FLOAT, description='Minimum budget'),
+    OpenApiParameter('max_budget', OpenApiTypes.FLOAT, description='Maximum budget'),
+    OpenApiParameter('skills[]', OpenApiTypes.INT, description='Filter by skill IDs (can pass multiple)', many=True),
+    OpenApiParameter('skills_match', OpenApiTypes.STR, enum=['any', 'all'], description='Match any (default) or all of the skills'),
+    OpenApiParameter('search', OpenApiTypes.STR, description='Full-text search in title/description/location (supports "phrases", -exclusions, OR; tolerates typos)'),
+]
+
+
+class TaskListView(TaskListProjectionMixin, generics.ListAPIView):
     """
     List all tasks with filters and search
     """
     serializer_class = TaskListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, TaskOrderingFilter]
     filterset_fields = ['status', 'task_type', 'category', 'city', 'is_remote']
+    # Full-text search over these fields (see tasks/search.py)
     search_fields = ['title', 'description', 'location']
     ordering_fields = ['created_at', 'budget', 'deadline', 'applications_count']
     ordering = ['-created_at']
     
     def get_queryset(self):
         """Get tasks with optional filters"""
-        queryset = Task.objects.select_related('client', 'category').prefetch_related('required_skills').all()
+        queryset = Task.objects.select_related('client', 'category').prefetch_related(
+            'required_skills'
+        ).defer('search_vector')
 
         # Filter by budget range
         min_budget = self.request.query_params.get('min_budget')
@@ -70,52 +140,189 @@ class TaskListView(generics.ListAPIView):
         if max_budget:
             queryset = queryset.filter(budget__lte=max_budget)
 
-        # Filter by required skills
+        # Filter by required skills (any by default, all with skills_match=all)
         skills = self.request.query_params.getlist('skills[]')
         if skills:
-            # Filter tasks that require ANY of the selected skills
-            # Using distinct() to avoid duplicate results
-            queryset = queryset.filter(required_skills__id__in=skills).distinct()
+            try:
+                skill_ids = [int(skill_id) for skill_id in skills]
+            except ValueError:
+                raise ValidationError({'skills[]': 'Skill IDs must be integers.'})
+            match = self.request.query_params.get('skills_match', 'any')
+            queryset = filter_by_skills(queryset, skill_ids, match=match)
 
         return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Anonymous browse pages are served from the response cache until a
+        # task, profile, category or skill changes
+        return conditional_response(
+            request, partial(super().list, request, *args, **kwargs),
+            ['tasks', 'users', 'categories', 'skills', *viewer_scopes(request)],
+            cache_anonymous=True
+        )
     
     @extend_schema(
         summary="List tasks",
         description="Get list of tasks with filters, search, and sorting",
         parameters=[
-            OpenApiParameter('status', OpenApiTypes.STR, description='Filter by status (OPEN, IN_PROGRESS, etc)'),
-            OpenApiParameter('task_type', OpenApiTypes.STR, description='Filter by type (PHYSICAL, DIGITAL, BOTH)'),
-            OpenApiParameter('category', OpenApiTypes.INT, description='Filter by category ID'),
-            OpenApiParameter('city', OpenApiTypes.STR, description='Filter by city'),
-            OpenApiParameter('is_remote', OpenApiTypes.BOOL, description='Filter remote tasks'),
-            OpenApiParameter('min_budget', OpenApiTypes.FLOAT, description='Minimum budget'),
-            OpenApiParameter('max_budget', OpenApiTypes.FLOAT, description='Maximum budget'),
-            OpenApiParameter('skills[]', OpenApiTypes.INT, description='Filter by skill IDs (can pass multiple)', many=True),
-            OpenApiParameter('search', OpenApiTypes.STR, description='Search in title/description'),
-            OpenApiParameter('ordering', OpenApiTypes.STR, description='Sort by field (created_at, budget, deadline)'),
+            *TASK_FILTER_PARAMETERS,
+            OpenApiParameter('ordering', OpenApiTypes.STR, description='Sort by field (created_at, budget, deadline) or relevance (default when searching)'),
+            OpenApiParameter('pagination', OpenApiTypes.STR, description='Set to "cursor" for keyset pagination (follow next/previous links)'),
+            OpenApiParameter('count', OpenApiTypes.BOOL, description='Set to false to skip the total count'),
+            OpenApiParameter('fields', OpenApiTypes.STR, description='Comma-separated fields to return (e.g. id,title,budget)'),
         ]
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
 
+class TaskFacetsView(TaskListView):
+    """
+    Facet counts for the tasks matching the task list filters
+    (see tasks/facets.py)
+    """
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        return Response(get_task_facets(
+            request, lambda: self.filter_queryset(self.get_queryset())
+        ))
+
+    @extend_schema(
+        summary="Task list facets",
+        description=(
+            "Counts per category, city, task type, remote flag and budget bucket "
+            "for the tasks matching the same filters as the task list"
+        ),
+        parameters=TASK_FILTER_PARAMETERS,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class TaskTrendingView(generics.GenericAPIView):
+    """
+    Open tasks with the most recent views, saves and applications, overall
+    or per city and category (see tasks/trending.py)
+    """
+    serializer_class = TaskListSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_category(self):
+        category = self.request.query_params.get('category')
+        if not category:
+            return None
+        try:
+            return int(category)
+        except ValueError:
+            raise ValidationError({'category': 'Must be a category ID.'})
+
+    @extend_schema(
+        summary="Trending tasks",
+        description="Open tasks ranked by recent views, saves and applications (decaying over hours)",
+        parameters=[
+            OpenApiParameter('city', OpenApiTypes.STR, description='Only tasks in this city'),
+            OpenApiParameter('category', OpenApiTypes.INT, description='Only tasks in this category'),
+            OpenApiParameter('limit', OpenApiTypes.INT, description='Number of tasks (default 10, max 50)'),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        limit = limit_param(request, 10, getattr(settings, 'TRENDING_MAX_LIMIT', 50))
+        scope = trending.scope_name(
+            city=request.query_params.get('city'), category_id=self.get_category()
+        )
+
+        # Tasks that closed keep their score until it decays: read extra
+        ranked = trending.top_tasks(scope, limit * 2 + 10)
+        open_ranked = open_tasks_in_order(ranked)
+        open_ids = {task.id for task, _ in open_ranked}
+        trending.remove_tasks(scope, [task_id for task_id, _ in ranked if task_id not in open_ids])
+
+        ranked = open_ranked[:limit]
+        data = self.get_serializer([task for task, _ in ranked], many=True).data
+        for row, (_, score) in zip(data, ranked):
+            row['trending_score'] = round(score, 2)
+        return Response(data)
+
+
+class TaskSimilarView(generics.GenericAPIView):
+    """
+    Open tasks most like this one, by embedding similarity
+    (see recommendations/similar.py)
+    """
+    serializer_class = TaskListSerializer
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        summary="Similar tasks",
+        description="Open tasks closest to this task by text embedding (\"more like this\")",
+        parameters=[
+            OpenApiParameter('limit', OpenApiTypes.INT, description='Number of tasks (default 6, max 20)'),
+        ]
+    )
+    def get(self, request, pk, *args, **kwargs):
+        task = get_object_or_404(Task.objects.select_related('category'), pk=pk)
+        limit = limit_param(request, 6, getattr(settings, 'SIMILAR_TASKS_MAX_LIMIT', 20))
+
+        # A few extra for tasks that closed since the index last synced
+        ranked = open_tasks_in_order(similar_tasks(task, limit + 5))[:limit]
+        if not ranked and task.category_id:
+            # No embeddings (no model, or not backfilled): newest in the category
+            fallback = Task.objects.filter(
+                status='OPEN', category_id=task.category_id
+            ).exclude(pk=task.pk).values_list('id', flat=True)[:limit]
+            ranked = open_tasks_in_order([(task_id, None) for task_id in fallback])
+
+        data = self.get_serializer([similar for similar, _ in ranked], many=True).data
+        for row, (_, score) in zip(data, ranked):
+            row['similarity'] = round(score, 4) if score is not None else None
+        return Response(data)
+
+
 class TaskDetailView(generics.RetrieveAPIView):
     """
     Get task details by ID
     """
-    queryset = Task.objects.select_related('client', 'category', 'assigned_to').prefetch_related('images')
+    queryset = Task.objects.select_related(
+        'client', 'category', 'assigned_to', 'escrow'
+    ).prefetch_related('images')
     serializer_class = TaskDetailSerializer
     permission_classes = [permissions.AllowAny]
     
     def retrieve(self, request, *args, **kwargs):
-        """Get task and increment view count"""
+        """Count the view, then answer 304 or serialize the task"""
+        stamp = Task.objects.filter(pk=kwargs['pk']).values(
+            'id', 'client_id', 'assigned_to_id', 'updated_at', 'status', 'city', 'category_id'
+        ).first()
+        if stamp is None:
+            raise Http404
+
+        # Count the view (only if not the client) - buffered and flushed to
+        # views_count in bulk, so this endpoint never writes to the database
+        if not request.user.is_authenticated or request.user.id != stamp['client_id']:
+            task_views.incr(stamp['id'])
+            if stamp['status'] == 'OPEN':
+                trending.record_event(stamp['id'], stamp['city'], stamp['category_id'], 'view')
+
+        scopes = [
+            f"task:{stamp['id']}", f"user:{stamp['client_id']}", 'categories', 'skills',
+            *viewer_scopes(request)
+        ]
+        if stamp['assigned_to_id']:
+            scopes.append(f"user:{stamp['assigned_to_id']}")
+
+        return conditional_response(
+            request, self.render_task, scopes,
+            parts=(stamp['updated_at'],), last_modified=stamp['updated_at']
+        )
+
+    def render_task(self):
         instance = self.get_object()
-        
-        # Increment view count (only if not the client)
-        if not request.user.is_authenticated or request.user != instance.client:
-            instance.views_count += 1
-            instance.save(update_fields=['views_count'])
-        
+
+        # Include hits that have not been flushed yet
+        instance.views_count += task_views.pending(instance.id)
+
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
@@ -151,6 +358,134 @@ class TaskCreateView(generics.CreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
+def _bulk_response(summary):
+    """201 if anything was created, 400 if no row was valid, else 200"""
+    if summary['created']:
+        status_code = status.HTTP_201_CREATED
+    elif not summary['valid']:
+        status_code = status.HTTP_400_BAD_REQUEST
+    else:
+        status_code = status.HTTP_200_OK
+    return Response(summary, status=status_code)
+
+
+def _is_true(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+class TaskBulkCreateView(APIView):
+    """
+    Create many tasks in one request (clients only)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        summary="Bulk create tasks",
+        description=(
+            "Create up to TASK_BULK_MAX_ROWS tasks from {\"tasks\": [...]}. Rows use the "
+            "task create fields (category and required_skills as IDs, no images). "
+            "Valid rows are created, invalid ones are reported by row number."
+        ),
+        parameters=[
+            OpenApiParameter('dry_run', OpenApiTypes.BOOL, description='Validate only, create nothing'),
+            OpenApiParameter(
+                'allow_duplicate', OpenApiTypes.BOOL,
+                description='Skip the near-duplicate check against open tasks and earlier rows'
+            ),
+        ]
+    )
+    def post(self, request):
+        if not request.user.is_client:
+            raise PermissionDenied('Only clients can post tasks')
+
+        rows = request.data.get('tasks') if isinstance(request.data, dict) else None
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({'tasks': 'Expected a non-empty list of tasks.'})
+
+        max_rows = settings.TASK_BULK_MAX_ROWS
+        if len(rows) > max_rows:
+            raise ValidationError({'tasks': f'At most {max_rows} tasks per request.'})
+
+        importer = BulkTaskImporter(
+            request.user,
+            dry_run=_is_true(request.query_params.get('dry_run', request.data.get('dry_run'))),
+            allow_duplicate=_is_true(
+                request.query_params.get('allow_duplicate', request.data.get('allow_duplicate'))
+            )
+        )
+        for row_number, row in enumerate(rows, start=1):
+            importer.add(row, row_number)
+        return _bulk_response(importer.finish())
+
+
+class TaskImportView(APIView):
+    """
+    Import tasks from an uploaded CSV or NDJSON file (clients only)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    FORMATS = {
+        'csv': iter_csv_rows,
+        'ndjson': iter_ndjson_rows,
+        'jsonl': iter_ndjson_rows,
+    }
+
+    @extend_schema(
+        summary="Import tasks from a file",
+        description=(
+            "Multipart upload with a `file` field. CSV files have a header row of task "
+            "fields (required_skills as \"3;7\"); NDJSON files have one task object per "
+            "line. The file is read row by row and inserted in chunks; errors are "
+            "reported by line number."
+        ),
+        parameters=[
+            OpenApiParameter('format', OpenApiTypes.STR, description='csv or ndjson (default: from the file extension)'),
+            OpenApiParameter('dry_run', OpenApiTypes.BOOL, description='Validate only, create nothing'),
+            OpenApiParameter(
+                'allow_duplicate', OpenApiTypes.BOOL,
+                description='Skip the near-duplicate check against open tasks and earlier rows'
+            ),
+        ]
+    )
+    def post(self, request):
+        if not request.user.is_client:
+            raise PermissionDenied('Only clients can post tasks')
+
+        uploaded_file = request.FILES.get('file')
+        if uploaded_file is None:
+            raise ValidationError({'file': 'No file was uploaded.'})
+
+        file_format = request.query_params.get('format') or request.data.get('format')
+        if not file_format:
+            file_format = uploaded_file.name.rsplit('.', 1)[-1] if '.' in uploaded_file.name else ''
+        read_rows = self.FORMATS.get(file_format.lower())
+        if read_rows is None:
+            raise ValidationError({'format': 'Unsupported format. Use csv or ndjson.'})
+
+        importer = BulkTaskImporter(
+            request.user,
+            dry_run=_is_true(request.query_params.get('dry_run', request.data.get('dry_run'))),
+            max_rows=settings.TASK_IMPORT_MAX_ROWS,
+            allow_duplicate=_is_true(
+                request.query_params.get('allow_duplicate', request.data.get('allow_duplicate'))
+            )
+        )
+        try:
+            for row_number, row in read_rows(uploaded_file):
+                if isinstance(row, ValueError):
+                    importer.reject(row_number, str(row))
+                else:
+                    importer.add(row, row_number)
+                if importer.truncated:
+                    break
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Rows before the bad line are already in
+            importer.reject(None, f'Could not read file: {e}')
+
+        return _bulk_response(importer.finish())
+
+
 class TaskUpdateView(generics.UpdateAPIView):
     """
     Update task (owner only)
@@ -159,8 +494,14 @@ class TaskUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        """Only allow updating own tasks"""
-        return Task.objects.filter(client=self.request.user)
+        """Only allow updating own tasks, locked until the update commits"""
+        return Task.objects.filter(client=self.request.user).select_for_update()
+
+    def update(self, request, *args, **kwargs):
+        # The full save() writes status back: without the lock a task the
+        # overdue sweep (tasks/deadlines.py) expired in between would reopen
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
     
     @extend_schema(
         summary="Update task",
@@ -188,7 +529,7 @@ class TaskDeleteView(generics.DestroyAPIView):
         return super().delete(request, *args, **kwargs)
 
 
-class MyTasksView(generics.ListAPIView):
+class MyTasksView(TaskListProjectionMixin, generics.ListAPIView):
     """
     Get current user's posted tasks
     """
@@ -200,11 +541,16 @@ class MyTasksView(generics.ListAPIView):
     
     def get_queryset(self):
         """Get tasks posted by current user"""
-        return Task.objects.filter(client=self.request.user).select_related('category')
+        return Task.objects.filter(client=self.request.user).select_related(
+            'client', 'category'
+        ).prefetch_related('required_skills')
     
     @extend_schema(
         summary="My posted tasks",
-        description="Get list of tasks posted by current user"
+        description="Get list of tasks posted by current user",
+        parameters=[
+            OpenApiParameter('fields', OpenApiTypes.STR, description='Comma-separated fields to return (e.g. id,title,status)'),
+        ]
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -244,12 +590,9 @@ class TaskApplicationCreateView(generics.CreateAPIView):
             from rest_framework.exceptions import ValidationError
             raise ValidationError('You have already applied to this task')
         
-        # Save application
-        application = serializer.save(task=task)
-        
-        # Update task applications count
-        task.applications_count = task.applications.count()
-        task.save(update_fields=['applications_count'])
+        # Save application; tasks/signals.py counts it in this transaction
+        with transaction.atomic():
+            serializer.save(task=task)
     
     @extend_schema(
         summary="Apply to task",
@@ -262,6 +605,9 @@ class TaskApplicationCreateView(generics.CreateAPIView):
 class TaskApplicationListView(generics.ListAPIView):
     """
     List applications for a task (task owner only)
+
+    Newest first; ?ordering=fit ranks the applicants by fit with the task
+    instead (see tasks/applicant_fit.py).
     """
     serializer_class = TaskApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -275,11 +621,37 @@ class TaskApplicationListView(generics.ListAPIView):
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied('You can only view applications for your own tasks')
         
+        self.task = task
         return TaskApplication.objects.filter(task=task).select_related('freelancer')
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('ordering') != 'fit':
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_queryset()
+        ranking = get_applicant_ranking(self.task)
+        page = self.paginate_queryset(ranking)
+        applications = queryset.in_bulk([application_id for application_id, _, _ in page])
+        # Applications deleted since the ranking was cached are skipped
+        ranked = [
+            (applications[application_id], score, components)
+            for application_id, score, components in page if application_id in applications
+        ]
+        data = self.get_serializer([application for application, _, _ in ranked], many=True).data
+        for row, (_, score, components) in zip(data, ranked):
+            row['fit_score'] = score
+            row['fit_components'] = components
+        return self.get_paginated_response(data)
     
     @extend_schema(
         summary="List task applications",
-        description="Get all applications for a specific task (owner only)"
+        description="Get all applications for a specific task (owner only)",
+        parameters=[
+            OpenApiParameter(
+                'ordering', OpenApiTypes.STR,
+                description='"fit" to rank applicants by fit with the task (adds fit_score)'
+            ),
+        ]
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -291,6 +663,7 @@ class MyApplicationsView(generics.ListAPIView):
     """
     serializer_class = TaskApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status']
     ordering_fields = ['created_at', 'status']
@@ -300,7 +673,9 @@ class MyApplicationsView(generics.ListAPIView):
         """Get applications by current user"""
         return TaskApplication.objects.filter(
             freelancer=self.request.user
-        ).select_related('task', 'task__client')
+        ).select_related('task', 'task__client', 'task__category').prefetch_related(
+            'task__required_skills'
+        )
     
     @extend_schema(
         summary="My applications",
@@ -336,19 +711,22 @@ class ApplicationAcceptView(APIView):
                 'error': 'This task is not open'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Accept application
-        application.status = 'ACCEPTED'
-        application.save()
+        with transaction.atomic():
+            # Accept application
+            set_application_status(task.id, TaskApplication.objects.filter(id=application_id), 'ACCEPTED')
 
-        # Update task - ALWAYS assign and move to IN_PROGRESS
-        task.status = 'IN_PROGRESS'
-        task.assigned_to = application.freelancer
-        task.save()
+            # Update task - ALWAYS assign and move to IN_PROGRESS
+            task.status = 'IN_PROGRESS'
+            task.assigned_to = application.freelancer
+            task.save()
 
-        # Reject other applications
-        TaskApplication.objects.filter(
-            task=task
-        ).exclude(id=application_id).update(status='REJECTED')
+            # Reject other applications
+            set_application_status(
+                task.id, TaskApplication.objects.exclude(id=application_id), 'REJECTED'
+            )
+
+        application = TaskApplication.objects.select_related('task__client', 'freelancer').get(id=application_id)
+        notify_application_status(application)
 
         return Response({
             'message': 'Application accepted successfully',
@@ -376,9 +754,10 @@ class ApplicationRejectView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         
         # Reject application
-        application.status = 'REJECTED'
-        application.save()
-        
+        if set_application_status(task.id, TaskApplication.objects.filter(id=application_id), 'REJECTED'):
+            application = TaskApplication.objects.select_related('task__client', 'freelancer').get(id=application_id)
+            notify_application_status(application)
+
         return Response({
             'message': 'Application rejected successfully',
             'application': TaskApplicationSerializer(application).data
@@ -419,25 +798,17 @@ class ReviewCreateView(generics.CreateAPIView):
             from rest_framework.exceptions import ValidationError
             raise ValidationError('You have already reviewed this task')
         
-        # Save review
-        review = serializer.save(
-            task=task,
-            reviewer=user,
-            reviewee=reviewee,
-            is_verified=True  # Mark as verified since task is completed
-        )
-        
-        # Update reviewee's average rating
-        self._update_user_rating(reviewee)
-    
-    def _update_user_rating(self, user):
-        """Update user's average rating and review count"""
-        reviews = Review.objects.filter(reviewee=user, is_public=True)
-        avg_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
-        
-        user.average_rating = round(avg_rating, 2)
-        user.total_reviews = reviews.count()
-        user.save(update_fields=['average_rating', 'total_reviews'])
+        with transaction.atomic():
+            # Save review
+            review = serializer.save(
+                task=task,
+                reviewer=user,
+                reviewee=reviewee,
+                is_verified=True  # Mark as verified since task is completed
+            )
+
+            # Update reviewee's average rating from the running sum/count
+            apply_review_rating(review)
     
     @extend_schema(
         summary="Create review",
@@ -453,6 +824,7 @@ class ReviewListView(generics.ListAPIView):
     """
     serializer_class = ReviewSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['rating', 'created_at']
     ordering = ['-created_at']
@@ -466,7 +838,9 @@ class ReviewListView(generics.ListAPIView):
         return Review.objects.filter(
             reviewee=user,
             is_public=True
-        ).select_related('reviewer', 'task')
+        ).select_related(
+            'reviewer', 'reviewee', 'task', 'task__client', 'task__category'
+        ).prefetch_related('task__required_skills')
     
     @extend_schema(
         summary="List user reviews",
@@ -489,7 +863,9 @@ class TaskReviewsView(generics.ListAPIView):
         return Review.objects.filter(
             task_id=task_id,
             is_public=True
-        ).select_related('reviewer', 'reviewee')
+        ).select_related(
+            'reviewer', 'reviewee', 'task', 'task__client', 'task__category'
+        ).prefetch_related('task__required_skills')
     
     @extend_schema(
         summary="List task reviews",
@@ -565,15 +941,15 @@ class TaskCancelView(APIView):
                 'error': 'Cannot cancel completed or already cancelled tasks'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Cancel task
-        task.status = 'CANCELLED'
-        task.save()
-        
-        # Update all pending applications to withdrawn
-        TaskApplication.objects.filter(
-            task=task,
-            status='PENDING'
-        ).update(status='WITHDRAWN')
+        with transaction.atomic():
+            # Cancel task
+            task.status = 'CANCELLED'
+            task.save()
+
+            # Update all pending applications to withdrawn
+            set_application_status(
+                task.id, TaskApplication.objects.filter(status='PENDING'), 'WITHDRAWN'
+            )
         
         return Response({
             'message': 'Task cancelled successfully',
@@ -592,17 +968,9 @@ class TaskCancelView(APIView):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def task_statistics(request):
-    """Get task statistics"""
-    stats = {
-        'total_tasks': Task.objects.count(),
-        'open_tasks': Task.objects.filter(status='OPEN').count(),
-        'in_progress_tasks': Task.objects.filter(status='IN_PROGRESS').count(),
-        'completed_tasks': Task.objects.filter(status='COMPLETED').count(),
-        'total_applications': TaskApplication.objects.count(),
-        'categories_count': Category.objects.filter(is_active=True).count(),
-        'average_budget': Task.objects.aggregate(Avg('budget'))['budget__avg'] or 0,
-    }
-    
+    """Get task statistics (cached snapshot, see tasks/statistics.py)"""
+    stats = get_platform_statistics()
+
     return Response(stats)
 
 
@@ -614,18 +982,7 @@ def task_statistics(request):
 @permission_classes([permissions.IsAuthenticated])
 def my_task_statistics(request):
     """Get current user's task statistics"""
-    user = request.user
-
-    stats = {
-        'posted_tasks': user.posted_tasks.count(),
-        'open_tasks': user.posted_tasks.filter(status='OPEN').count(),
-        'in_progress_tasks': user.posted_tasks.filter(status='IN_PROGRESS').count(),
-        'completed_tasks': user.posted_tasks.filter(status='COMPLETED').count(),
-        'applications_sent': user.task_applications.count(),
-        'applications_accepted': user.task_applications.filter(status='ACCEPTED').count(),
-        'applications_pending': user.task_applications.filter(status='PENDING').count(),
-        'tasks_completed_as_freelancer': user.assigned_tasks.filter(status='COMPLETED').count(),
-    }
+    stats = get_user_statistics(request.user)
 
     return Response(stats)
 
@@ -640,11 +997,14 @@ class SavedTaskListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = SavedTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         return SavedTask.objects.filter(
             user=self.request.user
-        ).select_related('task', 'task__client', 'task__category')
+        ).select_related('task', 'task__client', 'task__category').prefetch_related(
+            'task__required_skills'
+        )
 
     @extend_schema(
         summary="List saved tasks",
@@ -707,6 +1067,36 @@ def check_task_saved(request, task_id):
     })
 
 
+@extend_schema(
+    summary="Saved state of many tasks",
+    description="Check which of the given tasks the current user saved, in one request",
+    parameters=[
+        OpenApiParameter('ids', OpenApiTypes.STR, description='Comma-separated task IDs (up to 100)', required=True),
+    ]
+)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def saved_state(request):
+    """Saved state for a page of tasks, instead of one check per card"""
+    try:
+        task_ids = {int(task_id) for task_id in request.query_params.get('ids', '').split(',') if task_id.strip()}
+    except ValueError:
+        raise ValidationError({'ids': 'Task IDs must be integers.'})
+
+    max_ids = getattr(settings, 'MAX_PAGE_SIZE', 100)
+    if len(task_ids) > max_ids:
+        raise ValidationError({'ids': f'At most {max_ids} task IDs per request.'})
+
+    saved_ids = set(SavedTask.objects.filter(
+        user=request.user,
+        task_id__in=task_ids
+    ).values_list('task_id', flat=True))
+
+    return Response({
+        'saved': {str(task_id): task_id in saved_ids for task_id in sorted(task_ids)}
+    })
+
+
 @extend_schema(
     summary="Toggle task saved status",
     description="Save or unsave a task (toggle)"
@@ -0,0 +1,246 @@
+"""
+HTTP conditional caching
+========================
+
+Responses carry an ETag built from version stamps of the data they show,
+plus the viewer and the normalized query string, so a matching
+If-None-Match (or If-Modified-Since) is answered with 304 before any
+serialization.
+
+Versions are microsecond timestamps stored in the cache, one per scope:
+table-level scopes ('tasks', 'categories', 'skills', 'users') and
+per-object scopes ('task:<id>', 'user:<id>', 'viewer:<id>' for a user's
+own applications and saved tasks). track_versions() bumps them
+after each committed save/delete of a model, so they double as
+Last-Modified values. A missing version (evicted, cold cache) is re-seeded
+with the current time, which only ever costs a 200 instead of a 304.
+
+Anonymous list responses can also be cached server-side under their ETag:
+a write bumps a version, which changes the key, so stale entries are never
+served and simply expire.
+"""
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_PREFIX = 'http_version'
+RESPONSE_CACHE_PREFIX = 'http_response'
+
+# Version keys outlive any response cached under them
+VERSION_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _now_us():
+    return time.time_ns() // 1000
+
+
+def _version_key(scope):
+    return f'{VERSION_CACHE_PREFIX}:{scope}'
+
+
+# ==============================================================================
+# VERSIONS
+# ==============================================================================
+
+def get_versions(scopes):
+    """{scope: version} - seeds missing versions with the current time"""
+    keys = {_version_key(scope): scope for scope in scopes}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Error reading cache versions: {e}")
+        found = {}
+
+    versions = {}
+    for key, scope in keys.items():
+        version = found.get(key)
+        if version is None:
+            seed = _now_us()
+            try:
+                # add() keeps the value another process seeded first
+                if not cache.add(key, seed, VERSION_TIMEOUT):
+                    seed = cache.get(key) or seed
+            except Exception as e:
+                logger.warning(f"Error seeding cache version {scope}: {e}")
+            version = seed
+        versions[scope] = version
+    return versions
+
+
+def bump_versions(scopes):
+    """Move the given scopes to a new version once the transaction commits"""
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+
+    def apply():
+        try:
+            current = cache.get_many([_version_key(scope) for scope in scopes])
+            now = _now_us()
+            cache.set_many({
+                # Strictly increasing even if clocks disagree between servers
+                _version_key(scope): max(now, current.get(_version_key(scope), 0) + 1)
+                for scope in scopes
+            }, VERSION_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Error bumping cache versions {scopes}: {e}")
+
+    transaction.on_commit(apply)
+
+
+def track_versions(model, scopes_for):
+    """
+    Bump scopes_for(instance, update_fields) after saves and deletes of model
+
+    scopes_for returns the scopes the instance appears in, or an empty list
+    to skip the write (e.g. a last_login-only save).
+    """
+    def on_save(sender, instance, update_fields=None, **kwargs):
+        bump_versions(scopes_for(instance, update_fields))
+
+    def on_delete(sender, instance, **kwargs):
+        bump_versions(scopes_for(instance, None))
+
+    uid = f'http_cache_{model._meta.label_lower}'
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'{uid}_save')
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'{uid}_delete')
+
+
+def track_m2m_versions(through, scopes_for):
+    """Bump scopes_for(instance) when a many-to-many relation changes"""
+    def on_change(sender, instance, action, **kwargs):
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_versions(scopes_for(instance))
+
+    m2m_changed.connect(
+        on_change, sender=through, weak=False,
+        dispatch_uid=f'http_cache_{through._meta.label_lower}_m2m'
+    )
+
+
+# ==============================================================================
+# VALIDATORS
+# ==============================================================================
+
+def make_etag(*parts):
+    """Weak ETag: equivalent, not byte-identical (e.g. view counts may differ)"""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def version_datetime(version):
+    return datetime.fromtimestamp(version / 1_000_000, tz=dt_timezone.utc)
+
+
+def normalized_query(request):
+    """Query string with sorted parameters, so ?a=1&b=2 and ?b=2&a=1 share entries"""
+    return sorted(
+        (key, tuple(sorted(values)))
+        for key, values in request.query_params.lists()
+    )
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """RFC 9110: If-None-Match wins; If-Modified-Since is only used without it"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        if '*' in etags:
+            return True
+        # Weak comparison
+        bare = etag.removeprefix('W/')
+        return any(candidate.removeprefix('W/') == bare for candidate in etags)
+
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since and last_modified is not None:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(last_modified.timestamp()) <= since
+    return False
+
+
+def _set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Browsers may keep the response but must revalidate it
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ('Authorization', 'Cookie'))
+    return response
+
+
+# ==============================================================================
+# RESPONSES
+# ==============================================================================
+
+def conditional_response(request, build, scopes, parts=(), last_modified=None, cache_anonymous=False):
+    """
+    Answer with 304 if the client's copy is current, else build() the response
+
+    scopes: version scopes the response depends on
+    parts: extra values that change the representation (object stamps)
+    last_modified: datetime of the newest object field shown, if any
+    cache_anonymous: keep anonymous 200 responses server-side under the ETag
+    """
+    versions = get_versions(scopes)
+    viewer = request.user.pk if request.user.is_authenticated else None
+    etag = make_etag(
+        request.path, normalized_query(request), request.get_host(),
+        request.accepted_media_type, viewer, sorted(versions.items()), parts
+    )
+
+    stamps = [version_datetime(version) for version in versions.values()]
+    if last_modified is not None:
+        stamps.append(last_modified)
+    last_modified = max(stamps) if stamps else None
+
+    if is_not_modified(request, etag, last_modified):
+        return _set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+    cache_key = None
+    if cache_anonymous and viewer is None:
+        cache_key = f'{RESPONSE_CACHE_PREFIX}:{hashlib.md5(etag.encode(), usedforsecurity=False).hexdigest()}'
+        try:
+            data = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Error reading response cache: {e}")
+            data = None
+        if data is not None:
+            return _set_validators(Response(data), etag, last_modified)
+
+    response = build()
+    if response.status_code != status.HTTP_200_OK:
+        return response
+
+    if cache_key is not None:
+        try:
+            cache.set(cache_key, response.data, getattr(settings, 'HTTP_CACHE_ANONYMOUS_TIMEOUT', 300))
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {e}")
+
+    return _set_validators(response, etag, last_modified)
+
+
+def conditional_view(scopes, cache_anonymous=False):
+    """conditional_response for function views with fixed scopes"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            return conditional_response(
+                request, partial(view, request, *args, **kwargs),
+                scopes, cache_anonymous=cache_anonymous
+            )
+        return wrapped
+    return decorator
@@ -0,0 +1,280 @@
+"""
+Image renditions
+================
+
+Uploaded images (task images, profile pictures, portfolio screenshots)
+are stored as uploaded, up to the 10 MB upload limit. Lists, cards and
+chat avatars show them a few hundred pixels wide, so every upload also
+gets fixed-size renditions:
+
+    thumb      fits in 160x160  - avatars, list rows, chat
+    preview    fits in 800x800  - task and portfolio pages
+
+Renditions are re-encoded (WebP, or JPEG with IMAGE_RENDITION_FORMAT)
+from the EXIF-rotated image without its EXIF, GPS or ICC metadata.
+
+track_renditions(model, 'image') renders an object's image after each
+committed save that changed it, in a small thread pool (Pillow releases
+the GIL while decoding, resizing and encoding), and records the storage
+names with update() in the model's `<field>_renditions` JSONField:
+
+    {'source': 'task_images/a.png',
+     'thumb': 'renditions/task_images/a-thumb.webp',
+     'preview': 'renditions/task_images/a-preview.webp'}
+
+Until that happens - or when rendering fails - rendition_name() and
+ImageRenditionField fall back to the original image.
+`python manage.py generate_image_renditions` renders existing uploads.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models.signals import post_save
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from .http_cache import bump_versions
+
+logger = logging.getLogger(__name__)
+
+# name: (max width, max height)
+RENDITIONS = {
+    'thumb': (160, 160),
+    'preview': (800, 800),
+}
+
+RENDITION_DIR = 'renditions'
+
+# Pillow format: file extension
+FORMAT_EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+def _format():
+    fmt = getattr(settings, 'IMAGE_RENDITION_FORMAT', 'WEBP').upper()
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f'Unsupported IMAGE_RENDITION_FORMAT "{fmt}"')
+    return fmt
+
+
+def renditions_field(field_name):
+    """Name of the JSONField holding field_name's renditions"""
+    return f'{field_name}_renditions'
+
+
+# ==============================================================================
+# RENDERING
+# ==============================================================================
+
+def _prepare(image, fmt):
+    """image in a mode fmt can store (RGBA for WebP with alpha, else RGB)"""
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+    if has_alpha:
+        image = image.convert('RGBA')
+        if fmt == 'WEBP':
+            return image
+        # JPEG has no alpha: flatten onto white
+        from PIL import Image
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image if image.mode == 'RGB' else image.convert('RGB')
+
+
+def render(source):
+    """
+    {rendition name: encoded bytes} for an image file object
+
+    Metadata is dropped: nothing but the pixels is passed to save().
+    """
+    from PIL import Image, ImageOps
+
+    fmt = _format()
+    quality = getattr(settings, 'IMAGE_RENDITION_QUALITY', 80)
+    largest = max(RENDITIONS.values())
+
+    with Image.open(source) as image:
+        # JPEGs decode at a reduced scale when that is still big enough
+        image.draft('RGB', largest)
+        image = _prepare(ImageOps.exif_transpose(image), fmt)
+
+    rendered = {}
+    # Largest first, each rendition resized from the previous one
+    for name, size in sorted(RENDITIONS.items(), key=lambda item: item[1], reverse=True):
+        image = image.copy()
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, fmt, quality=quality, optimize=fmt == 'JPEG')
+        rendered[name] = buffer.getvalue()
+    return rendered
+
+
+def _delete_files(storage, record, keep=None):
+    keep = set((keep or {}).values())
+    for name, path in (record or {}).items():
+        if name != 'source' and path and path not in keep:
+            try:
+                storage.delete(path)
+            except Exception as e:
+                logger.warning(f"Could not delete rendition {path}: {e}")
+
+
+def generate_renditions(model, pk, field_name):
+    """
+    Render one object's image and record the renditions
+
+    Returns the new record, or None when the object is gone or its image
+    changed while rendering (that change schedules its own rendering).
+    """
+    field = renditions_field(field_name)
+    manager = model._default_manager
+    row = manager.filter(pk=pk).values(field_name, field).first()
+    if row is None:
+        return None
+
+    source, previous = row[field_name] or '', row[field] or {}
+    storage = model._meta.get_field(field_name).storage
+
+    record = {}
+    if source:
+        with storage.open(source, 'rb') as image_file:
+            rendered = render(image_file)
+        stem = os.path.splitext(source)[0]
+        extension = FORMAT_EXTENSIONS[_format()]
+        record['source'] = source
+        for name, content in rendered.items():
+            record[name] = storage.save(
+                f'{RENDITION_DIR}/{stem}-{name}.{extension}', ContentFile(content)
+            )
+
+    # Only record renditions of the image that is still there
+    updated = manager.filter(pk=pk, **{field_name: source}).update(**{field: record})
+    if not updated:
+        _delete_files(storage, record)
+        return None
+    _delete_files(storage, previous, keep=record)
+    return record
+
+
+# ==============================================================================
+# SCHEDULING
+# ==============================================================================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_RENDITION_WORKERS', 2),
+                thread_name_prefix='renditions',
+            )
+        return _executor
+
+
+def _run(model, pk, field_name, scopes):
+    try:
+        if generate_renditions(model, pk, field_name) is not None:
+            # update() skips signals - cached pages must pick up the new URLs
+            bump_versions(scopes)
+    except Exception as e:
+        logger.warning(f"Image renditions failed for {model._meta.label} {pk}.{field_name}: {e}")
+
+
+def _run_in_worker(*args):
+    try:
+        _run(*args)
+    finally:
+        # Connections are per thread; don't leave one open per worker
+        connections.close_all()
+
+
+def schedule_renditions(model, pk, field_name, scopes=()):
+    """Render an object's image once the current transaction commits"""
+    def submit():
+        if getattr(settings, 'IMAGE_RENDITION_WORKERS', 2) > 0:
+            _pool().submit(_run_in_worker, model, pk, field_name, list(scopes))
+        else:
+            _run(model, pk, field_name, list(scopes))
+
+    transaction.on_commit(submit)
+
+
+def track_renditions(model, field_name, scopes_for=lambda instance: []):
+    """
+    Schedule renditions after saves of model that change field_name
+
+    scopes_for(instance) returns the HTTP cache scopes to bump once the
+    renditions are recorded (see utils/http_cache.py).
+    """
+    field = renditions_field(field_name)
+
+    def on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields is not None and field_name not in update_fields):
+            return
+        source = getattr(instance, field_name).name or ''
+        if source == (getattr(instance, field) or {}).get('source', ''):
+            return
+        schedule_renditions(model, instance.pk, field_name, scopes_for(instance))
+
+    post_save.connect(
+        on_save, sender=model, weak=False,
+        dispatch_uid=f'renditions_{model._meta.label_lower}_{field_name}'
+    )
+
+
+# ==============================================================================
+# URLS
+# ==============================================================================
+
+def rendition_name(source, record, rendition):
+    """Storage name of a rendition of source, or source until it exists"""
+    if record and record.get('source') == source and record.get(rendition):
+        return record[rendition]
+    return source
+
+
+def rendition_url(request, image, record, rendition):
+    """URL of a rendition of an image field file (absolute with a request)"""
+    if not image:
+        return None
+    url = image.storage.url(rendition_name(image.name, record, rendition))
+    return request.build_absolute_uri(url) if request else url
+
+
+@extend_schema_field(OpenApiTypes.URI)
+class ImageRenditionField(serializers.Field):
+    """
+    Read-only URL of an image field's rendition:
+
+        thumbnail = ImageRenditionField('image', 'thumb')
+
+    The original image's URL until the rendition exists, like ImageField's
+    output (absolute when the serializer has a request).
+    """
+
+    def __init__(self, field_name, rendition, **kwargs):
+        self.image_field = field_name
+        self.rendition = rendition
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return rendition_url(
+            self.context.get('request'),
+            getattr(instance, self.image_field),
+            getattr(instance, renditions_field(self.image_field)),
+            self.rendition,
+        )
@@ -0,0 +1,297 @@
+"""
+Keyset (cursor) pagination for list endpoints
+Page-number requests keep working; cursor mode avoids OFFSET scans and the
+COUNT(*) is optional, so deep pages and infinite scroll stay O(page size)
+"""
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with a keyset mode
+
+    Query parameters:
+        page=N              classic page-number pagination (default)
+        pagination=cursor   start keyset pagination from the first row
+        cursor=<token>      continue from a `next` / `previous` link
+        count=false         skip the COUNT(*) (`count` is null in the response)
+        page_size=N         rows per page (up to MAX_PAGE_SIZE)
+
+    The keyset follows the queryset's ordering (OrderingFilter or the model
+    default) plus `id` as a tiebreaker, e.g. `(created_at, id)`, so every
+    orderable field needs an index ending in id. NULLs sort last. Orderings
+    on expressions or related fields fall back to OFFSET pages.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'MAX_PAGE_SIZE', 100)
+
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = None
+        self.cursor_mode = False
+        self.count = None
+        self.next_link = None
+        self.previous_link = None
+
+        wants_cursor = (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+        ordering = self.get_keyset_ordering(queryset) if wants_cursor else None
+
+        if ordering is None and self.include_count(request):
+            # Classic page-number pagination
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        # Custom modes render no page-number controls in the browsable API
+        self.display_page_controls = False
+        if self.include_count(request):
+            self.count = queryset.count()
+
+        if ordering is None:
+            return self.paginate_offset_without_count(queryset, request, page_size)
+
+        self.cursor_mode = True
+        return self.paginate_keyset(queryset, request, ordering, page_size)
+
+    def include_count(self, request):
+        return request.query_params.get(self.count_query_param, 'true').lower() not in ('false', '0', 'no')
+
+    # ------------------------------------------------------------------
+    # OFFSET pages without COUNT(*)
+    # ------------------------------------------------------------------
+
+    def paginate_offset_without_count(self, queryset, request, page_size):
+        try:
+            page_number = max(1, int(request.query_params.get(self.page_query_param, 1)))
+        except ValueError:
+            raise NotFound('Invalid page.')
+
+        offset = (page_number - 1) * page_size
+        # One extra row tells whether there is a next page
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and page_number > 1:
+            raise NotFound('Invalid page.')
+
+        url = request.build_absolute_uri()
+        if len(rows) > page_size:
+            self.next_link = replace_query_param(url, self.page_query_param, page_number + 1)
+        if page_number > 1:
+            self.previous_link = (
+                remove_query_param(url, self.page_query_param) if page_number == 2
+                else replace_query_param(url, self.page_query_param, page_number - 1)
+            )
+        return rows[:page_size]
+
+    # ------------------------------------------------------------------
+    # Keyset pages
+    # ------------------------------------------------------------------
+
+    def get_keyset_ordering(self, queryset):
+        """
+        [(field, descending, nullable)] for the queryset's ordering plus an
+        id tiebreaker, or None if the ordering cannot be used as a keyset
+        """
+        model = queryset.model
+        order_by = list(queryset.query.order_by) or list(model._meta.ordering)
+
+        ordering = []
+        for term in order_by:
+            if not isinstance(term, str) or '__' in term or term.startswith('?'):
+                return None
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = 'id'
+
+            if name in queryset.query.annotations:
+                nullable = True
+            else:
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    return None
+                if field.is_relation:
+                    return None
+                name, nullable = field.attname, field.null
+            ordering.append((name, descending, nullable))
+
+        if not any(name == 'id' for name, _, _ in ordering):
+            descending = ordering[0][1] if ordering else False
+            ordering.append(('id', descending, False))
+        return ordering
+
+    def encode_cursor(self, ordering, values, reverse):
+        payload = {
+            'o': [f"{'-' if descending else ''}{name}" for name, descending, _ in ordering],
+            'v': [value if value is None else str(value) for value in values],
+            'r': reverse,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, token, ordering, queryset):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor.')
+
+        expected = [f"{'-' if descending else ''}{name}" for name, descending, _ in ordering]
+        if payload.get('o') != expected or len(payload.get('v', [])) != len(ordering):
+            # Cursor from another ordering - the client changed the sort
+            raise NotFound('Invalid cursor.')
+
+        values = []
+        for (name, _, _), raw in zip(ordering, payload['v']):
+            values.append(raw if raw is None else self.to_python(queryset, name, raw))
+        return values, bool(payload.get('r'))
+
+    def to_python(self, queryset, name, raw):
+        if name in queryset.query.annotations:
+            output_field = queryset.query.annotations[name].output_field
+        else:
+            output_field = queryset.model._meta.get_field(name)
+        try:
+            return output_field.to_python(raw)
+        except Exception:
+            raise NotFound('Invalid cursor.')
+
+    def keyset_filter(self, ordering, values, reverse):
+        """
+        Rows strictly after `values` in the (possibly reversed) ordering:
+        (a > va) OR (a = va AND b > vb) OR ...
+        """
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (name, descending, nullable), value in zip(ordering, values):
+            forward = descending == reverse  # False: ascending walk
+            if value is None:
+                # NULLs sort last: going forward nothing at this level comes
+                # after a NULL, going back every non-NULL does
+                after = ~Q(**{f'{name}__isnull': True}) if reverse else Q(pk__in=[])
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                lookup = 'gt' if forward else 'lt'
+                after = Q(**{f'{name}__{lookup}': value})
+                if nullable and not reverse:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+            condition |= equal_so_far & after
+            equal_so_far &= equal
+        return condition
+
+    def order_expressions(self, ordering, reverse):
+        expressions = []
+        for name, descending, _ in ordering:
+            descending = descending != reverse
+            expression = F(name).desc if descending else F(name).asc
+            # Walking backwards puts NULLs first so the reversed page is exact
+            if reverse:
+                expressions.append(expression(nulls_first=True))
+            else:
+                expressions.append(expression(nulls_last=True))
+        return expressions
+
+    def paginate_keyset(self, queryset, request, ordering, page_size):
+        token = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if token:
+            values, reverse = self.decode_cursor(token, ordering, queryset)
+            queryset = queryset.filter(self.keyset_filter(ordering, values, reverse))
+
+        queryset = queryset.order_by(*self.order_expressions(ordering, reverse))
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        def cursor_for(row, backwards):
+            # Model instances, or dicts from a .values() queryset
+            if isinstance(row, dict):
+                values = [row[name] for name, _, _ in ordering]
+            else:
+                values = [getattr(row, name) for name, _, _ in ordering]
+            return self.encode_cursor(ordering, values, backwards)
+
+        url = remove_query_param(request.build_absolute_uri(), self.page_query_param)
+        if rows:
+            # Forward: more rows ahead if the probe found one. Backward: we
+            # came from a later page, so there always is one.
+            if has_more or reverse:
+                self.next_link = replace_query_param(url, self.cursor_query_param, cursor_for(rows[-1], False))
+            if token and (has_more or not reverse):
+                self.previous_link = replace_query_param(url, self.cursor_query_param, cursor_for(rows[0], True))
+        return rows
+
+    # ------------------------------------------------------------------
+    # Response
+    # ------------------------------------------------------------------
+
+    def get_next_link(self):
+        if self.page is not None:
+            return super().get_next_link()
+        return self.next_link
+
+    def get_previous_link(self):
+        if self.page is not None:
+            return super().get_previous_link()
+        return self.previous_link
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count if self.page is not None else self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" for keyset pagination (stable for infinite scroll)',
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor from a previous next/previous link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to false to skip the total count',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+        return parameters
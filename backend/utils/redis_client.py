@@ -0,0 +1,62 @@
+"""
+Shared Redis connection for counters and other fast data structures
+Returns None while Redis is unreachable so callers can fall back to
+in-process structures
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# How long to wait before trying an unreachable Redis again
+RETRY_AFTER_SECONDS = 30
+
+_client = None
+_retry_at = 0.0
+_lock = threading.Lock()
+
+
+def get_redis():
+    """
+    Get the shared Redis client
+
+    Returns:
+        redis.Redis instance, or None if Redis is unavailable
+    """
+    global _client, _retry_at
+
+    if _client is not None:
+        return _client
+    if time.monotonic() < _retry_at:
+        return None
+
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            import redis
+            client = redis.Redis.from_url(
+                getattr(settings, 'REDIS_URL', 'redis://127.0.0.1:6379/2'),
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            client.ping()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using in-process fallback: {e}")
+            _retry_at = time.monotonic() + RETRY_AFTER_SECONDS
+            return None
+
+        _client = client
+        return _client
+
+
+def mark_redis_down():
+    """Drop the client after a failed command; reconnect after the retry delay"""
+    global _client, _retry_at
+
+    with _lock:
+        _client = None
+        _retry_at = time.monotonic() + RETRY_AFTER_SECONDS
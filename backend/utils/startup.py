@@ -0,0 +1,77 @@
+"""
+Startup cost measurement
+Runs django.setup() in a fresh interpreter and reports wall time, peak RSS
+and which heavy (ML) modules ended up imported
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# Modules that must only be imported on first use, never at app load
+HEAVY_MODULES = [
+    'torch',
+    'sentence_transformers',
+    'transformers',
+    'sklearn',
+    'scipy',
+]
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+elapsed = time.perf_counter() - start
+rss_mb = None
+try:
+    # ru_maxrss survives fork+exec on Linux and would report the parent's
+    # peak; VmHWM belongs to this process's own address space
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                rss_mb = int(line.split()[1]) / 1024
+except OSError:
+    try:
+        import resource
+        # macOS reports bytes
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+    except ImportError:
+        pass
+heavy = [name for name in json.loads(sys.argv[1]) if name in sys.modules]
+print(json.dumps({'seconds': elapsed, 'rss_mb': rss_mb, 'heavy_modules': heavy}))
+'''
+
+
+def measure_startup(settings_module=None):
+    """
+    Measure one cold django.setup() in a subprocess
+
+    Args:
+        settings_module: DJANGO_SETTINGS_MODULE for the child process,
+            defaults to the current one
+
+    Returns:
+        Dict with seconds, rss_mb (None where unsupported) and heavy_modules
+    """
+    env = os.environ.copy()
+    env['DJANGO_SETTINGS_MODULE'] = (
+        settings_module
+        or os.environ.get('DJANGO_SETTINGS_MODULE')
+        or settings.SETTINGS_MODULE
+    )
+    # The child must resolve the same packages and settings as this process
+    env['PYTHONPATH'] = os.pathsep.join(path for path in sys.path if path)
+
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE, json.dumps(HEAVY_MODULES)],
+        cwd=str(settings.BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Settings may print to stdout; the measurement is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
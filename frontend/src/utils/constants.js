@@ -12,6 +12,7 @@ export const TASK_STATUS = {
   IN_PROGRESS: 'In Progress',
   COMPLETED: 'Completed',
   CANCELLED: 'Cancelled',
+  EXPIRED: 'Expired',
 };
 
 export const TASK_TYPE = {
@@ -118,6 +119,7 @@ export const TASK_STATUS_COLORS = {
   IN_PROGRESS: 'bg-blue-100 text-blue-800',
   COMPLETED: 'bg-gray-100 text-gray-800',
   CANCELLED: 'bg-red-100 text-red-800',
+  EXPIRED: 'bg-orange-100 text-orange-800',
 };
 
 export const APPLICATION_STATUS_COLORS = {
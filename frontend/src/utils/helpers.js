@@ -120,6 +120,7 @@ export const getStatusColor = (status) => {
     IN_PROGRESS: 'bg-blue-100 text-blue-800',
     COMPLETED: 'bg-gray-100 text-gray-800',
     CANCELLED: 'bg-red-100 text-red-800',
+    EXPIRED: 'bg-orange-100 text-orange-800',
   };
   return colors[status] || 'bg-gray-100 text-gray-800';
 };